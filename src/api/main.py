@@ -1,11 +1,18 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from src.api.di.user import get_auth_backend
-from src.api.routes import game_router, user_router
+from src.api.routes import admin_router, game_router, user_router
+from src.api.ws.managers.sea_battle import sea_battle_ws_manager
 from src.api.ws.routes.sea_battle_ws import router as ws_router
+from src.core.services.bot import shutdown_executor
 from src.core.services.user import fastapi_users
+from src.core.services.ws_reaper import start_room_reaper, stop_room_reaper
+from src.core.utils.metrics import metrics_registry
+from src.domain.game.usecases.game import GameServices
 from src.domain.user.schemas import UserCreate, UserRead, UserUpdate
-from src.infrastructure.db.main import initiate_database
+from src.infrastructure.db.main import initiate_database, make_client
+from src.infrastructure.db.uow import UnitOfWork
 
 app = FastAPI()
 
@@ -15,9 +22,30 @@ async def start_database() -> None:
     await initiate_database()
 
 
+@app.on_event("startup")
+async def start_sea_battle_reaper() -> None:
+    start_room_reaper(GameServices(UnitOfWork(make_client())))
+
+
+@app.on_event("shutdown")
+async def close_sea_battle_manager() -> None:
+    await stop_room_reaper()
+    await sea_battle_ws_manager.flush_saved_games()
+    await sea_battle_ws_manager.pubsub_client.close()
+    shutdown_executor()
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics_registry.render(), media_type='text/plain; version=0.0.4'
+    )
+
+
 app.include_router(ws_router, prefix='/ws')
 app.include_router(game_router, prefix='/games')
 app.include_router(user_router)
+app.include_router(admin_router, prefix='/admin', tags=['admin'])
 
 # FastAPI Users
 app.include_router(
@@ -1,2 +1,3 @@
+from .admin import router as admin_router
 from .game import router as game_router
 from .user import router as user_router
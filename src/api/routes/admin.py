@@ -0,0 +1,54 @@
+import time
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, Response
+
+from src.core.services.user import current_superuser
+from src.core.utils import profiling
+from src.core.utils.tracing import recent_traces
+from src.infrastructure.db.models.user import User
+
+router = APIRouter()
+
+
+@router.get('/profile/', response_description='CPU profile of the worker')
+async def get_profile(
+    seconds: float = Query(10, gt=0, le=profiling.MAX_PROFILE_SECONDS),
+    user: User = Depends(current_superuser),
+) -> Response:
+    """
+    Route for capturing a CPU profile of the worker. Only superuser route.
+
+    The profile is in the pstats file format, it is opened with
+    pstats.Stats or snakeviz.
+
+    Args:
+        seconds(float): Profiling time.
+
+    Kwargs:
+        user(User): Current superuser.
+    """
+    try:
+        profile = await profiling.profile_worker(seconds)
+    except profiling.ProfilerBusy:
+        return JSONResponse(
+            {'error': 'The worker is being profiled already'},
+            status_code=409,
+        )
+    return Response(
+        profile,
+        media_type='application/octet-stream',
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="worker-{int(time.time())}.prof"'
+            ),
+        },
+    )
+
+
+@router.get('/traces/', response_description='Last sampled traces')
+async def get_traces(
+    user: User = Depends(current_superuser),
+) -> list[dict[str, Any]]:
+    return list(recent_traces)
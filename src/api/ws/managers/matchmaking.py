@@ -0,0 +1,164 @@
+"""
+Matchmaking queue of the users shared by all workers.
+
+Waiting users of every ruleset are kept in one sorted set scored by the
+user rating, so the closest opponent is found in O(log n). The user who
+finds an opponent creates the game and pushes its id to the opponent,
+the opponent is woken up by its matchmaking channel.
+"""
+import asyncio
+from typing import Any, Optional
+
+from src.api.ws.managers.redis import RedisPubSubManager
+from src.api.ws.managers.sea_battle import sea_battle_ws_manager
+
+MATCHMAKING_KEY = 'matchmaking:{ruleset}'
+# Ids of the games created for the paired user, read by the user
+MATCHMAKING_MATCHES_KEY = 'matchmaking:matches:{username}'
+MATCHMAKING_CHANNEL = 'matchmaking:{username}'
+MATCHES_TTL_SECONDS = 60
+
+# KEYS: queue, matches of the user
+# ARGV: username, rating, rating band, is retry
+# Returns the paired username, empty string if the user is queued and
+# nothing if the queued user is paired by other user already. Opponent
+# with the closest rating in the band is paired, any opponent if the
+# band is 0.
+MATCH_SCRIPT = """
+local is_queued = redis.call('ZREM', KEYS[1], ARGV[1])
+if ARGV[4] == '1' then
+    if is_queued == 0 then
+        return nil
+    end
+else
+    -- Games of the previous search are not joined
+    redis.call('DEL', KEYS[2])
+end
+local rating = tonumber(ARGV[2])
+local band = tonumber(ARGV[3])
+local min, max = '-inf', '+inf'
+if band > 0 then
+    min, max = rating - band, rating + band
+end
+local lower = redis.call(
+    'ZREVRANGEBYSCORE', KEYS[1], rating, min, 'WITHSCORES', 'LIMIT', 0, 1
+)
+local higher = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], rating, max, 'WITHSCORES', 'LIMIT', 0, 1
+)
+local other = higher[1]
+if lower[1] and (not other
+    or rating - tonumber(lower[2]) <= tonumber(higher[2]) - rating) then
+    other = lower[1]
+end
+if other then
+    redis.call('ZREM', KEYS[1], other)
+    return other
+end
+redis.call('ZADD', KEYS[1], rating, ARGV[1])
+return ''
+"""
+
+
+class MatchmakingQueue:
+    """
+    Redis matchmaking queue of the sea battle users
+
+    Args:
+        pubsub_client (RedisPubSubManager): Pub/sub manager of the worker.
+    """
+
+    def __init__(self, pubsub_client: RedisPubSubManager) -> None:
+        self.pubsub_client = pubsub_client
+
+    @property
+    def redis_connection(self) -> Any:
+        return self.pubsub_client.redis_connection
+
+    async def match(
+        self,
+        ruleset: str,
+        username: str,
+        rating: int,
+        rating_band: int = 0,
+        is_retry: bool = False,
+    ) -> Optional[str]:
+        """
+        Pair the user with a waiting user or queue the user
+
+        Args:
+            ruleset (str): Ruleset name of the game,
+            username (str): Username,
+            rating (int): User rating,
+            rating_band (int): Max rating difference, 0 for any opponent,
+            is_retry (bool): User is queued already, it is paired again
+                with the wider band.
+        Returns:
+            username (str | None): Paired username, empty string if the
+                user is queued, None if the user is paired already.
+        """
+        match = self.pubsub_client.get_script(MATCH_SCRIPT)
+        other_username: Optional[bytes] = await match(
+            keys=[
+                MATCHMAKING_KEY.format(ruleset=ruleset),
+                MATCHMAKING_MATCHES_KEY.format(username=username),
+            ],
+            args=[username, rating, rating_band, int(is_retry)],
+        )
+        return None if other_username is None else other_username.decode()
+
+    async def leave(self, ruleset: str, username: str) -> bool:
+        """
+        Remove the user from the queue
+
+        Args:
+            ruleset (str): Ruleset name of the game,
+            username (str): Username.
+        Returns:
+            is_removed (bool): False if the user is paired already.
+        """
+        return bool(await self.redis_connection.zrem(
+            MATCHMAKING_KEY.format(ruleset=ruleset), username
+        ))
+
+    async def notify(self, username: str, game_id: str) -> None:
+        """
+        Send the id of the created game to the paired user
+
+        Args:
+            username (str): Username of the paired user,
+            game_id (str): Game MongoDB id.
+        """
+        matches_key = MATCHMAKING_MATCHES_KEY.format(username=username)
+        async with self.redis_connection.pipeline(transaction=True) as pipe:
+            pipe.rpush(matches_key, game_id)
+            pipe.expire(matches_key, MATCHES_TTL_SECONDS)
+            pipe.publish(
+                MATCHMAKING_CHANNEL.format(username=username), game_id
+            )
+            await pipe.execute()
+
+    async def pop_match(self, username: str) -> Optional[str]:
+        """
+        Get the id of the game created for the user
+
+        Args:
+            username (str): Username.
+        """
+        game_id: Optional[bytes] = await self.redis_connection.lpop(
+            MATCHMAKING_MATCHES_KEY.format(username=username)
+        )
+        return game_id.decode() if game_id else None
+
+    async def subscribe(self, username: str) -> asyncio.Queue:
+        return await self.pubsub_client.subscribe(
+            MATCHMAKING_CHANNEL.format(username=username)
+        )
+
+    async def unsubscribe(self, username: str, queue: asyncio.Queue) -> None:
+        await self.pubsub_client.unsubscribe(
+            MATCHMAKING_CHANNEL.format(username=username), queue
+        )
+
+
+matchmaking_queue = MatchmakingQueue(sea_battle_ws_manager.pubsub_client)
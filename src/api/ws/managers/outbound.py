@@ -0,0 +1,212 @@
+"""
+Bounded outbound queues of the room connections.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Optional
+
+from fastapi import WebSocketDisconnect, status
+
+logger = logging.getLogger(__name__)
+
+# Client is disconnected if it has that many not sent messages
+OUTBOUND_QUEUE_SIZE = 64
+# Client is disconnected if one message is not sent in that time
+SEND_TIMEOUT_SECONDS = 5.0
+# Time to send queued messages before the connection is closed
+CLOSE_DRAIN_SECONDS = 2.0
+# Silent client is pinged, the pong answer is not passed to the game
+HEARTBEAT_PING = 'ping'
+HEARTBEAT_PONG = 'pong'
+HEARTBEAT_INTERVAL_SECONDS = 15.0
+# Longer than two turns, so text clients not answering pings are not
+# disconnected while they play
+HEARTBEAT_TIMEOUT_SECONDS = 150.0
+
+
+class OutboundConnection:
+    """
+    Connection with a bounded outbound queue drained by its own writer
+
+    Sending only puts a message to the queue, so a slow client never
+    delays the game loop of other users. A message with a coalesce key
+    replaces a not sent message with the same key, like timer messages
+    superseded by the next one. A client with a full queue or a stalled
+    send is disconnected.
+
+    Args:
+        websocket (Any): WebSocket or other connection with send_text,
+            receive_text and close methods,
+        max_size (int): Amount of not sent messages to disconnect at,
+        send_timeout (float): Seconds to send one message,
+        is_heartbeat (bool): Ping the client and disconnect it if it is
+            silent for HEARTBEAT_TIMEOUT_SECONDS.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_size: int = OUTBOUND_QUEUE_SIZE,
+        send_timeout: float = SEND_TIMEOUT_SECONDS,
+        is_heartbeat: bool = True,
+    ) -> None:
+        self.websocket = websocket
+        self.max_size = max_size
+        self.send_timeout = send_timeout
+        self.is_heartbeat = is_heartbeat
+        self.last_received_at = time.monotonic()
+        self._messages: deque[tuple[Optional[str], str]] = deque()
+        self._has_messages = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._close_code = status.WS_1000_NORMAL_CLOSURE
+        self._is_closing = False
+        self._close_task: Optional[asyncio.Task] = None
+        self._writer_task = asyncio.create_task(self._write_messages())
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed.is_set()
+
+    async def send_text(
+        self, data: str, coalesce_key: Optional[str] = None
+    ) -> None:
+        """
+        Put a message to the outbound queue
+
+        Args:
+            data (str): Message to be sent,
+            coalesce_key (str): Not sent message with the same key is
+                dropped.
+        """
+        if self.is_closed or self._is_closing:
+            return
+        if coalesce_key is not None:
+            for message in self._messages:
+                if message[0] == coalesce_key:
+                    self._messages.remove(message)
+                    break
+        if len(self._messages) >= self.max_size:
+            logger.warning('Slow client is disconnected, its queue is full')
+            self.disconnect()
+            return
+        self._messages.append((coalesce_key, data))
+        self._has_messages.set()
+
+    async def receive_text(self) -> str:
+        """
+        Receive a message of the client
+
+        Pong answers are skipped. Waiting is stopped when the connection
+        is closed, so a game loop is not blocked by a dead client.
+
+        Raises:
+            WebSocketDisconnect: If the connection is closed.
+        """
+        while not self.is_closed:
+            receive = asyncio.ensure_future(self.websocket.receive_text())
+            closed = asyncio.ensure_future(self._closed.wait())
+            await asyncio.wait(
+                {receive, closed}, return_when=asyncio.FIRST_COMPLETED
+            )
+            closed.cancel()
+            if not receive.done():
+                receive.cancel()
+                break
+            try:
+                data = receive.result()
+            except WebSocketDisconnect as exc:
+                # Client is gone, the connection is replaced on reconnect
+                self._close_code = exc.code
+                self._closed.set()
+                self._messages.clear()
+                self._writer_task.cancel()
+                raise
+            self.last_received_at = time.monotonic()
+            if data.strip().lower() != HEARTBEAT_PONG:
+                return data
+        raise WebSocketDisconnect(self._close_code)
+
+    async def heartbeat(self) -> bool:
+        """
+        Ping the silent client and disconnect the dead one
+
+        Returns:
+            is_alive(bool): False if the connection is closed.
+        """
+        if self.is_heartbeat and not self.is_closed:
+            silent_seconds = time.monotonic() - self.last_received_at
+            if silent_seconds > HEARTBEAT_TIMEOUT_SECONDS:
+                logger.info('Silent client is disconnected')
+                self.disconnect(status.WS_1001_GOING_AWAY)
+            elif silent_seconds > HEARTBEAT_INTERVAL_SECONDS:
+                await self.send_text(HEARTBEAT_PING, HEARTBEAT_PING)
+        return not self.is_closed
+
+    async def close(self) -> None:
+        """
+        Send queued messages and close the connection
+
+        Messages not sent in CLOSE_DRAIN_SECONDS are dropped.
+        """
+        if self.is_closed or self._is_closing:
+            return
+        self._is_closing = True
+        self._has_messages.set()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._writer_task), CLOSE_DRAIN_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self._writer_task.cancel()
+        self._closed.set()
+        await self._close_websocket()
+
+    def disconnect(
+        self, code: int = status.WS_1008_POLICY_VIOLATION
+    ) -> None:
+        """
+        Drop not sent messages and close the connection in background
+
+        Args:
+            code (int): WebSocket close code.
+        """
+        if self.is_closed:
+            return
+        self._close_code = code
+        self._closed.set()
+        self._messages.clear()
+        if self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+        self._close_task = asyncio.create_task(self._close_websocket())
+
+    async def _write_messages(self) -> None:
+        while True:
+            while not self._messages:
+                if self._is_closing:
+                    return
+                self._has_messages.clear()
+                await self._has_messages.wait()
+            _, data = self._messages.popleft()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(data), self.send_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning('Slow client is disconnected, send is stalled')
+                self.disconnect()
+                return
+            except Exception:
+                # Client is gone, its receive loop gets the disconnect
+                self._closed.set()
+                self._messages.clear()
+                return
+
+    async def _close_websocket(self) -> None:
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(self._close_code), self.send_timeout
+            )
+        except Exception:
+            ...
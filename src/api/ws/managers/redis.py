@@ -2,14 +2,30 @@
 I've taked it from here:
 https://medium.com/@nandagopal05/scaling-websockets-with-pub-sub-using-python-redis-fastapi-b16392ffe291
 """
+import asyncio
+import logging
+from typing import Optional
+
 import redis.asyncio as aioredis
 from redis.asyncio.client import PubSub
+from redis.commands.core import AsyncScript
+
+from src.core.utils.metrics import operation_latency
+
+logger = logging.getLogger(__name__)
+
+READ_MESSAGE_TIMEOUT = 1.0
+RECONNECT_DELAY = 1.0
+ROOM_QUEUE_SIZE = 256
 
 
 class RedisPubSubManager:
     """
     WebSocket sea battle redis pub/sub manager
 
+    One pubsub connection and one reader task serve all rooms of the
+    worker, messages are put to local queues of the room subscribers.
+
     Args:
         host (str): Redis server host.
         port (int): Redis server port.
@@ -25,12 +41,40 @@ class RedisPubSubManager:
             port=int(self.redis_port),
             auto_close_connection_pool=False
         )
+        self.pubsub: Optional[PubSub] = None
+        self.room_queues: dict[str, set[asyncio.Queue]] = {}
+        self._subscriptions_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._is_closed = False
+        # Script source: connection it is registered on and its handle
+        self._scripts: dict[str, tuple[aioredis.Redis, AsyncScript]] = {}
 
     async def connect(self) -> None:
         """
         Connects to the Redis server and initializes the pubsub client
+
+        The pubsub client is created once and kept for the worker life.
+        """
+        if self.pubsub is None:
+            self.pubsub = self.redis_connection.pubsub()
+
+    def get_script(self, script: str) -> AsyncScript:
+        """
+        Get the Lua script handle registered on the Redis connection
+
+        The script is registered once for the connection, the handle
+        runs it by its SHA.
+
+        Args:
+            script (str): Lua script source.
+        Returns:
+            AsyncScript: Callable script handle.
         """
-        self.pubsub = self.redis_connection.pubsub()
+        connection, handle = self._scripts.get(script, (None, None))
+        if connection is not self.redis_connection or handle is None:
+            handle = self.redis_connection.register_script(script)
+            self._scripts[script] = (self.redis_connection, handle)
+        return handle
 
     async def _get_redis_connection(self) -> aioredis.Redis:
         """
@@ -45,6 +89,7 @@ class RedisPubSubManager:
             auto_close_connection_pool=False
         )
 
+    @operation_latency.time('publish')
     async def _publish(self, room_id: str, message: str) -> None:
         """
         Publishes a message to a specific Redis channel
@@ -55,24 +100,85 @@ class RedisPubSubManager:
         """
         await self.redis_connection.publish(room_id, message)
 
-    async def subscribe(self, room_id: str) -> PubSub:
+    async def subscribe(self, room_id: str) -> asyncio.Queue:
         """
         Subscribe to a Redis channel.
 
+        The channel is subscribed in Redis by the first room subscriber
+        only, next subscribers get own queues of the same channel.
+
         Args:
-            room_id (str): Channel or room ID to subscribe to/
+            room_id (str): Channel or room ID to subscribe to.
 
         Returns:
-            aioredis.ChannelSubscribe: PubSub object for the subscribed channel.
+            asyncio.Queue: Queue with messages of the channel.
         """
-        await self.pubsub.subscribe(room_id)
-        return self.pubsub
+        await self.connect()
+        queue: asyncio.Queue = asyncio.Queue(ROOM_QUEUE_SIZE)
+        async with self._subscriptions_lock:
+            if room_id not in self.room_queues:
+                await self.pubsub.subscribe(room_id)  # type: ignore
+            self.room_queues.setdefault(room_id, set()).add(queue)
+        # Reader is restarted if it is stopped by an unexpected error
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(self._read_messages())
+        return queue
 
-    async def unsubscribe(self, room_id: str) -> None:
+    async def unsubscribe(self, room_id: str, queue: asyncio.Queue) -> None:
         """
         Unsubscribes from a Redis channel.
 
+        The channel is unsubscribed in Redis with the last room subscriber.
+
         Args:
-            room_id (str): Channel or room ID to unsubscribe from.
+            room_id (str): Channel or room ID to unsubscribe from,
+            queue (asyncio.Queue): Queue returned by subscribe.
+        """
+        async with self._subscriptions_lock:
+            queues = self.room_queues.get(room_id, set())
+            queues.discard(queue)
+            if not queues and self.room_queues.pop(room_id, None) is not None:
+                await self.pubsub.unsubscribe(room_id)  # type: ignore
+
+    async def close(self) -> None:
+        """
+        Stop reading messages and close the pubsub client
+        """
+        self._is_closed = True
+        if self._reader_task is not None:
+            await self._reader_task
+            self._reader_task = None
+        if self.pubsub is not None:
+            await self.pubsub.close()
+            self.pubsub = None
+
+    async def _read_messages(self) -> None:
+        """
+        Read messages of all subscribed channels and put them to the room
+        queues
+
+        It is the only reader of the worker, so an error is logged and the
+        reading is retried instead of stopping it.
         """
-        await self.pubsub.unsubscribe(room_id)
+        while not self._is_closed:
+            try:
+                message = await self.pubsub.get_message(  # type: ignore
+                    ignore_subscribe_messages=True,
+                    timeout=READ_MESSAGE_TIMEOUT,
+                )
+            except aioredis.ConnectionError:
+                logger.exception('Redis pub/sub connection is lost')
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            except Exception:
+                logger.exception('Redis pub/sub message is not read')
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            if message is None:
+                continue
+            room_id = message['channel'].decode()
+            for queue in self.room_queues.get(room_id, ()):
+                try:
+                    queue.put_nowait(message['data'])
+                except asyncio.QueueFull:
+                    logger.warning(f'Message of room {room_id} is dropped')
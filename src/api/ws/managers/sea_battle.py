@@ -1,26 +1,256 @@
-import pickle
-from typing import Any, Optional
+import asyncio
+import json
+import logging
+import time
+import uuid
+from enum import Enum
+from typing import Any, NamedTuple, Optional
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
 
+from src.api.ws.managers.outbound import OutboundConnection
 from src.api.ws.managers.redis import RedisPubSubManager
 from src.core.config import settings
-from src.core.services.board import GameBoard
+from src.core.services import ws_protocol
+from src.core.services.board import GameBoard, make_game_board
+from src.core.services.board_cells import (
+    BoardCells,
+    BoardCellsError,
+    decode_board_cells,
+    encode_board_cells,
+    iter_shots,
+)
+from src.core.services.board_snapshot import (
+    SnapshotError,
+    decode_game_board,
+    encode_game_board,
+)
+from src.core.services.rules import Ruleset
+from src.core.utils.metrics import metrics_registry, operation_latency
+from src.core.utils.tracing import trace_methods
 
+logger = logging.getLogger(__name__)
 
+ROOM_USERS_AMOUNT = 2
+# Room events published by the worker are not handled by it again
+WORKER_ID = uuid.uuid4().hex
+# Room is deleted from Redis if nobody plays in it for that time
+ROOM_TTL_SECONDS = 60 * 60
+# Changed saved games are written to Redis together after that delay
+SAVED_GAMES_FLUSH_SECONDS = 0.2
+# One hash of every room with the room metadata and fields of every user
+ROOM_KEY = 'room:{room_id}'
+# Compact boards changed by moves byte by byte, they have the room TTL,
+# see src.core.services.board_cells
+ROOM_CELLS_KEY = 'room:{room_id}:cells:{username}'
+ROOM_SHIPS_KEY = 'room:{room_id}:ships:{username}'
+ROOM_WINNER_FIELD = 'winner'
+# Unix time of the last join, fleet change, readiness or move
+ROOM_ACTIVE_AT_FIELD = 'active_at'
+# Set by the worker which resolves the expired room
+ROOM_REAPED_FIELD = 'reaped'
+# '1' for the user to move, users of the room are users with this field
+ROOM_TURN_FIELD = 'turn:{username}'
+ROOM_READY_FIELD = 'ready:{username}'
+ROOM_BOARD_FIELD = 'board:{username}'
+# Amount of spectators of the room on all workers
+ROOM_SPECTATORS_FIELD = 'spectators'
+ROOM_EVENT_USER_READY = 'ready'
+ROOM_EVENT_SEND_TEXT = 'send_text'
+ROOM_EVENT_SPECTATE = 'spectate'
+ROOM_EVENT_REMOVE = 'remove'
+
+# KEYS: room
+# ARGV: user turn field, turn fields prefix, users amount, room TTL,
+#     active at field, now
+JOIN_ROOM_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    local users = 0
+    local is_turn = '1'
+    for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+        if string.sub(field, 1, #ARGV[2]) == ARGV[2] then
+            users = users + 1
+            if redis.call('HGET', KEYS[1], field) == '1' then
+                is_turn = '0'
+            end
+        end
+    end
+    if users >= tonumber(ARGV[3]) then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], ARGV[1], is_turn, ARGV[5], ARGV[6])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# KEYS: room
+# ARGV: spectators field, spectators amount change
+# Returns spectators amount, nothing if the room does not exist
+SPECTATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+return redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+"""
+
+# KEYS: room, other user cells, other user ships
+# ARGV: user turn field, other user turn field, winner field, username,
+#     cell index, move again on hit, room TTL, active at field, now,
+#     spectators field
+MOVE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    redis.call('EXPIRE', key, ARGV[7])
+end
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= '1'
+    or redis.call('HEXISTS', KEYS[1], ARGV[3]) == 1 then
+    return {'not_your_move', 0, 0, 0, 0}
+end
+local spectators = tonumber(redis.call('HGET', KEYS[1], ARGV[10]) or 0)
+local idx = tonumber(ARGV[5])
+local cell = string.byte(redis.call('GETRANGE', KEYS[2], idx, idx))
+if not cell then
+    return redis.error_reply('Cell is out of the game board')
+end
+if cell < 2 then
+    redis.call('SETRANGE', KEYS[2], idx, string.char(1))
+    redis.call('HSET', KEYS[1], ARGV[1], '0', ARGV[2], '1', ARGV[8], ARGV[9])
+    return {'miss', 0, 0, 1, spectators}
+end
+if (cell - 2) % 2 == 1 then
+    return {'repeated', 0, 0, 0, 0}
+end
+redis.call('SETRANGE', KEYS[2], idx, string.char(cell + 1))
+redis.call('HSET', KEYS[1], ARGV[8], ARGV[9])
+local ship = math.floor((cell - 2) / 2)
+local cells_left = string.byte(redis.call('GETRANGE', KEYS[3], ship, ship)) - 1
+redis.call('SETRANGE', KEYS[3], ship, string.char(cells_left))
+local is_drowned = cells_left == 0 and 1 or 0
+local is_game_over = 0
+if is_drowned == 1
+    and not string.find(redis.call('GET', KEYS[3]), '[^%z]') then
+    is_game_over = 1
+    redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+end
+if is_game_over == 0 and ARGV[6] == '0' then
+    redis.call('HSET', KEYS[1], ARGV[1], '0', ARGV[2], '1')
+    return {'hit', is_drowned, 0, 1, spectators}
+end
+return {'hit', is_drowned, is_game_over, 0, spectators}
+"""
+
+# KEYS: room
+# ARGV: active at field, winner field, reaped field, turn fields prefix,
+#     ready fields prefix, users amount, now, turn timeout, idle timeout
+# Returns nothing, {'idle', is started} or {'turn', 1, winner username}
+CHECK_DEADLINES_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 1 then
+    return nil
+end
+local active_at = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+if not active_at then
+    return nil
+end
+local idle_seconds = tonumber(ARGV[7]) - active_at
+local ready = 0
+local turn_username = nil
+local other_username = nil
+for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    if string.sub(field, 1, #ARGV[5]) == ARGV[5] then
+        ready = ready + 1
+    elseif string.sub(field, 1, #ARGV[4]) == ARGV[4] then
+        if redis.call('HGET', KEYS[1], field) == '1' then
+            turn_username = string.sub(field, #ARGV[4] + 1)
+        else
+            other_username = string.sub(field, #ARGV[4] + 1)
+        end
+    end
+end
+local is_started = ready >= tonumber(ARGV[6]) and 1 or 0
+if idle_seconds > tonumber(ARGV[9]) then
+    if redis.call('HSETNX', KEYS[1], ARGV[3], 1) == 1 then
+        return {'idle', is_started}
+    end
+    return nil
+end
+if is_started == 1 and other_username
+    and idle_seconds > tonumber(ARGV[8]) then
+    redis.call('HSET', KEYS[1], ARGV[2], other_username, ARGV[3], 1)
+    return {'turn', 1, other_username}
+end
+return nil
+"""
+
+
+class MoveStatuses(str, Enum):
+    NOT_YOUR_MOVE: str = 'not_your_move'
+    REPEATED: str = 'repeated'
+    MISS: str = 'miss'
+    HIT: str = 'hit'
+
+
+class MoveResult(NamedTuple):
+    status: MoveStatuses
+    is_drowned: bool
+    is_game_over: bool
+    is_turn_passed: bool
+    # Spectators of the room on all workers
+    spectators: int = 0
+
+
+class RoomDeadlines(str, Enum):
+    TURN: str = 'turn'
+    IDLE: str = 'idle'
+
+
+class ExpiredRoom(NamedTuple):
+    deadline: RoomDeadlines
+    is_started: bool
+    winner: Optional[str] = None
+
+
+@trace_methods('manager')
 class SeaBattleManager:
-    """WebSocket manager for game 'Sea Battle'"""
+    """
+    WebSocket manager for game 'Sea Battle'
+
+    Room membership, turns and game boards live in Redis, so players of a
+    room may be connected to different workers. Every worker keeps only
+    its own WebSocket connections, messages for other users are published
+    to the room channel. Every connection sends its messages from its own
+    bounded outbound queue. Spectators get the room state and then the
+    moves of the room, every event is serialized once for all spectators
+    of all workers.
+    """
 
     def __init__(self) -> None:
         """
         Initializes the WebSocketManager.
 
         Attributes:
-            rooms (dict): A dictionary to store WebSocket connections in
-            different rooms
+            rooms (dict): A dictionary to store WebSocket connections of
+            the worker in different rooms
             self.pubsub_client: custom redis pub sub manager
+            ready_users (dict): Users with completed fleet in every room
+            ready_events (dict): Events set when all room users are ready
+            room_listeners (dict): Subscription queue and task reading it
+            for every room of the worker
+            dirty_games (dict): Saved games not written to Redis yet, last
+            game board of every username in every room
+            spectators (dict): Spectator connections of the worker in
+            every room
         """
         self.rooms: dict = {}
+        self.ready_users: dict[str, set[str]] = {}
+        self.ready_events: dict[str, asyncio.Event] = {}
+        self.room_listeners: dict[str, tuple[asyncio.Queue, asyncio.Task]] = {}
+        self.dirty_games: dict[str, dict[str, GameBoard]] = {}
+        self.spectators: dict[str, set[OutboundConnection]] = {}
+        # Events of the spectators waiting for the room state
+        self._joining_spectators: dict[
+            str, dict[OutboundConnection, list[str]]
+        ] = {}
+        self._flush_task: Optional[asyncio.Task] = None
         self.pubsub_client = RedisPubSubManager(
             host=settings.REDIS_HOST, port=int(settings.REDIS_PORT)
         )
@@ -57,15 +287,14 @@ class SeaBattleManager:
             websocket (WebSocket): WebSocket connection object.
         """
         if not game_board:
-            game_board = GameBoard()
+            game_board = make_game_board(settings.GAME_BOARD_ENGINE)
         await self._setdefault_connection(
             room_id, username, websocket, game_board
         )
 
         if is_connected := (await self.is_user_in_room(room_id, username)):
-            await self.pubsub_client.connect()
-            await self.pubsub_client.subscribe(room_id)
-            await self.set_saved_game(game_board, username)
+            await self._listen_room(room_id)
+            await self.set_saved_game(room_id, game_board, username)
         return is_connected
 
     async def is_user_in_room(
@@ -78,11 +307,51 @@ class SeaBattleManager:
             room_id (str): Room id for channel,
             username (str): Username
         """
-        return bool(self.rooms[room_id].get(username))
+        return bool(self.rooms.get(room_id, {}).get(username))
+
+    def get_connection(
+        self, room_id: str, username: str
+    ) -> Optional[OutboundConnection]:
+        """
+        Get queued connection of the user connected to the worker
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Username
+        """
+        return self.rooms.get(room_id, {}).get(username, {}).get('connection')
+
+    async def remove_connection(
+        self, room_id: str, username: str, websocket: Any
+    ) -> None:
+        """
+        Remove the user connected to the worker from the local room
+
+        The room is kept, so the user may reconnect and the reaper still
+        checks its deadlines. Nothing is removed if the user is
+        reconnected with other connection already.
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Username,
+            websocket (Any): WebSocket or its queued connection.
+        """
+        connection = self.get_connection(room_id, username)
+        if connection is None or websocket not in (
+            connection, connection.websocket
+        ):
+            return
+        del self.rooms[room_id][username]
 
     async def get_game_board(
         self, room_id: str, username: str
     ) -> Optional[GameBoard]:
+        """
+        Get game board of the user connected to the worker
+
+        Boards are changed in Redis while the game goes, so it is up to
+        date only before the game start.
+        """
         game_board: Optional[GameBoard] = None
         try:
             game_board = self.rooms[room_id][username]['game_board']
@@ -91,77 +360,558 @@ class SeaBattleManager:
         return game_board
 
     async def get_users_from_room(self, room_id: str) -> list[str]:
-        return list(self.rooms[room_id].keys())
+        turn_prefix = ROOM_TURN_FIELD.format(username='')
+        return [
+            field.decode()[len(turn_prefix):]
+            for field in await self.redis_connection.hkeys(
+                ROOM_KEY.format(room_id=room_id)
+            )
+            if field.decode().startswith(turn_prefix)
+        ]
 
-    async def get_other_user(
+    async def get_other_username(
         self, room_id: str, username: str
-    ) -> Optional[dict[str, GameBoard | WebSocket | str]]:
+    ) -> Optional[str]:
         """
-        Get other user from rooms dictionary
+        Get other user of the room
 
         Args:
             room_id (str): Room id for channel,
             username (str): Username
         Returns:
-            user_connection(dict): Dictionary with gameboard, connection and
-                turn.
+            username(str): Other user username.
         """
-        for username_other in self.rooms[room_id]:
+        for username_other in await self.get_users_from_room(room_id):
             if username != username_other:
-                self.rooms[room_id][username_other]['username'] = username_other
-                return self.rooms[room_id][username_other]
+                return username_other
         return None
 
+    async def is_user_turn(self, room_id: str, username: str) -> bool:
+        is_turn = await self.redis_connection.hget(
+            ROOM_KEY.format(room_id=room_id),
+            ROOM_TURN_FIELD.format(username=username),
+        )
+        return is_turn == b'1'
+
     async def is_game_over(self, room_id: str) -> bool:
-        return any(
-            self.rooms[room_id][user]['game_board'].is_game_over
-            for user in self.rooms[room_id]
+        return bool(await self.redis_connection.hexists(
+            ROOM_KEY.format(room_id=room_id), ROOM_WINNER_FIELD
+        ))
+
+    async def get_winner(self, room_id: str) -> Optional[str]:
+        winner: Optional[bytes] = await self.redis_connection.hget(
+            ROOM_KEY.format(room_id=room_id), ROOM_WINNER_FIELD
+        )
+        return winner.decode() if winner else None
+
+    @operation_latency.time('attack')
+    async def apply_move(
+        self,
+        room_id: str,
+        username: str,
+        other_username: str,
+        cell_idx: int,
+        move_again_on_hit: bool = True,
+    ) -> MoveResult:
+        """
+        Attack the other user board in one atomic Redis request
+
+        The turn check, the shot, drowned ship and game over checks and
+        the turn handoff are done by the Lua script on the compact boards,
+        so any worker may apply a move without locks.
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Username of the attacking user,
+            other_username (str): Username of the attacked user,
+            cell_idx (int): Cell index, (y - 1) * width + letter index,
+            move_again_on_hit (bool): Ruleset gives one more move on hit.
+        Returns:
+            move_result(MoveResult): Move status and its consequences.
+        """
+        move = self.pubsub_client.get_script(MOVE_SCRIPT)
+        (
+            status, is_drowned, is_game_over, is_turn_passed, spectators
+        ) = await move(
+            keys=[
+                ROOM_KEY.format(room_id=room_id),
+                *_move_board_keys(room_id, other_username),
+            ],
+            args=[
+                ROOM_TURN_FIELD.format(username=username),
+                ROOM_TURN_FIELD.format(username=other_username),
+                ROOM_WINNER_FIELD,
+                username,
+                cell_idx,
+                int(move_again_on_hit),
+                ROOM_TTL_SECONDS,
+                ROOM_ACTIVE_AT_FIELD,
+                time.time(),
+                ROOM_SPECTATORS_FIELD,
+            ],
+        )
+        return MoveResult(
+            MoveStatuses(status.decode()),
+            bool(is_drowned),
+            bool(is_game_over),
+            bool(is_turn_passed),
+            spectators,
+        )
+
+    async def set_move_board(
+        self, room_id: str, username: str, game_board: GameBoard
+    ) -> None:
+        """
+        Save the compact board the moves are applied to
+
+        A board saved before, by the previous connection of the user, is
+        kept as it is.
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Board owner username,
+            game_board (GameBoard): GameBoard instance with placed ships.
+        """
+        board_cells = encode_board_cells(game_board)
+        async with self.redis_connection.pipeline(transaction=True) as pipe:
+            for key, value in zip(
+                _move_board_keys(room_id, username), board_cells
+            ):
+                pipe.set(key, value, nx=True)
+                pipe.expire(key, ROOM_TTL_SECONDS)
+            pipe.expire(ROOM_KEY.format(room_id=room_id), ROOM_TTL_SECONDS)
+            await pipe.execute()
+
+    async def get_move_board(
+        self, room_id: str, username: str, ruleset: Ruleset
+    ) -> Optional[GameBoard]:
+        """
+        Get the board with all moves applied to it
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Board owner username,
+            ruleset (Ruleset): Ruleset the room is played with.
+        """
+        cells, ships = await self.redis_connection.mget(
+            _move_board_keys(room_id, username)
+        )
+        return self._decode_move_board(
+            room_id, username, cells, ships, ruleset
         )
 
-    async def get_winner(self, room_id: str) -> str:
-        for username in self.rooms[room_id]:
-            if not self.rooms[room_id][username]['game_board'].is_game_over:
-                return username
-        raise ValueError()
+    async def get_room_game_boards(
+        self, room_id: str, ruleset: Ruleset
+    ) -> dict[str, GameBoard]:
+        """
+        Get game boards of all room users in one request
+
+        The board with moves applied is taken if the game is started,
+        the saved game otherwise.
+
+        Args:
+            room_id (str): Room id for channel,
+            ruleset (Ruleset): Ruleset the room is played with.
+        Returns:
+            game_boards(dict): GameBoard instance of every username.
+        """
+        await self.flush_saved_games(room_id)
+        room = {
+            field.decode(): value for field, value in (
+                await self.redis_connection.hgetall(
+                    ROOM_KEY.format(room_id=room_id)
+                )
+            ).items()
+        }
+        turn_prefix = ROOM_TURN_FIELD.format(username='')
+        usernames = [
+            field[len(turn_prefix):]
+            for field in room if field.startswith(turn_prefix)
+        ]
+        move_boards = await self.redis_connection.mget(
+            key
+            for username in usernames
+            for key in _move_board_keys(room_id, username)
+        ) if usernames else []
+        game_boards: dict[str, GameBoard] = {}
+        for user_idx, username in enumerate(usernames):
+            game_board = self._decode_move_board(
+                room_id,
+                username,
+                *move_boards[2 * user_idx:2 * user_idx + 2],
+                ruleset,
+            ) or self._decode_saved_game(
+                username, room.get(ROOM_BOARD_FIELD.format(username=username))
+            )
+            if game_board is not None:
+                game_boards[username] = game_board
+        return game_boards
+
+    def _decode_move_board(
+        self,
+        room_id: str,
+        username: str,
+        cells: Optional[bytes],
+        ships: Optional[bytes],
+        ruleset: Ruleset,
+    ) -> Optional[GameBoard]:
+        if cells is None or ships is None:
+            return None
+        try:
+            return decode_board_cells(
+                BoardCells(cells, ships), ruleset, settings.GAME_BOARD_ENGINE
+            )
+        except BoardCellsError:
+            logger.error(f'Board of {username} in {room_id} is not restored')
+        return None
 
     async def get_first_move_username(self, room_id: str) -> str:
+        usernames = await self.get_users_from_room(room_id)
+        turns = await self.redis_connection.hmget(
+            ROOM_KEY.format(room_id=room_id),
+            [
+                ROOM_TURN_FIELD.format(username=username)
+                for username in usernames
+            ],
+        )
         return next(
-            username for username in self.rooms[room_id]
-            if self.rooms[room_id][username]['is_turn']
+            username for username, is_turn in zip(usernames, turns)
+            if is_turn == b'1'
         )
 
+    async def send_to_user(
+        self,
+        room_id: str,
+        username: str,
+        message: str,
+        coalesce_key: Optional[str] = None,
+    ) -> None:
+        """
+        Send a message to the room user connected to any worker
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Username of the receiver,
+            message (str): Message to be sent,
+            coalesce_key (str): Not sent message with the same key is
+                superseded by this one.
+        """
+        if connection := self.get_connection(room_id, username):
+            await connection.send_text(message, coalesce_key)
+        else:
+            await self.broadcast_to_room(room_id, json.dumps({
+                'event': ROOM_EVENT_SEND_TEXT,
+                'username': username,
+                'message': message,
+                'coalesce_key': coalesce_key,
+            }))
+
+    async def add_spectator(
+        self, room_id: str, websocket: WebSocket, ruleset: Ruleset
+    ) -> Optional[OutboundConnection]:
+        """
+        Add a read-only connection to the room
+
+        The room state is sent first, then every move of the room made on
+        any worker. Moves made while the state is read are sent after it,
+        so a move may be repeated but is never missed.
+
+        Args:
+            room_id (str): Room id for channel,
+            websocket (WebSocket): WebSocket connection object,
+            ruleset (Ruleset): Ruleset the room is played with.
+        Returns:
+            connection (OutboundConnection): Spectator connection, None if
+                the room does not exist.
+        """
+        spectate = self.pubsub_client.get_script(SPECTATE_SCRIPT)
+        if await spectate(
+            keys=[ROOM_KEY.format(room_id=room_id)],
+            args=[ROOM_SPECTATORS_FIELD, 1],
+        ) is None:
+            return None
+        connection = OutboundConnection(
+            websocket, is_heartbeat=isinstance(websocket, WebSocket)
+        )
+        await self._listen_room(room_id)
+        joining = self._joining_spectators.setdefault(room_id, {})
+        joining[connection] = []
+        try:
+            state = await self._get_spectator_state(room_id, ruleset)
+        finally:
+            messages = joining.pop(connection)
+            if not joining:
+                self._joining_spectators.pop(room_id, None)
+        await connection.send_text(state.model_dump_json())
+        for message in messages:
+            await connection.send_text(message)
+        if room_id in self.room_listeners:
+            self.spectators.setdefault(room_id, set()).add(connection)
+        else:
+            # Room is removed while the state is read
+            await connection.close()
+        return connection
+
+    async def remove_spectator(
+        self, room_id: str, connection: OutboundConnection
+    ) -> None:
+        """
+        Remove the spectator connection from the room
+
+        Args:
+            room_id (str): Room id for channel,
+            connection (OutboundConnection): Spectator connection.
+        """
+        spectators = self.spectators.get(room_id)
+        if spectators is None or connection not in spectators:
+            return
+        spectators.discard(connection)
+        if not spectators:
+            del self.spectators[room_id]
+            if room_id not in self.rooms:
+                await self._stop_listen_room(room_id)
+        spectate = self.pubsub_client.get_script(SPECTATE_SCRIPT)
+        await spectate(
+            keys=[ROOM_KEY.format(room_id=room_id)],
+            args=[ROOM_SPECTATORS_FIELD, -1],
+        )
+        await connection.close()
+
+    async def send_to_spectators(self, room_id: str, message: str) -> None:
+        """
+        Send a message to the room spectators of all workers
+
+        Args:
+            room_id (str): Room id for channel,
+            message (str): Serialized message, it is sent as is.
+        """
+        await self._write_to_spectators(room_id, message)
+        await self.broadcast_to_room(room_id, json.dumps({
+            'event': ROOM_EVENT_SPECTATE,
+            'worker': WORKER_ID,
+            'message': message,
+        }))
+
+    async def _write_to_spectators(self, room_id: str, message: str) -> None:
+        for messages in self._joining_spectators.get(room_id, {}).values():
+            messages.append(message)
+        for connection in self.spectators.get(room_id, ()):
+            await connection.send_text(message)
+
+    async def _get_spectator_state(
+        self, room_id: str, ruleset: Ruleset
+    ) -> ws_protocol.SpectatorStateMessage:
+        """
+        Get the room state without not hitted ships of the users
+
+        Args:
+            room_id (str): Room id for channel,
+            ruleset (Ruleset): Ruleset the room is played with.
+        """
+        turn_prefix = ROOM_TURN_FIELD.format(username='')
+        state = ws_protocol.SpectatorStateMessage(usernames=[])
+        room = await self.redis_connection.hgetall(
+            ROOM_KEY.format(room_id=room_id)
+        )
+        for field, value in room.items():
+            field = field.decode()
+            if field.startswith(turn_prefix):
+                username = field[len(turn_prefix):]
+                state.usernames.append(username)
+                if value == b'1':
+                    state.turn = username
+            elif field == ROOM_WINNER_FIELD:
+                state.winner = value.decode()
+        if not state.usernames:
+            return state
+
+        users_cells = await self.redis_connection.mget(
+            ROOM_CELLS_KEY.format(room_id=room_id, username=username)
+            for username in state.usernames
+        )
+        for username, cells in zip(state.usernames, users_cells):
+            if cells is None:
+                continue
+            board = ws_protocol.SpectatorBoard()
+            for cell_idx, is_hit in iter_shots(cells):
+                (board.hits if is_hit else board.misses).append(
+                    ruleset.cords(cell_idx)
+                )
+            state.boards[username] = board
+        return state
+
     async def remove_room(self, room_id: str) -> None:
         """
         Removes a user's WebSocket connection from a room.
 
+        Connections of the room on other workers are closed too.
+
         Args:
             room_id (str): Room id for channel.
         """
-        if self.rooms.get(room_id):
-            for user_connection in self.rooms[room_id]:
-                connection: WebSocket = (
-                    self.rooms[room_id][user_connection]['connection']
+        if room_id in self.rooms:
+            self.dirty_games.pop(room_id, None)
+            await self.redis_connection.delete(
+                ROOM_KEY.format(room_id=room_id),
+                *(
+                    key
+                    for username in await self.get_users_from_room(room_id)
+                    for key in _move_board_keys(room_id, username)
+                ),
+            )
+            await self.broadcast_to_room(
+                room_id, json.dumps({'event': ROOM_EVENT_REMOVE})
+            )
+            await self._remove_local_room(room_id)
+
+    async def _remove_local_room(self, room_id: str) -> None:
+        spectators = self.spectators.pop(room_id, set())
+        if room_id in self.rooms or spectators:
+            # Queued messages are sent, a slow client does not delay others
+            await asyncio.gather(
+                *(
+                    user_connection['connection'].close()
+                    for user_connection in self.rooms.get(room_id, {}).values()
+                ),
+                *(connection.close() for connection in spectators),
+            )
+            self.rooms.pop(room_id, None)
+            self.ready_users.pop(room_id, None)
+            self.ready_events.pop(room_id, None)
+            await self._stop_listen_room(room_id)
+
+    async def _stop_listen_room(self, room_id: str) -> None:
+        if room_listener := self.room_listeners.pop(room_id, None):
+            queue, listener_task = room_listener
+            await self.pubsub_client.unsubscribe(room_id, queue)
+            # It may be the current task, so it is cancelled the last
+            listener_task.cancel()
+
+    async def set_user_initialized(self, room_id: str, username: str) -> None:
+        """
+        Mark user fleet as completed for every worker with the room
+
+        The completed board is saved in the compact encoding for moves.
+
+        Args:
+            room_id (str): Room id for channel,
+            username (str): Username.
+        """
+        await self.set_move_board(
+            room_id, username, self.rooms[room_id][username]['game_board']
+        )
+        self._add_ready_user(room_id, username)
+        await self.flush_saved_games(room_id)
+        await self.redis_connection.hset(
+            ROOM_KEY.format(room_id=room_id),
+            mapping={
+                ROOM_READY_FIELD.format(username=username): 1,
+                ROOM_ACTIVE_AT_FIELD: time.time(),
+            },
+        )
+        await self.broadcast_to_room(room_id, json.dumps({
+            'event': ROOM_EVENT_USER_READY, 'username': username
+        }))
+
+    async def wait_users_initialized(
+        self, room_id: str, timeout: float
+    ) -> bool:
+        """
+        Wait until all room users complete their fleets
+
+        Args:
+            room_id (str): Room id for channel,
+            timeout (float): Seconds to wait.
+        Returns:
+            is_initialized(bool): False if timeout is over.
+        """
+        # Users ready before the room is subscribed are not notified
+        ready_prefix = ROOM_READY_FIELD.format(username='')
+        for field in await self.redis_connection.hkeys(
+            ROOM_KEY.format(room_id=room_id)
+        ):
+            if field.decode().startswith(ready_prefix):
+                self._add_ready_user(
+                    room_id, field.decode()[len(ready_prefix):]
                 )
-                await connection.close()
-            del self.rooms[room_id]
-            await self.pubsub_client.unsubscribe(room_id)
+        ready_event = self.ready_events.setdefault(room_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(ready_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
-    async def all_users_initialized(self, room_id: str) -> bool:
+    def _add_ready_user(self, room_id: str, username: str) -> None:
+        ready_users = self.ready_users.setdefault(room_id, set())
+        ready_users.add(username)
+        if len(ready_users) >= ROOM_USERS_AMOUNT:
+            self.ready_events.setdefault(room_id, asyncio.Event()).set()
+
+    async def _listen_room(self, room_id: str) -> None:
         """
-        Is all users initialized game.
+        Subscribe the worker to room events once for all room users
 
         Args:
             room_id (str): Room id for channel.
         """
-        if len(self.rooms[room_id]) != 2:
-            return False
-        user_ships_and_game_initialized = all(
-            self.rooms
-            [room_id][user]['game_board']
-            .is_all_ships_placed_and_game_initialized
-            for user in self.rooms[room_id]
+        if room_id in self.room_listeners:
+            return
+        queue = await self.pubsub_client.subscribe(room_id)
+        if room_id in self.room_listeners:
+            await self.pubsub_client.unsubscribe(room_id, queue)
+            return
+        self.room_listeners[room_id] = (
+            queue,
+            asyncio.create_task(self._read_room_messages(room_id, queue)),
         )
-        return user_ships_and_game_initialized
+
+    async def _read_room_messages(
+        self, room_id: str, queue: asyncio.Queue
+    ) -> None:
+        while True:
+            data = await queue.get()
+            try:
+                await self._handle_room_message(room_id, data)
+            except Exception:
+                logger.exception(f'Message of room {room_id} is not handled')
+
+    async def _handle_room_message(self, room_id: str, data: bytes) -> None:
+        """
+        Handle room event published by any worker
+
+        Args:
+            room_id (str): Room id for channel,
+            data (bytes): Published message.
+        """
+        if (
+            room_id not in self.rooms
+            and room_id not in self.spectators
+            and room_id not in self._joining_spectators
+        ):
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(event, dict):
+            return
+        if event.get('event') == ROOM_EVENT_SPECTATE:
+            if event.get('worker') != WORKER_ID:
+                await self._write_to_spectators(room_id, event['message'])
+        elif event.get('event') == ROOM_EVENT_USER_READY:
+            self._add_ready_user(room_id, event['username'])
+        elif (
+            event.get('event') == ROOM_EVENT_SEND_TEXT
+            and await self.is_user_in_room(room_id, event['username'])
+        ):
+            await self.send_to_user(
+                room_id,
+                event['username'],
+                event['message'],
+                event.get('coalesce_key'),
+            )
+        elif event.get('event') == ROOM_EVENT_REMOVE:
+            await self._remove_local_room(room_id)
 
     async def _setdefault_connection(
         self,
@@ -173,64 +923,260 @@ class SeaBattleManager:
         """
         Setup default fields for self.rooms
 
+        The user joins the room in Redis first, the first user gets the
+        first move.
+
         Args:
             room_id (str): Room id for channel,
             username (str): Username,
             websocket (WebSocket): WebSocket connection object.
         """
-        self.rooms.setdefault(room_id, {})
-        self.rooms[room_id].setdefault(username, {})
-
-        if len(self.rooms[room_id]) > 2:
-            del self.rooms[room_id][username]
+        join_room = self.pubsub_client.get_script(JOIN_ROOM_SCRIPT)
+        is_joined = await join_room(
+            keys=[ROOM_KEY.format(room_id=room_id)],
+            args=[
+                ROOM_TURN_FIELD.format(username=username),
+                ROOM_TURN_FIELD.format(username=''),
+                ROOM_USERS_AMOUNT,
+                ROOM_TTL_SECONDS,
+                ROOM_ACTIVE_AT_FIELD,
+                time.time(),
+            ],
+        )
+        if not is_joined:
             await websocket.send_text('This room is full!')
         else:
-            self.rooms[room_id][username].setdefault('connection', websocket)
+            self.rooms.setdefault(room_id, {})
+            self.rooms[room_id].setdefault(username, {})
+            connection = self.rooms[room_id][username].get('connection')
+            # Reconnected user replaces the previous connection
+            if connection is None or connection.websocket is not websocket:
+                if connection is not None:
+                    connection.disconnect(status.WS_1001_GOING_AWAY)
+                self.rooms[room_id][username]['connection'] = (
+                    OutboundConnection(
+                        websocket,
+                        is_heartbeat=isinstance(websocket, WebSocket),
+                    )
+                )
             self.rooms[room_id][username].setdefault('game_board', game_board)
 
-            other_user = await self.get_other_user(room_id, username)
-            self.rooms[room_id][username].setdefault(
-                'is_turn', not other_user or not other_user['is_turn']
-            )
-
-    async def get_saved_game(self, username: str) -> Optional[GameBoard]:
+    @operation_latency.time('get_saved_game')
+    async def get_saved_game(
+        self, room_id: str, username: str
+    ) -> Optional[GameBoard]:
         """
         Get cached GameBoard instance
 
         Args:
-            username(str): Key for a cache
+            room_id(str): Room id of the game,
+            username(str): Board owner username.
         """
-        serialized_game_board: Optional[GameBoard] = None
-        cached_game_board: Optional[bytes] = await (
-            self.redis_connection.get(username)
+        await self.flush_saved_games(room_id)
+        cached_game_board: Optional[bytes] = await self.redis_connection.hget(
+            ROOM_KEY.format(room_id=room_id),
+            ROOM_BOARD_FIELD.format(username=username),
         )
+        return self._decode_saved_game(username, cached_game_board)
+
+    def _decode_saved_game(
+        self, username: str, cached_game_board: Optional[bytes]
+    ) -> Optional[GameBoard]:
+        serialized_game_board: Optional[GameBoard] = None
         if cached_game_board:
-            serialized_game_board = pickle.loads(cached_game_board)
+            try:
+                serialized_game_board = decode_game_board(cached_game_board)
+            except SnapshotError:
+                logger.error(f'Saved game of {username} is not restored')
         return serialized_game_board
 
+    @operation_latency.time('set_saved_game')
     async def set_saved_game(
         self,
+        room_id: str,
         game_board: GameBoard,
         username: str,
     ) -> None:
         """
         Set serialized GameBoard to a cache
 
+        The game is written behind: changes of a few
+        SAVED_GAMES_FLUSH_SECONDS are coalesced and written in one
+        pipeline, only the last state of every game board is serialized.
+
         Args:
+            room_id(str): Room id of the game,
             game_board(GameBoard): GameBoard instance,
-            username(str): Key for a cache.
+            username(str): Board owner username.
         """
-        serialized_game_board = pickle.dumps(game_board)
-        await self.redis_connection.set(username, serialized_game_board)
+        self.dirty_games.setdefault(room_id, {})[username] = game_board
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(
+                self._flush_saved_games_later()
+            )
+
+    @operation_latency.time('flush_saved_games')
+    async def flush_saved_games(self, *room_ids: str) -> None:
+        """
+        Write not saved games to a cache now
+
+        Saved games of a room are written to its hash fields and the room
+        TTL is refreshed.
+
+        Args:
+            room_ids(args): args of room ids to write, all not saved games
+                if empty.
+        """
+        dirty_games = [
+            (room_id, self.dirty_games.pop(room_id))
+            for room_id in room_ids or list(self.dirty_games)
+            if room_id in self.dirty_games
+        ]
+        if not dirty_games:
+            return
+        try:
+            async with self.redis_connection.pipeline(
+                transaction=False
+            ) as pipe:
+                for room_id, room_games in dirty_games:
+                    room_key = ROOM_KEY.format(room_id=room_id)
+                    pipe.hset(room_key, mapping={
+                        ROOM_ACTIVE_AT_FIELD: time.time(),
+                        **{
+                            ROOM_BOARD_FIELD.format(username=username): (
+                                encode_game_board(game_board)
+                            )
+                            for username, game_board in room_games.items()
+                        },
+                    })
+                    pipe.expire(room_key, ROOM_TTL_SECONDS)
+                await pipe.execute()
+        except Exception:
+            # Newer changes made while writing are kept
+            for room_id, room_games in dirty_games:
+                for username, dirty_game in room_games.items():
+                    self.dirty_games.setdefault(room_id, {}).setdefault(
+                        username, dirty_game
+                    )
+            raise
+
+    async def _flush_saved_games_later(self) -> None:
+        await asyncio.sleep(SAVED_GAMES_FLUSH_SECONDS)
+        try:
+            await self.flush_saved_games()
+        except Exception:
+            logger.exception('Saved games are not written')
+        if self.dirty_games:
+            self._flush_task = asyncio.create_task(
+                self._flush_saved_games_later()
+            )
+
+    async def check_room_deadlines(
+        self, room_id: str, turn_timeout: float, idle_timeout: float
+    ) -> Optional[ExpiredRoom]:
+        """
+        Check the turn and idle deadlines of the room in one atomic request
 
-    async def delete_saved_games(self, *usernames) -> None:
+        The user who does not move in turn_timeout loses the started game,
+        the room without any activity in idle_timeout is expired at any
+        stage. Only one worker gets the expired room, so only one worker
+        resolves it.
+
+        Args:
+            room_id (str): Room id for channel,
+            turn_timeout (float): Seconds to make a move,
+            idle_timeout (float): Seconds of the room without activity.
+        Returns:
+            expired_room(ExpiredRoom): Missed deadline, None if the room
+                is not expired or is resolved by other worker.
+        """
+        check_deadlines = self.pubsub_client.get_script(
+            CHECK_DEADLINES_SCRIPT
+        )
+        expired = await check_deadlines(
+            keys=[ROOM_KEY.format(room_id=room_id)],
+            args=[
+                ROOM_ACTIVE_AT_FIELD,
+                ROOM_WINNER_FIELD,
+                ROOM_REAPED_FIELD,
+                ROOM_TURN_FIELD.format(username=''),
+                ROOM_READY_FIELD.format(username=''),
+                ROOM_USERS_AMOUNT,
+                time.time(),
+                turn_timeout,
+                idle_timeout,
+            ],
+        )
+        if not expired:
+            return None
+        deadline, is_started, *winner = expired
+        return ExpiredRoom(
+            RoomDeadlines(deadline.decode()),
+            bool(is_started),
+            winner[0].decode() if winner else None,
+        )
+
+    async def delete_saved_games(self, room_id: str, *usernames) -> None:
         """
         Delete cached serialized game board instances
 
         Args:
-            usernames(args): args of usernames keys to delete cache.
+            room_id(str): Room id of the games,
+            usernames(args): args of board owners usernames.
         """
-        await self.redis_connection.delete(*usernames)
+        room_games = self.dirty_games.get(room_id, {})
+        for username in usernames:
+            room_games.pop(username, None)
+        await self.redis_connection.hdel(
+            ROOM_KEY.format(room_id=room_id),
+            *(
+                ROOM_BOARD_FIELD.format(username=username)
+                for username in usernames
+            ),
+        )
+
+
+def _move_board_keys(room_id: str, username: str) -> tuple[str, str]:
+    return (
+        ROOM_CELLS_KEY.format(room_id=room_id, username=username),
+        ROOM_SHIPS_KEY.format(room_id=room_id, username=username),
+    )
 
 
 sea_battle_ws_manager = SeaBattleManager()
+
+metrics_registry.gauge(
+    'sea_battle_rooms',
+    'Rooms with connections of the worker',
+    lambda: len(sea_battle_ws_manager.rooms),
+)
+metrics_registry.gauge(
+    'sea_battle_connected_sockets',
+    'Open room connections of the worker',
+    lambda: sum(
+        1
+        for room in sea_battle_ws_manager.rooms.values()
+        for user in room.values()
+        if 'connection' in user and not user['connection'].is_closed
+    ),
+)
+metrics_registry.gauge(
+    'sea_battle_waiting_lobbies',
+    'Rooms of the worker waiting for the users fleet',
+    lambda: sum(
+        1
+        for room_id in sea_battle_ws_manager.rooms
+        if room_id not in sea_battle_ws_manager.ready_events
+        or not sea_battle_ws_manager.ready_events[room_id].is_set()
+    ),
+)
+metrics_registry.gauge(
+    'sea_battle_spectators',
+    'Spectator connections of the worker',
+    lambda: sum(map(len, sea_battle_ws_manager.spectators.values())),
+)
+metrics_registry.gauge(
+    'sea_battle_pubsub_subscriptions',
+    'Room channels the worker is subscribed to',
+    lambda: len(sea_battle_ws_manager.pubsub_client.room_queues),
+)
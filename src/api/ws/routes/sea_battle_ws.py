@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, WebSocket
 
 from src.api.di.services import get_game_services
 from src.api.di.user import get_user_from_token
-from src.core.services.ws import sea_battle_ws
+from src.core.services.ws import sea_battle_spectate_ws, sea_battle_ws
+from src.domain.game.enums.rulesets import GameRulesetsEnum
 from src.domain.game.usecases.game import GameServices
 from src.infrastructure.db.models.user import User
 
@@ -13,7 +14,8 @@ router = APIRouter()
 async def main_ws_connection(
     websocket: WebSocket,
     user: User = Depends(get_user_from_token),
-    game_services: GameServices = Depends(get_game_services)
+    game_services: GameServices = Depends(get_game_services),
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC,
 ):
     """
     Main route for sea battle websockets connection
@@ -22,7 +24,30 @@ async def main_ws_connection(
         websocket(WebSocket): WebSocket connection object,
         user(User): Current active user model
 
+    Kwargs:
+        game_services(GameServices): Services usecases for model Game,
+        ruleset(GameRulesetsEnum): Ruleset of the game found by
+            matchmaking
+    """
+    await sea_battle_ws(websocket, user, game_services, ruleset)
+
+
+@router.websocket('/sea-battle/{room_id}/spectate/')
+async def spectate_ws_connection(
+    websocket: WebSocket,
+    room_id: str,
+    user: User = Depends(get_user_from_token),
+    game_services: GameServices = Depends(get_game_services)
+):
+    """
+    Route for read-only sea battle websockets connection to the room
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        room_id(str): Room MongoDB id,
+        user(User): Current active user model
+
     Kwargs:
         game_services(GameServices): Services usecases for model Game
     """
-    await sea_battle_ws(websocket, user, game_services)
+    await sea_battle_spectate_ws(websocket, room_id, game_services)
@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     MONGODB_URL: str = os.getenv('MONGODB_URL')
     REDIS_HOST: str = os.getenv('REDIS_HOST')
     REDIS_PORT: str = os.getenv('REDIS_PORT')
+    GAME_BOARD_ENGINE: str = os.getenv('GAME_BOARD_ENGINE', 'cells')
+    BOT_DIFFICULTY: str = os.getenv('BOT_DIFFICULTY', 'hard')
+    BOT_MOVE_BUDGET: float = float(os.getenv('BOT_MOVE_BUDGET', 0.1))
+    BOT_PROCESSES: int = int(os.getenv('BOT_PROCESSES', 1))
+    TRACE_SAMPLE_RATE: float = float(os.getenv('TRACE_SAMPLE_RATE', 0.01))
+    MATCHMAKING_RATING_BAND: int = int(os.getenv('MATCHMAKING_RATING_BAND', 0))
 
     class Config:
         if not os.getenv('DOCKER'):
@@ -1,7 +1,13 @@
 import logging
+import random
+from functools import lru_cache
 from operator import itemgetter
-from string import ascii_uppercase
-from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+from src.core.services import placement
+from src.core.services.rules import CLASSIC_RULESET, Ruleset
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,10 @@ class Cell:
     cells: int = 0
 
 
+# Game board keeps only the ship cells, all other cells are this one
+EMPTY_CELL = Cell()
+
+
 class Ship:
     """
     Ship class
@@ -36,6 +46,9 @@ class Ship:
     number: int
     cells: int
     value: bool = True
+    x: Optional[str] = None
+    y: Optional[int] = None
+    vertical: bool = False
 
     def __init__(self, ship_type: int, number: int, cells: int) -> None:
         self.ship_type = ship_type
@@ -46,9 +59,68 @@ class Ship:
         return hash(self.number)
 
 
+class MoveLedger:
+    """
+    Per game board record of the moves with incremental counters
+
+    Attributes:
+        ship_hits(dict): Amount of hitted cells for every hitted ship,
+        remaining_cells(int): Amount of placed ships cells not hitted yet,
+        sunk_ships(int): Amount of drowned ships,
+        shots(int): Amount of attacks on the game board.
+    """
+    ship_hits: dict[Ship, int]
+    remaining_cells: int
+    sunk_ships: int
+    shots: int
+
+    def __init__(self) -> None:
+        self.ship_hits = {}
+        self.remaining_cells = 0
+        self.sunk_ships = 0
+        self.shots = 0
+
+    def add_ship(self, ship: Ship) -> None:
+        self.remaining_cells += ship.cells
+
+    def add_hit(self, ship: Ship) -> None:
+        self.shots += 1
+        self.remaining_cells -= 1
+        self.ship_hits[ship] = self.ship_hits.get(ship, 0) + 1
+        if self.is_drowned(ship):
+            self.sunk_ships += 1
+
+    def add_miss(self) -> None:
+        self.shots += 1
+
+    def is_drowned(self, ship: Ship | Cell) -> bool:
+        return self.ship_hits.get(ship, 0) == ship.cells  # type: ignore
+
+
 class GameBoardConfig:
-    GAME_LETTERS = 'ABCDEFGHIJ'
     GAME_CELLS_STR = '▒', '■'
+    GAME_LETTERS: tuple[str, ...]
+    ruleset: Ruleset
+    size: int
+    width: int
+
+    def _init_ruleset(self, ruleset: Ruleset) -> None:
+        self.ruleset = ruleset
+        self.GAME_LETTERS = ruleset.letters
+        self.size = ruleset.height
+        self.width = ruleset.width
+
+    def _cell_idx(self, x: str, y: int) -> Optional[int]:
+        """
+        Get bit index of the cell
+
+        Args:
+            x(str): X coordinate,
+            y(int): Y coordinate.
+        Returns:
+            idx(int | None): Bit index or None if cell is out of game board.
+        """
+        return self.ruleset.cell_idx(x, y)
 
 
 class GameBoardPickShip(GameBoardConfig):
@@ -81,6 +153,8 @@ class GameBoardSetShip(GameBoardPickShip):
             ship = self.pick(ship)
         is_placed: bool = self.place_ship_if_available(ship, x, y, vertical)
         if is_placed:
+            ship.x, ship.y, ship.vertical = x, y, vertical
+            self.ledger.add_ship(ship)  # type: ignore
             self.ships[ship.ship_type]['amount'] -= 1  # type: ignore
             self.ship_counter[ship.ship_type] += 1  # type: ignore
             self._ships_placed.append(ship)  # type: ignore
@@ -99,60 +173,60 @@ class GameBoardSetShip(GameBoardPickShip):
         Returns:
             is_placed(bool): Is ship placed on board.
         """
-        res: bool = False
-        try:
-            self._check_if_cells_available(ship, x, y, vertical)
-        except KeyError:
-            logger.error(
-                f'Error to get key from dictionary game board cords: {x}, {y}'
-            )
-        except IndexError:
-            logger.error(f'Error get index from GAME_LETTERS cords: {x}, {y}')
-        except ShipAlreadyPlacedHere:
-            logger.error(f'Ship was already placed here! cords: {x}, {y}')
-        else:
-            res = True
-            self._check_if_cells_available(ship, x, y, vertical, place=True)
-        return res
-
-    def _check_if_cells_available(
-        self,
-        ship: Ship,
-        x: str,
-        y: int,
-        vertical: bool,
-        place: bool = False
-    ) -> None:
-        place_func: Callable = (
-            self._vertical_place if vertical else self._horizontal_place
+        ship_placement = placement.placement_masks(
+            self.width, self.size, ship.cells, vertical, self._cell_idx(x, y)
         )
-        place_func(ship, x, y, place)
-
-    def _horizontal_place(
-        self, ship: Ship, x: str, y: int, place: bool
-    ) -> None:
-        placing_start_idx: int = self.GAME_LETTERS.index(x)
+        if ship_placement is None:
+            logger.error(f'Cords are out of game board: {x}, {y}')
+            return False
+
+        ship_mask, halo_mask = ship_placement
+        if ship_mask & self.blocked_mask:  # type: ignore
+            logger.error(f'Ship touches other ship! cords: {x}, {y}')
+            return False
+        self.blocked_mask |= halo_mask
+        self._place_ship(ship, ship_mask)
+        return True
+
+    def auto_place_ships(self, rand: Optional[random.Random] = None) -> None:
+        """
+        Place all not placed ships of the fleet at random legal cords
 
-        for cell_numb in range(ship.cells):
-            placing_idx: str = self.GAME_LETTERS[placing_start_idx + cell_numb]
-            if self.game_board[placing_idx][y].value:  # type: ignore
-                raise ShipAlreadyPlacedHere()
-            if place:
-                self.game_board[placing_idx][y] = ship  # type: ignore
+        Args:
+            rand(random.Random): Random numbers generator.
+        Raises:
+            ValueError: If the ships do not fit the game board.
+        """
+        ship_types = [
+            ship_type
+            for ship_type, ship in self.ships.items()  # type: ignore
+            for _ in range(ship['amount'])
+        ]
+        placements = placement.random_fleet(
+            self.width,
+            self.size,
+            [self.ships[ship_type]['cells'] for ship_type in ship_types],
+            self.blocked_mask,
+            rand,
+        )
+        for ship_type, (start_idx, vertical, *_) in zip(
+            ship_types, placements
+        ):
+            y, column = divmod(start_idx, self.width)
+            self.set_ship_into_game_board(
+                ship_type, self.GAME_LETTERS[column], y + 1, vertical
+            )
 
-    def _vertical_place(
-        self, ship: Ship, x: str, y: int, place: bool
-    ) -> None:
-        for cell_numb in range(ship.cells):
-            placing_idx: int = y + cell_numb
-            if self.game_board[x][placing_idx].value:  # type: ignore
-                raise ShipAlreadyPlacedHere()
-            if place:
-                self.game_board[x][placing_idx] = ship  # type: ignore
+    def _place_ship(self, ship: Ship, ship_mask: int) -> None:
+        for idx in placement.iter_bits(ship_mask):
+            y, column = divmod(idx, self.width)
+            letter = self.GAME_LETTERS[column]
+            self.game_board[letter][y + 1] = ship  # type: ignore
 
 
 class GameBoardPlayerMove(GameBoardSetShip):
-    moves: dict[Cell | Ship, list[tuple[str, int]]] = {}
+    moves: dict[tuple[str, int], bool]
+    ledger: MoveLedger
 
     def attack(self, x: str, y: int) -> bool:
         """
@@ -164,15 +238,18 @@ class GameBoardPlayerMove(GameBoardSetShip):
         Returns:
             is_hited(bool): Is player hit the ship.
         """
-        cell: Cell | Ship = self.game_board[x][y]  # type: ignore
-        self.moves.setdefault(cell, [])
+        if self._cell_idx(x, y) is None:
+            raise KeyError((x, y))
+        cell: Cell | Ship = self.game_board[x].get(y, EMPTY_CELL)
+        is_hited: bool = type(cell) is Ship
 
-        if (x, y) in self.moves[cell]:
+        if is_hited and self.moves.get((x, y)):
             raise HaveBeenMoveHere()
-        is_hited: bool = type(cell) is Ship
+        self.moves[(x, y)] = is_hited
         if is_hited:
-            self.moves[cell].append((x, y))
-            self.check_is_drowned(cell)
+            self.ledger.add_hit(cell)  # type: ignore
+        else:
+            self.ledger.add_miss()
         return is_hited
 
     def check_is_drowned(self, ship: Ship | Cell) -> bool:
@@ -182,53 +259,93 @@ class GameBoardPlayerMove(GameBoardSetShip):
         Args:
             ship(Ship): Cell of the ship in game board
         """
-        return len(self.moves[ship]) == ship.cells
+        return self.ledger.is_drowned(ship)
+
+    def get_ship_masks(self, ship: Ship) -> tuple[int, int]:
+        """
+        Bitmasks of the placed ship cells and its halo
+
+        Args:
+            ship(Ship): Ship placed on game board.
+        Returns:
+            masks(tuple[int, int]): Ship and halo bitmasks.
+        """
+        return placement.placement_masks(
+            self.width,
+            self.size,
+            ship.cells,
+            ship.vertical,
+            self._cell_idx(ship.x, ship.y),  # type: ignore
+        )  # type: ignore
 
 
 class GameBoardGame(GameBoardPlayerMove):
-    def _init_game_board(self, size: int = 10) -> None:
+    def _init_game_board(self, ruleset: Ruleset = CLASSIC_RULESET) -> None:
         """
         Main function for initialize default game board
+
+        Columns keep only the ship cells, so the game board takes memory
+        for the fleet and not for every cell of a large game board.
         """
-        self.GAME_LETTERS = ascii_uppercase[:size + 1]
-        self.game_board = {
-            letter: {numb: Cell() for numb in range(1, size + 1)}
-            for letter in self.GAME_LETTERS
+        self._init_ruleset(ruleset)
+        self.game_board: dict[str, dict[int, Cell | Ship]] = {
+            letter: {} for letter in self.GAME_LETTERS
         }
-        self.size = size
+        self.moves = {}
+        self._init_ships()
+
+    def _init_ships(self) -> None:
+        """
+        Initialize default fleet for a game board
+        """
         self.ships: dict[int, dict[str, int]] = {
-            1: {'amount': 4, 'cells': 1},
-            2: {'amount': 3, 'cells': 2},
-            3: {'amount': 2, 'cells': 3},
-            4: {'amount': 1, 'cells': 4}
+            ship_type: dict(ship)
+            for ship_type, ship in self.ruleset.fleet.items()
         }
         self._ships_placed: list[Ship] = []
+        self.blocked_mask = 0
+        self.ledger = MoveLedger()
         self.ship_counter: dict[str, int] = dict(
             zip(self.ships.keys(), iter(int, 1))  # type: ignore
         )
 
+    @property
+    def shots_masks(self) -> tuple[int, int]:
+        """
+        Bitmasks of the hits and misses on game board cells
+
+        Returns:
+            masks(tuple[int, int]): Hits and misses bitmasks, the cell bit
+                index is (y - 1) * width + letter index.
+        """
+        hits_mask = misses_mask = 0
+        for (x, y), is_hited in self.moves.items():
+            cell_mask = 1 << self._cell_idx(x, y)  # type: ignore
+            if is_hited:
+                hits_mask |= cell_mask
+            else:
+                misses_mask |= cell_mask
+        return hits_mask, misses_mask
+
     @property
     def is_all_ships_placed_and_game_initialized(self) -> bool:
         ships_amounts = map(itemgetter('amount'), self.ships.values())
         res = (
             all(amount == 0 for amount in ships_amounts)
-            and self.GAME_LETTERS == ''.join(self.game_board.keys())
+            and self.GAME_LETTERS == tuple(self.game_board.keys())
         )
         return res
 
     @property
     def is_game_over(self) -> bool:
-        return all(
-            self.moves.get(ship) and self.check_is_drowned(ship)
-            for ship in self._ships_placed
-        )
+        return self.ledger.remaining_cells == 0
 
     def print_board(self) -> None:
         print(' '.join(self.game_board))
         for i in range(1, self.size + 1):
             for game_x in self.GAME_LETTERS:
-                game_cell: Cell | Ship = self.game_board[game_x][i]
-                if (hits := self.moves.get(game_cell)) and (game_x, i) in hits:
+                game_cell = self.game_board[game_x].get(i, EMPTY_CELL)
+                if self.moves.get((game_x, i)):
                     print('X', end=' ')
                 else:
                     print(game_cell.cells, end=' ')
@@ -237,26 +354,310 @@ class GameBoardGame(GameBoardPlayerMove):
 
 class GameBoard(GameBoardGame):
     """The main class for the playing field of the game"""
-    def __init__(self) -> None:
-        self._init_game_board()
+    def __init__(self, ruleset: Ruleset = CLASSIC_RULESET) -> None:
+        self._init_game_board(ruleset)
+
+
+class BitGameBoard(GameBoard):
+    """
+    Game board engine which keeps the board state in integer bitmasks
+
+    One bit per cell, the cell index is (y - 1) * width + letter index.
+    Placement and attack are a few bitwise operations instead of the
+    dictionaries of Cell objects used by GameBoard.
+    """
+    ships_mask: int
+    hits_mask: int
+    misses_mask: int
+
+    def _init_game_board(self, ruleset: Ruleset = CLASSIC_RULESET) -> None:
+        self._init_ruleset(ruleset)
+        self._init_ships()
+        self.ships_mask = 0
+        self.hits_mask = 0
+        self.misses_mask = 0
+        self._ship_cells: dict[int, Ship] = {}
+
+    def _place_ship(self, ship: Ship, ship_mask: int) -> None:
+        self.ships_mask |= ship_mask
+        self._ship_cells.update(
+            dict.fromkeys(placement.iter_bits(ship_mask), ship)
+        )
+
+    def attack(self, x: str, y: int) -> bool:
+        idx = self._cell_idx(x, y)
+        if idx is None:
+            raise KeyError((x, y))
+        cell_mask = 1 << idx
+
+        if not cell_mask & self.ships_mask:
+            self.misses_mask |= cell_mask
+            self.ledger.add_miss()
+            return False
+        if cell_mask & self.hits_mask:
+            raise HaveBeenMoveHere()
+        self.hits_mask |= cell_mask
+        self.ledger.add_hit(self._ship_cells[idx])
+        return True
+
+    @property
+    def shots_masks(self) -> tuple[int, int]:
+        return self.hits_mask, self.misses_mask
+
+    @property
+    def is_all_ships_placed_and_game_initialized(self) -> bool:
+        ships_amounts = map(itemgetter('amount'), self.ships.values())
+        return all(amount == 0 for amount in ships_amounts)
+
+    def print_board(self) -> None:
+        print(' '.join(self.GAME_LETTERS))
+        for idx in range(self.size * self.width):
+            cell_mask = 1 << idx
+            if cell_mask & self.hits_mask:
+                cell = 'X'
+            else:
+                cell = str(self._ship_cells.get(idx, EMPTY_CELL).cells)
+            print(cell, end=' ')
+            if (idx + 1) % self.width == 0:
+                print()
+
+
+class BatchGameBoard(GameBoardConfig):
+    """
+    N game boards kept in NumPy arrays for the games simulations
+
+    Every method takes one move for every game board and applies all of
+    them in one vectorised call. Cords are arrays of the letter indexes and
+    y coordinates, wrong cords and repeated hits are skipped as not hitted.
+
+    Args:
+        boards_amount(int): Amount of game boards,
+        ruleset(Ruleset): Game rules of every game board.
+    """
+    def __init__(
+        self, boards_amount: int, ruleset: Ruleset = CLASSIC_RULESET
+    ) -> None:
+        self._init_ruleset(ruleset)
+        self.boards_amount = boards_amount
+        self.ship_types = np.array(list(ruleset.fleet), dtype=np.int16)
+        self.ship_cells = np.array(
+            [ship['cells'] for ship in ruleset.fleet.values()],
+            dtype=np.int16
+        )
+        ships_amount = sum(ship['amount'] for ship in ruleset.fleet.values())
+        # The last cell column is for wrong cords and placements halo
+        cells_shape = (boards_amount, self.size * self.width + 1)
+
+        self.ship_ids = np.zeros(cells_shape, dtype=np.int16)
+        self.hits = np.zeros(cells_shape, dtype=bool)
+        self.misses = np.zeros(cells_shape, dtype=bool)
+        self.blocked = np.zeros(cells_shape, dtype=bool)
+        self.ships = np.tile(
+            np.array(
+                [ship['amount'] for ship in ruleset.fleet.values()],
+                dtype=np.int16
+            ),
+            (boards_amount, 1)
+        )
+        self.ships_placed = np.zeros(boards_amount, dtype=np.int16)
+        self.ship_cells_left = np.zeros(
+            (boards_amount, ships_amount + 1), dtype=np.int16
+        )
+        self.remaining_cells = np.zeros(boards_amount, dtype=np.int32)
+        self.sunk_ships = np.zeros(boards_amount, dtype=np.int32)
+        self.shots = np.zeros(boards_amount, dtype=np.int32)
+
+    def set_ships_into_game_boards(
+        self,
+        ship_types: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        vertical: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Set ship on every game board
+
+        Args:
+            ship_types(np.ndarray): Ship type for every game board,
+            x(np.ndarray): X coordinates as GAME_LETTERS indexes,
+            y(np.ndarray): Y coordinates,
+            vertical(np.ndarray): Is placed ship vertical or not.
+        Returns:
+            is_placed(np.ndarray): Is ship placed on every game board.
+        """
+        ship_types, x, y, vertical = np.broadcast_arrays(
+            ship_types, x, y, np.asarray(vertical, dtype=bool)
+        )
+        is_placed = np.zeros(self.boards_amount, dtype=bool)
+        type_idx = np.searchsorted(self.ship_types, ship_types)
+        type_idx = np.minimum(type_idx, len(self.ship_types) - 1)
+        boards = np.arange(self.boards_amount)
+        is_available = (
+            (self.ship_types[type_idx] == ship_types)
+            & (self.ships[boards, type_idx] > 0)
+        )
+        start_idx = self._cells_idx(x, y)
+
+        for cells in np.unique(self.ship_cells):
+            for is_vertical in (False, True):
+                group = np.flatnonzero(
+                    is_available
+                    & (self.ship_cells[type_idx] == cells)
+                    & (vertical == is_vertical)
+                )
+                ship_idx, halo_idx = _batch_placement_table(
+                    self.width, self.size, int(cells), is_vertical
+                )
+                group_ship_idx = ship_idx[start_idx[group]]
+                group = group[
+                    (group_ship_idx[:, 0] < ship_idx.shape[0] - 1)
+                    & ~self.blocked[group[:, None], group_ship_idx].any(1)
+                ]
+                self._place_ships(
+                    group,
+                    type_idx[group],
+                    ship_idx[start_idx[group]],
+                    halo_idx[start_idx[group]],
+                )
+                is_placed[group] = True
+        return is_placed
+
+    def _place_ships(
+        self,
+        boards: np.ndarray,
+        type_idx: np.ndarray,
+        ship_idx: np.ndarray,
+        halo_idx: np.ndarray,
+    ) -> None:
+        self.ships_placed[boards] += 1
+        self.ship_ids[boards[:, None], ship_idx] = (
+            self.ships_placed[boards, None]
+        )
+        self.blocked[boards[:, None], halo_idx] = True
+        self.ships[boards, type_idx] -= 1
+        self.ship_cells_left[boards, self.ships_placed[boards]] = (
+            ship_idx.shape[1]
+        )
+        self.remaining_cells[boards] += ship_idx.shape[1]
+
+    def attack(
+        self, x: np.ndarray, y: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Player movement on every game board
+
+        Args:
+            x(np.ndarray): X coordinates as GAME_LETTERS indexes,
+            y(np.ndarray): Y coordinates.
+        Returns:
+            results(tuple): Is hited, is ship drowned and is game over
+                vectors for every game board.
+        """
+        boards = np.arange(self.boards_amount)
+        cells_idx = self._cells_idx(*np.broadcast_arrays(x, y))
+        is_valid = cells_idx < self.hits.shape[1] - 1
+        ship_ids = self.ship_ids[boards, cells_idx]
+
+        is_hited = is_valid & (ship_ids > 0) & ~self.hits[boards, cells_idx]
+        is_missed = is_valid & (ship_ids == 0)
+        self.hits[boards[is_hited], cells_idx[is_hited]] = True
+        self.misses[boards[is_missed], cells_idx[is_missed]] = True
+
+        self.ship_cells_left[boards[is_hited], ship_ids[is_hited]] -= 1
+        is_drowned = is_hited & (self.ship_cells_left[boards, ship_ids] == 0)
+        self.remaining_cells -= is_hited
+        self.sunk_ships += is_drowned
+        self.shots += is_hited | is_missed
+        return is_hited, is_drowned, self.is_game_over
+
+    def _cells_idx(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        x, y = np.asarray(x), np.asarray(y)
+        is_valid = (
+            (x >= 0) & (x < self.width) & (y >= 1) & (y <= self.size)
+        )
+        return np.where(
+            is_valid, (y - 1) * self.width + x, self.size * self.width
+        )
+
+    @property
+    def is_all_ships_placed_and_game_initialized(self) -> np.ndarray:
+        return ~self.ships.any(1)
+
+    @property
+    def is_game_over(self) -> np.ndarray:
+        return self.remaining_cells == 0
+
+
+@lru_cache(maxsize=None)
+def _batch_placement_table(
+    width: int, height: int, cells: int, vertical: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Placement table as the cell indexes arrays for BatchGameBoard
+
+    Returns:
+        tables(tuple): Ship and halo cell indexes for every start cell
+            index, wrong placements and padding point to the last cell.
+    """
+    cells_amount = width * height
+    ship_idx = np.full((cells_amount + 1, cells), cells_amount, dtype=np.intp)
+    halo_idx = np.full(
+        (cells_amount + 1, 3 * (cells + 2)), cells_amount, dtype=np.intp
+    )
+    for start_idx in range(cells_amount):
+        ship_placement = placement.placement_masks(
+            width, height, cells, vertical, start_idx
+        )
+        if ship_placement is None:
+            continue
+        ship_mask, halo_mask = ship_placement
+        ship_idx[start_idx] = list(placement.iter_bits(ship_mask))
+        halo_cells = list(placement.iter_bits(halo_mask))
+        halo_idx[start_idx, :len(halo_cells)] = halo_cells
+    return ship_idx, halo_idx
+
+
+GAME_BOARD_ENGINES: dict[str, type[GameBoard]] = {
+    'cells': GameBoard,
+    'bitboard': BitGameBoard,
+}
+
+
+def make_game_board(
+    engine: str = 'cells', ruleset: Ruleset = CLASSIC_RULESET
+) -> GameBoard:
+    """
+    Create game board with selected engine
+
+    Args:
+        engine(str): Engine name from GAME_BOARD_ENGINES,
+        ruleset(Ruleset): Game rules.
+    Returns:
+        game_board(GameBoard): New empty game board.
+    """
+    try:
+        game_board_class = GAME_BOARD_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f'Unknown game board engine: {engine}')
+    return game_board_class(ruleset)
 
 
 if __name__ == '__main__':
     mg1 = GameBoard()
 
-    mg1.set_ship_into_game_board(1, 'D', 7, True)
-    mg1.set_ship_into_game_board(1, 'D', 3, True)
-    mg1.set_ship_into_game_board(1, 'D', 4, True)
-    mg1.set_ship_into_game_board(1, 'D', 5, True)
+    mg1.set_ship_into_game_board(1, 'D', 8, True)
+    mg1.set_ship_into_game_board(1, 'F', 6, True)
+    mg1.set_ship_into_game_board(1, 'H', 5, True)
+    mg1.set_ship_into_game_board(1, 'J', 9, True)
 
-    mg1.set_ship_into_game_board(2, 'D', 1, True)
-    mg1.set_ship_into_game_board(2, 'E', 5)
-    mg1.set_ship_into_game_board(2, 'F', 1, True)
+    mg1.set_ship_into_game_board(2, 'I', 1, True)
+    mg1.set_ship_into_game_board(2, 'E', 3)
+    mg1.set_ship_into_game_board(2, 'A', 6)
 
-    mg1.set_ship_into_game_board(3, 'J', 1, True)
     mg1.set_ship_into_game_board(3, 'C', 1, True)
+    mg1.set_ship_into_game_board(3, 'E', 1)
 
-    mg1.set_ship_into_game_board(4, 'B', 1, True)
+    mg1.set_ship_into_game_board(4, 'A', 1, True)
 
     mg1.print_board()
     print(
@@ -266,17 +667,17 @@ if __name__ == '__main__':
 
     mg2 = GameBoard()
 
-    mg2.set_ship_into_game_board(1, 'D', 7, False)
-    mg2.set_ship_into_game_board(1, 'D', 3, False)
-    mg2.set_ship_into_game_board(1, 'D', 4, False)
-    mg2.set_ship_into_game_board(1, 'D', 5, False)
+    mg2.set_ship_into_game_board(1, 'A', 5, True)
+    mg2.set_ship_into_game_board(1, 'C', 7, True)
+    mg2.set_ship_into_game_board(1, 'H', 9, True)
+    mg2.set_ship_into_game_board(1, 'H', 4, True)
 
-    mg2.set_ship_into_game_board(2, 'D', 1, False)
+    mg2.set_ship_into_game_board(2, 'E', 1, True)
+    mg2.set_ship_into_game_board(2, 'G', 1, False)
     mg2.set_ship_into_game_board(2, 'E', 5, False)
-    mg2.set_ship_into_game_board(2, 'F', 1, False)
 
-    mg2.set_ship_into_game_board(3, 'J', 1, True)
-    mg2.set_ship_into_game_board(3, 'C', 1, True)
+    mg2.set_ship_into_game_board(3, 'A', 1, False)
+    mg2.set_ship_into_game_board(3, 'A', 10, False)
 
     mg2.set_ship_into_game_board(4, 'J', 4, True)
 
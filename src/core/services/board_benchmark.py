@@ -0,0 +1,302 @@
+"""
+Micro-benchmarks of the game board engines.
+
+Every case is measured for every engine and ruleset, the result is the
+best time of one operation over a few repeats.
+
+Save a baseline:
+    python -m src.core.services.board_benchmark --save
+Compare with the baseline, exit code is 1 if any case is slower than
+the baseline times threshold:
+    python -m src.core.services.board_benchmark --threshold 1.3
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+from src.core.services import board, board_snapshot
+from src.core.services.placement import random_fleet
+from src.core.services.rules import RULESETS, Ruleset
+
+BASELINE_PATH = Path('.benchmarks/board_engine.json')
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 1.25
+REPEATS = 5
+# Minimal time of one repeat, fast cases are run many times in a repeat
+MIN_REPEAT_SECONDS = 0.05
+
+Fleet = list[tuple[int, str, int, bool]]
+
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    # Builds a fresh game board and returns operation to measure on it
+    prepare: Callable[[], Callable[[], int]]
+    # Operation changes the game board, so it is prepared for every run
+    is_mutating: bool = False
+
+
+def game_fleet(ruleset: Ruleset, seed: int = 0) -> Fleet:
+    """
+    Legal placement of the whole fleet
+
+    Returns:
+        fleet(Fleet): Ship type, x, y and vertical of every ship.
+    """
+    ship_types = [
+        ship_type
+        for ship_type, ship in ruleset.fleet.items()
+        for _ in range(ship['amount'])
+    ]
+    placements = random_fleet(
+        ruleset.width,
+        ruleset.height,
+        [ruleset.fleet[ship_type]['cells'] for ship_type in ship_types],
+        rand=random.Random(seed),
+    )
+    fleet: Fleet = []
+    for ship_type, (start_idx, vertical, *_) in zip(ship_types, placements):
+        y, column = divmod(start_idx, ruleset.width)
+        fleet.append((ship_type, ruleset.letters[column], y + 1, vertical))
+    return fleet
+
+
+def all_cords(ruleset: Ruleset, seed: int = 0) -> list[tuple[str, int]]:
+    cords = [
+        (letter, y)
+        for y in range(1, ruleset.height + 1)
+        for letter in ruleset.letters
+    ]
+    random.Random(seed).shuffle(cords)
+    return cords
+
+
+def benchmark_cases(engine: str, ruleset: Ruleset) -> list[BenchmarkCase]:
+    """
+    Benchmark cases for the engine and ruleset
+
+    Every prepare function returns the operation and the operation returns
+    amount of measured calls, so the time is reported per call.
+    """
+    fleet = game_fleet(ruleset)
+    cords = all_cords(ruleset)
+    half_cords = cords[:len(cords) // 2]
+
+    def new_board() -> board.GameBoard:
+        return board.make_game_board(engine, ruleset)
+
+    def placed_board() -> board.GameBoard:
+        game_board = new_board()
+        for ship_type, x, y, vertical in fleet:
+            game_board.set_ship_into_game_board(ship_type, x, y, vertical)
+        return game_board
+
+    def played_board() -> board.GameBoard:
+        game_board = placed_board()
+        for x, y in half_cords:
+            game_board.attack(x, y)
+        return game_board
+
+    def prepare_placement() -> Callable[[], int]:
+        game_board = new_board()
+
+        def placement() -> int:
+            for ship_type, x, y, vertical in fleet:
+                game_board.set_ship_into_game_board(ship_type, x, y, vertical)
+            return len(fleet)
+        return placement
+
+    def prepare_auto_placement() -> Callable[[], int]:
+        game_board = new_board()
+        rand = random.Random(0)
+
+        def auto_placement() -> int:
+            game_board.auto_place_ships(rand)
+            return 1
+        return auto_placement
+
+    def prepare_attack() -> Callable[[], int]:
+        game_board = placed_board()
+
+        def attack() -> int:
+            for x, y in cords:
+                game_board.attack(x, y)
+            return len(cords)
+        return attack
+
+    def prepare_is_game_over() -> Callable[[], int]:
+        game_board = played_board()
+
+        def is_game_over() -> int:
+            for _ in range(100):
+                game_board.is_game_over
+            return 100
+        return is_game_over
+
+    def prepare_is_all_ships_placed() -> Callable[[], int]:
+        game_board = played_board()
+
+        def is_all_ships_placed() -> int:
+            for _ in range(100):
+                game_board.is_all_ships_placed_and_game_initialized
+            return 100
+        return is_all_ships_placed
+
+    def prepare_print_board() -> Callable[[], int]:
+        game_board = played_board()
+
+        def print_board() -> int:
+            with redirect_stdout(io.StringIO()):
+                game_board.print_board()
+            return 1
+        return print_board
+
+    def prepare_snapshot_encode() -> Callable[[], int]:
+        game_board = played_board()
+
+        def snapshot_encode() -> int:
+            board_snapshot.encode_game_board(game_board)
+            return 1
+        return snapshot_encode
+
+    def prepare_snapshot_decode() -> Callable[[], int]:
+        snapshot = board_snapshot.encode_game_board(played_board())
+
+        def snapshot_decode() -> int:
+            board_snapshot.decode_game_board(snapshot)
+            return 1
+        return snapshot_decode
+
+    return [
+        BenchmarkCase('placement', prepare_placement, True),
+        BenchmarkCase('auto_placement', prepare_auto_placement, True),
+        BenchmarkCase('attack', prepare_attack, True),
+        BenchmarkCase('is_game_over', prepare_is_game_over),
+        BenchmarkCase('is_all_ships_placed', prepare_is_all_ships_placed),
+        BenchmarkCase('print_board', prepare_print_board),
+        BenchmarkCase('snapshot_encode', prepare_snapshot_encode),
+        BenchmarkCase('snapshot_decode', prepare_snapshot_decode),
+    ]
+
+
+def measure(case: BenchmarkCase, repeats: int = REPEATS) -> float:
+    """
+    Best time of one operation call in seconds
+
+    Operations which change the game board, like attack, get a prepared
+    game board before every run, so they are measured on the same state.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        calls = 0
+        seconds = 0.0
+        operation = case.prepare()
+        while seconds < MIN_REPEAT_SECONDS:
+            if case.is_mutating and calls:
+                operation = case.prepare()
+            started = time.perf_counter()
+            calls += operation()
+            seconds += time.perf_counter() - started
+        best = min(best, seconds / calls)
+    return best
+
+
+def run_benchmarks(
+    engines: list[str], rulesets: list[str], repeats: int = REPEATS
+) -> Iterator[tuple[str, float]]:
+    """Yield case key 'engine/ruleset/case' and its time of one call"""
+    for ruleset_name in rulesets:
+        for engine in engines:
+            for case in benchmark_cases(engine, RULESETS[ruleset_name]):
+                key = f'{engine}/{ruleset_name}/{case.name}'
+                yield key, measure(case, repeats)
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """
+    Get cases slower than the baseline times threshold
+
+    Returns:
+        regressions(list[str]): Description of every regression.
+    """
+    return [
+        f'{key}: {seconds * 1e6:.2f}us, '
+        f'baseline {baseline[key] * 1e6:.2f}us, '
+        f'x{seconds / baseline[key]:.2f}'
+        for key, seconds in results.items()
+        if key in baseline and seconds > baseline[key] * threshold
+    ]
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='Save results as a new baseline instead of comparing',
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD
+    )
+    parser.add_argument(
+        '--engine',
+        action='append',
+        choices=list(board.GAME_BOARD_ENGINES),
+        help='Engines to measure, all by default',
+    )
+    parser.add_argument(
+        '--ruleset',
+        action='append',
+        choices=list(RULESETS),
+        help='Rulesets to measure, all by default',
+    )
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    args = parser.parse_args(argv)
+
+    results: dict[str, float] = {}
+    for key, seconds in run_benchmarks(
+        args.engine or list(board.GAME_BOARD_ENGINES),
+        args.ruleset or list(RULESETS),
+        args.repeats,
+    ):
+        results[key] = seconds
+        print(f'{key:<45} {seconds * 1e6:12.2f}us', flush=True)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(
+            {
+                'version': BASELINE_VERSION,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            },
+            indent=2,
+        ))
+        print(f'Baseline is saved to {args.baseline}')
+        return 0
+
+    if not args.baseline.exists():
+        print(f'No baseline at {args.baseline}, run with --save first')
+        return 1
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline['results'], args.threshold)
+    for regression in regressions:
+        print('Slower than baseline:', regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
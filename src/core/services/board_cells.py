@@ -0,0 +1,130 @@
+"""
+Compact game board encoding for the moves applied in Redis.
+
+A board is kept in two Redis string keys of the room, so the move Lua
+script reads and changes single bytes of it with GETRANGE and SETRANGE:
+    cells: one byte of every width * height cell, WATER, MISS or
+        SHIP_CELL + 2 * ship index, plus one if the ship cell is hitted;
+    ships: one byte of every ship, amount of its not hitted cells.
+"""
+from typing import Iterator, NamedTuple
+
+from src.core.services.board import GameBoard, ShipsOver, make_game_board
+from src.core.services.placement import iter_bits
+from src.core.services.rules import Ruleset
+
+WATER = 0
+MISS = 1
+SHIP_CELL = 2
+MAX_SHIPS = (256 - SHIP_CELL) // 2
+
+
+class BoardCellsError(Exception):
+    ...
+
+
+class BoardCells(NamedTuple):
+    cells: bytes
+    ships: bytes
+
+
+def encode_board_cells(game_board: GameBoard) -> BoardCells:
+    """
+    Encode game board to the compact cells encoding
+
+    Args:
+        game_board(GameBoard): GameBoard instance of any engine.
+    Returns:
+        board_cells(BoardCells): Cells and ships byte strings.
+    Raises:
+        BoardCellsError: If the board has more than MAX_SHIPS ships.
+    """
+    if len(game_board._ships_placed) > MAX_SHIPS:
+        raise BoardCellsError(f'More than {MAX_SHIPS} ships are placed')
+    cells = bytearray(game_board.width * game_board.size)
+    ships = bytearray()
+    hits_mask, misses_mask = game_board.shots_masks
+
+    for cell_idx in iter_bits(misses_mask):
+        cells[cell_idx] = MISS
+    for ship_idx, ship in enumerate(game_board._ships_placed):
+        ship_mask, _ = game_board.get_ship_masks(ship)
+        cells_left = 0
+        for cell_idx in iter_bits(ship_mask):
+            is_hited = hits_mask >> cell_idx & 1
+            cells[cell_idx] = SHIP_CELL + 2 * ship_idx + is_hited
+            cells_left += not is_hited
+        ships.append(cells_left)
+    return BoardCells(bytes(cells), bytes(ships))
+
+
+def iter_shots(cells: bytes) -> Iterator[tuple[int, bool]]:
+    """
+    Iterate over the shot cells only, not hitted ships are not revealed
+
+    Args:
+        cells(bytes): Cells byte string.
+    Returns:
+        shots(Iterator): Cell index and is the shot a hit.
+    """
+    for cell_idx, cell in enumerate(cells):
+        if cell == MISS:
+            yield cell_idx, False
+        elif cell >= SHIP_CELL and (cell - SHIP_CELL) % 2:
+            yield cell_idx, True
+
+
+def decode_board_cells(
+    board_cells: BoardCells, ruleset: Ruleset, engine: str = 'cells'
+) -> GameBoard:
+    """
+    Restore game board from the compact cells encoding
+
+    Ship types are found by the amount of ship cells, so every ship type
+    of the ruleset must have its own amount of cells.
+
+    Args:
+        board_cells(BoardCells): Cells and ships byte strings,
+        ruleset(Ruleset): Ruleset the board is played with,
+        engine(str): Engine name from GAME_BOARD_ENGINES.
+    Returns:
+        game_board(GameBoard): GameBoard instance with ships and shots.
+    Raises:
+        BoardCellsError: If cells do not match the ruleset.
+    """
+    if len(board_cells.cells) != ruleset.width * ruleset.height:
+        raise BoardCellsError('Cells amount does not match the ruleset')
+    ships_cells: dict[int, list[int]] = {}
+    for cell_idx, cell in enumerate(board_cells.cells):
+        if cell >= SHIP_CELL:
+            ship_idx = (cell - SHIP_CELL) // 2
+            ships_cells.setdefault(ship_idx, []).append(cell_idx)
+
+    ship_types = {
+        ship['cells']: ship_type for ship_type, ship in ruleset.fleet.items()
+    }
+    game_board = make_game_board(engine, ruleset)
+    for ship_idx in sorted(ships_cells):
+        cells_idx = ships_cells[ship_idx]
+        y, column = divmod(cells_idx[0], ruleset.width)
+        vertical = (
+            len(cells_idx) == 1
+            or cells_idx[1] - cells_idx[0] == ruleset.width
+        )
+        try:
+            is_placed = game_board.set_ship_into_game_board(
+                ship_types[len(cells_idx)],
+                ruleset.letters[column],
+                y + 1,
+                vertical,
+            )
+        except (KeyError, ShipsOver):
+            is_placed = False
+        if not is_placed:
+            raise BoardCellsError(f'Ship {ship_idx} is not placed')
+
+    for cell_idx, cell in enumerate(board_cells.cells):
+        if cell == MISS or cell >= SHIP_CELL and (cell - SHIP_CELL) % 2:
+            y, column = divmod(cell_idx, ruleset.width)
+            game_board.attack(ruleset.letters[column], y + 1)
+    return game_board
@@ -0,0 +1,202 @@
+"""
+Compact versioned binary snapshot of a game board.
+
+Layout, all numbers are unsigned big-endian bytes (B) or shorts (H):
+    header: magic(2s), version(B), engine(B), width(H), height(H),
+        move again on hit(B), fleet amount(B), placed ships amount(H);
+    fleet: ship type(B), amount of ships(H), ship cells(B) - for every
+        ship type;
+    placements: ship type(B), letter index(H), y(H), vertical(B) - in
+        placing order;
+    shots: hits and misses bitmasks of the width * height cells each.
+
+Version 1 snapshots, saved before the rulesets, and version 2 snapshots,
+saved with the board owner turn, are still decoded. Turns are kept in
+the room hash fields.
+
+Decode a saved blob offline with:
+    python -m src.core.services.board_snapshot <path to blob>
+"""
+import struct
+import sys
+
+from src.core.services.board import GAME_BOARD_ENGINES, GameBoard
+from src.core.services.placement import iter_bits
+from src.core.services.rules import Ruleset
+
+SNAPSHOT_MAGIC = b'SB'
+SNAPSHOT_VERSION = 3
+SNAPSHOT_ENGINES = ('cells', 'bitboard')
+
+HEADER = struct.Struct('>2sBBHHBBH')
+FLEET_ITEM = struct.Struct('>BHB')
+PLACEMENT_ITEM = struct.Struct('>BHHB')
+
+# Version 1 had the classic fleet and one more column than the size
+HEADER_V1 = struct.Struct('>2s6B')
+FLEET_ITEM_V1 = struct.Struct('>3B')
+PLACEMENT_ITEM_V1 = struct.Struct('>4B')
+# Version 2 had the board owner turn before the move again on hit
+HEADER_V2 = struct.Struct('>2sBBHHBBBH')
+
+
+class SnapshotError(Exception):
+    ...
+
+
+def encode_game_board(game_board: GameBoard) -> bytes:
+    """
+    Encode game board to the binary snapshot
+
+    Args:
+        game_board(GameBoard): GameBoard instance of any engine.
+    Returns:
+        snapshot(bytes): Binary snapshot of the game board.
+    """
+    engine = next(
+        name for name, game_board_class in GAME_BOARD_ENGINES.items()
+        if type(game_board) is game_board_class
+    )
+    fleet = [
+        (ship_type, ship['amount'], ship['cells'])
+        for ship_type, ship in game_board.ruleset.fleet.items()
+    ]
+    placements = [
+        (
+            ship.ship_type,
+            game_board.GAME_LETTERS.index(ship.x),  # type: ignore
+            ship.y,
+            ship.vertical,
+        )
+        for ship in game_board._ships_placed
+    ]
+    masks_length = _masks_length(game_board)
+    hits_mask, misses_mask = game_board.shots_masks
+
+    return b''.join((
+        HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            SNAPSHOT_ENGINES.index(engine),
+            game_board.width,
+            game_board.size,
+            game_board.ruleset.move_again_on_hit,
+            len(fleet),
+            len(placements),
+        ),
+        *(FLEET_ITEM.pack(*fleet_item) for fleet_item in fleet),
+        *(PLACEMENT_ITEM.pack(*placement) for placement in placements),
+        hits_mask.to_bytes(masks_length, 'little'),
+        misses_mask.to_bytes(masks_length, 'little'),
+    ))
+
+
+def decode_game_board(snapshot: bytes) -> GameBoard:
+    """
+    Decode game board from the binary snapshot
+
+    Args:
+        snapshot(bytes): Binary snapshot from encode_game_board.
+    Returns:
+        game_board(GameBoard): Restored GameBoard instance.
+    Raises:
+        SnapshotError: If snapshot is corrupted or has unknown version.
+    """
+    try:
+        return _decode_game_board(memoryview(snapshot))
+    except (struct.error, IndexError, KeyError, ValueError) as exc:
+        raise SnapshotError(f'Corrupted game board snapshot: {exc!r}')
+
+
+def _decode_game_board(snapshot: memoryview) -> GameBoard:
+    magic, version = struct.unpack_from('>2sB', snapshot)
+    if magic != SNAPSHOT_MAGIC or version not in (1, 2, SNAPSHOT_VERSION):
+        raise SnapshotError(
+            f'Unknown game board snapshot: {magic!r} version {version}'
+        )
+    if version == 1:
+        header, fleet_item, placement_item = (
+            HEADER_V1, FLEET_ITEM_V1, PLACEMENT_ITEM_V1
+        )
+        (
+            _, _, engine, height, _, fleet_amount, placed_amount
+        ) = header.unpack_from(snapshot)
+        width, move_again_on_hit = height + 1, True
+    elif version == 2:
+        header, fleet_item, placement_item = (
+            HEADER_V2, FLEET_ITEM, PLACEMENT_ITEM
+        )
+        (
+            _,
+            _,
+            engine,
+            width,
+            height,
+            _,
+            move_again_on_hit,
+            fleet_amount,
+            placed_amount,
+        ) = header.unpack_from(snapshot)
+    else:
+        header, fleet_item, placement_item = (
+            HEADER, FLEET_ITEM, PLACEMENT_ITEM
+        )
+        (
+            _,
+            _,
+            engine,
+            width,
+            height,
+            move_again_on_hit,
+            fleet_amount,
+            placed_amount,
+        ) = header.unpack_from(snapshot)
+    offset = header.size
+
+    fleet = {}
+    for _ in range(fleet_amount):
+        ship_type, amount, cells = fleet_item.unpack_from(snapshot, offset)
+        offset += fleet_item.size
+        fleet[ship_type] = {'amount': amount, 'cells': cells}
+    game_board = GAME_BOARD_ENGINES[SNAPSHOT_ENGINES[engine]](
+        Ruleset(width, height, fleet, bool(move_again_on_hit))
+    )
+
+    for _ in range(placed_amount):
+        ship_type, letter_idx, y, vertical = (
+            placement_item.unpack_from(snapshot, offset)
+        )
+        offset += placement_item.size
+        if not game_board.set_ship_into_game_board(
+            ship_type, game_board.GAME_LETTERS[letter_idx], y, bool(vertical)
+        ):
+            raise SnapshotError(f'Ship {ship_type} can not be placed')
+
+    masks_length = _masks_length(game_board)
+    if len(snapshot) != offset + 2 * masks_length:
+        raise SnapshotError('Wrong game board snapshot length')
+    hits_mask = int.from_bytes(snapshot[offset:offset + masks_length], 'little')
+    misses_mask = int.from_bytes(snapshot[offset + masks_length:], 'little')
+    _replay_shots(game_board, hits_mask | misses_mask)
+    return game_board
+
+
+def _replay_shots(game_board: GameBoard, shots_mask: int) -> None:
+    for idx in iter_bits(shots_mask):
+        y, letter_idx = divmod(idx, game_board.width)
+        game_board.attack(game_board.GAME_LETTERS[letter_idx], y + 1)
+
+
+def _masks_length(game_board: GameBoard) -> int:
+    return (game_board.size * game_board.width + 7) // 8
+
+
+if __name__ == '__main__':
+    with open(sys.argv[1], 'rb') as snapshot_file:
+        game_board = decode_game_board(snapshot_file.read())
+    game_board.print_board()
+    print(
+        'Is board initialized:',
+        game_board.is_all_ships_placed_and_game_initialized,
+        'Is game over:', game_board.is_game_over,
+    )
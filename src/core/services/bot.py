@@ -0,0 +1,234 @@
+"""
+Computer opponent for the sea battle game.
+
+The bot sees only what a player sees: own shots, hits, misses and the
+drowned ships. Shots are picked from a hunt/target probability density
+of the remaining fleet placements.
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from src.core.services.board import GameBoard
+from src.core.services.placement import iter_bits, iter_placements
+
+# Placement covering a not drowned hit is worth that many hunt placements
+TARGET_WEIGHT = 50
+BUDGET_CHECK_PLACEMENTS = 256
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class BotDifficulty(str, Enum):
+    EASY: str = 'easy'
+    MEDIUM: str = 'medium'
+    HARD: str = 'hard'
+
+
+class BoardView(NamedTuple):
+    """
+    Opponent game board as the bot sees it
+
+    Args:
+        width(int): Game board width,
+        height(int): Game board height,
+        hits_mask(int): Hitted cells,
+        misses_mask(int): Missed cells,
+        sunk_mask(int): Drowned ships cells,
+        sunk_halo_mask(int): Drowned ships cells with surrounding cells,
+        fleet_cells(tuple[int, ...]): Cells of every not drowned ship.
+    """
+    width: int
+    height: int
+    hits_mask: int
+    misses_mask: int
+    sunk_mask: int
+    sunk_halo_mask: int
+    fleet_cells: tuple[int, ...]
+
+
+def board_view(game_board: GameBoard) -> BoardView:
+    """
+    Get what the player sees on the opponent game board
+
+    Args:
+        game_board(GameBoard): Opponent game board of any engine.
+    """
+    hits_mask, misses_mask = game_board.shots_masks
+    sunk_mask = sunk_halo_mask = 0
+    fleet_cells = []
+
+    for ship in game_board._ships_placed:
+        if game_board.check_is_drowned(ship):
+            ship_mask, halo_mask = game_board.get_ship_masks(ship)
+            sunk_mask |= ship_mask
+            sunk_halo_mask |= halo_mask
+        else:
+            fleet_cells.append(ship.cells)
+    return BoardView(
+        game_board.width,
+        game_board.size,
+        hits_mask,
+        misses_mask,
+        sunk_mask,
+        sunk_halo_mask,
+        tuple(fleet_cells),
+    )
+
+
+def choose_shot(
+    view: BoardView,
+    difficulty: BotDifficulty = BotDifficulty.HARD,
+    budget: float = 0.1,
+    rand: Optional[random.Random] = None,
+) -> int:
+    """
+    Choose the cell to attack
+
+    Args:
+        view(BoardView): Opponent game board as the bot sees it,
+        difficulty(BotDifficulty): Bot difficulty level,
+        budget(float): Seconds the bot may think,
+        rand(random.Random): Random numbers generator.
+    Returns:
+        cell_idx(int): Cell bit index, (y - 1) * width + letter index.
+    """
+    rand = rand or random.Random()
+    free_mask = (
+        ((1 << view.width * view.height) - 1)
+        & ~(view.hits_mask | view.misses_mask | view.sunk_halo_mask)
+    )
+    if not free_mask:
+        free_mask = ((1 << view.width * view.height) - 1) & ~(
+            view.hits_mask | view.misses_mask
+        )
+
+    if difficulty == BotDifficulty.HARD:
+        weights = probability_density(view, time.perf_counter() + budget)
+        cells = _best_cells(weights, free_mask)
+    elif difficulty == BotDifficulty.MEDIUM:
+        cells = list(iter_bits(_target_neighbours(view) & free_mask))
+        if not cells:
+            cells = list(iter_bits(_checkerboard_mask(view) & free_mask))
+    else:
+        cells = []
+    return rand.choice(cells or list(iter_bits(free_mask)))
+
+
+def probability_density(view: BoardView, deadline: float) -> list[int]:
+    """
+    Count how many remaining fleet placements cover every cell
+
+    Placements covering not drowned hits get TARGET_WEIGHT times more
+    weight, so the bot finishes a hitted ship before hunting further.
+
+    Args:
+        view(BoardView): Opponent game board as the bot sees it,
+        deadline(float): time.perf_counter() value to stop counting at.
+    Returns:
+        weights(list[int]): Weight of every cell.
+    """
+    weights = [0] * (view.width * view.height)
+    target_mask = view.hits_mask & ~view.sunk_mask
+    blocked_mask = view.misses_mask | view.sunk_halo_mask
+    shots_mask = view.hits_mask | view.misses_mask
+    ships_amounts = {
+        cells: view.fleet_cells.count(cells) for cells in set(view.fleet_cells)
+    }
+
+    for cells, ships_amount in sorted(ships_amounts.items(), reverse=True):
+        placements = iter_placements(view.width, view.height, cells)
+        for placement_numb, placement in enumerate(placements):
+            if (
+                placement_numb % BUDGET_CHECK_PLACEMENTS == 0
+                and time.perf_counter() > deadline
+            ):
+                return weights
+            _, _, ship_mask, halo_mask = placement
+            # Ships do not touch, so a hit next to the ship is its own cell
+            if ship_mask & blocked_mask or halo_mask & ~ship_mask & target_mask:
+                continue
+            covered_hits = (ship_mask & target_mask).bit_count()
+            weight = ships_amount * (1 + TARGET_WEIGHT * covered_hits)
+            for cell_idx in iter_bits(ship_mask & ~shots_mask):
+                weights[cell_idx] += weight
+    return weights
+
+
+async def think(
+    view: BoardView,
+    difficulty: BotDifficulty = BotDifficulty.HARD,
+    budget: float = 0.1,
+    processes: int = 1,
+) -> int:
+    """
+    Choose the cell to attack without blocking the event loop
+
+    Heavy difficulty levels are computed in a process pool of the worker,
+    it is started on the first heavy shot.
+
+    Args:
+        view(BoardView): Opponent game board as the bot sees it,
+        difficulty(BotDifficulty): Bot difficulty level,
+        budget(float): Seconds the bot may think,
+        processes(int): Size of the process pool.
+    Returns:
+        cell_idx(int): Cell bit index, (y - 1) * width + letter index.
+    """
+    if difficulty != BotDifficulty.HARD:
+        return choose_shot(view, difficulty, budget)
+
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(processes)
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor, choose_shot, view, difficulty, budget
+    )
+
+
+def shutdown_executor() -> None:
+    """Stop the bot process pool, not finished shots are cancelled"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _best_cells(weights: list[int], free_mask: int) -> list[int]:
+    best_weight = max(
+        (weights[cell_idx] for cell_idx in iter_bits(free_mask)), default=0
+    )
+    if not best_weight:
+        return []
+    return [
+        cell_idx for cell_idx in iter_bits(free_mask)
+        if weights[cell_idx] == best_weight
+    ]
+
+
+def _target_neighbours(view: BoardView) -> int:
+    neighbours_mask = 0
+    for cell_idx in iter_bits(view.hits_mask & ~view.sunk_mask):
+        y, x = divmod(cell_idx, view.width)
+        if x > 0:
+            neighbours_mask |= 1 << (cell_idx - 1)
+        if x < view.width - 1:
+            neighbours_mask |= 1 << (cell_idx + 1)
+        if y > 0:
+            neighbours_mask |= 1 << (cell_idx - view.width)
+        if y < view.height - 1:
+            neighbours_mask |= 1 << (cell_idx + view.width)
+    return neighbours_mask
+
+
+def _checkerboard_mask(view: BoardView) -> int:
+    step = min(view.fleet_cells, default=1)
+    return sum(
+        1 << (y * view.width + x)
+        for y in range(view.height)
+        for x in range(view.width)
+        if (x + y) % step == 0
+    )
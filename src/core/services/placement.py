@@ -0,0 +1,297 @@
+"""
+Precomputed tables of the legal ship placements.
+
+Cell bit index on a game board is (y - 1) * width + letter index. Every
+placement is described by the ship bitmask and its halo bitmask - ship
+cells with all surrounding cells, which other ships must not touch.
+
+Tables are cached only for small game boards. On large game boards every
+bitmask is thousands of bits long, so placements are computed on demand.
+"""
+import random
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Sequence
+
+Placement = tuple[int, int]
+ShipPlacement = tuple[int, bool, int, int]
+
+RANDOM_PLACEMENT_TRIES = 4
+RANDOM_FLEET_ATTEMPTS = 100
+CACHED_PLACEMENTS_CELLS = 1024
+
+_random = random.Random()
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Iterate indexes of the set bits from the lowest one
+
+    Args:
+        mask(int): Bitmask.
+    """
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+@lru_cache(maxsize=None)
+def placement_table(
+    width: int, height: int, cells: int, vertical: bool
+) -> dict[int, Placement]:
+    """
+    Get every legal placement of the ship on the game board
+
+    Args:
+        width(int): Game board width,
+        height(int): Game board height,
+        cells(int): Ship cells,
+        vertical(bool): Is ship placed vertical.
+    Returns:
+        table(dict): Ship start cell index to ship and halo bitmasks.
+    """
+    columns, rows = (1, cells) if vertical else (cells, 1)
+    return {
+        row * width + column: _placement_masks(
+            width, height, column, row, columns, rows
+        )
+        for row in range(height - rows + 1)
+        for column in range(width - columns + 1)
+    }
+
+
+def placement_masks(
+    width: int,
+    height: int,
+    cells: int,
+    vertical: bool,
+    start_idx: Optional[int],
+) -> Optional[Placement]:
+    """
+    Get ship and halo bitmasks of one placement
+
+    Args:
+        width(int): Game board width,
+        height(int): Game board height,
+        cells(int): Ship cells,
+        vertical(bool): Is ship placed vertical,
+        start_idx(int | None): Ship start cell index.
+    Returns:
+        placement(Placement | None): Ship and halo bitmasks or None if ship
+            is out of game board.
+    """
+    if width * height <= CACHED_PLACEMENTS_CELLS:
+        return placement_table(width, height, cells, vertical).get(
+            start_idx  # type: ignore
+        )
+    if start_idx is None or start_idx < 0:
+        return None
+    row, column = divmod(start_idx, width)
+    columns, rows = (1, cells) if vertical else (cells, 1)
+    if column + columns > width or row + rows > height:
+        return None
+    return _placement_masks(width, height, column, row, columns, rows)
+
+
+@lru_cache(maxsize=None)
+def placement_list(
+    width: int, height: int, cells: int
+) -> tuple[ShipPlacement, ...]:
+    """
+    Get every legal placement of the ship in both orientations
+
+    One cell ships are placed only vertical, as the game does.
+
+    Returns:
+        placements(tuple): Start cell index, is vertical, ship and halo
+            bitmasks of every placement.
+    """
+    return tuple(
+        (start_idx, vertical, ship_mask, halo_mask)
+        for vertical in ((False, True) if cells > 1 else (True,))
+        for start_idx, (ship_mask, halo_mask) in (
+            placement_table(width, height, cells, vertical).items()
+        )
+    )
+
+
+def iter_placements(
+    width: int, height: int, cells: int
+) -> Iterable[ShipPlacement]:
+    """
+    Iterate every legal placement of the ship in both orientations
+
+    Returns the cached placement_list on small game boards.
+
+    Returns:
+        placements(Iterable): Start cell index, is vertical, ship and halo
+            bitmasks of every placement.
+    """
+    if width * height <= CACHED_PLACEMENTS_CELLS:
+        return placement_list(width, height, cells)
+    return _iter_placements(width, height, cells)
+
+
+def legal_placements(
+    width: int, height: int, cells: int, blocked_mask: int
+) -> Iterator[ShipPlacement]:
+    """
+    Iterate placements of the ship not touching already placed ships
+
+    Args:
+        width(int): Game board width,
+        height(int): Game board height,
+        cells(int): Ship cells,
+        blocked_mask(int): Union of the placed ships halo bitmasks.
+    Returns:
+        placements(Iterator): Start cell index, is vertical, ship and halo
+            bitmasks of every legal placement.
+    """
+    for placement in iter_placements(width, height, cells):
+        if not placement[2] & blocked_mask:
+            yield placement
+
+
+def random_fleet(
+    width: int,
+    height: int,
+    fleet_cells: Sequence[int],
+    blocked_mask: int = 0,
+    rand: Optional[random.Random] = None,
+) -> list[ShipPlacement]:
+    """
+    Random legal placements of the fleet ships
+
+    Ships are placed from the largest one and every ship position is drawn
+    uniformly from the positions still legal for it. Only when the smaller
+    ships have no room left the whole fleet is drawn again. Positions are
+    drawn from the cached placement lists on small game boards.
+
+    Args:
+        width(int): Game board width,
+        height(int): Game board height,
+        fleet_cells(Sequence[int]): Cells of every ship to place,
+        blocked_mask(int): Union of the already placed ships halo bitmasks,
+        rand(random.Random): Random numbers generator.
+    Returns:
+        placements(list): Placement of every ship in fleet_cells order.
+    Raises:
+        ValueError: If the fleet does not fit the game board.
+    """
+    rand = rand or _random
+    ships_order = sorted(
+        range(len(fleet_cells)), key=fleet_cells.__getitem__, reverse=True
+    )
+    placements: list[ShipPlacement] = [None] * len(fleet_cells)  # type: ignore
+    is_cached = width * height <= CACHED_PLACEMENTS_CELLS
+
+    for _ in range(RANDOM_FLEET_ATTEMPTS):
+        fleet_blocked_mask = blocked_mask
+        for ship_idx in ships_order:
+            if is_cached:
+                placement = _random_cached_placement(
+                    placement_list(width, height, fleet_cells[ship_idx]),
+                    fleet_blocked_mask,
+                    rand,
+                )
+            else:
+                placement = _random_placement(
+                    width,
+                    height,
+                    fleet_cells[ship_idx],
+                    fleet_blocked_mask,
+                    rand,
+                )
+            if placement is None:
+                break
+            placements[ship_idx] = placement
+            fleet_blocked_mask |= placement[3]
+        else:
+            return placements
+    raise ValueError('Fleet can not be placed on the game board')
+
+
+def _random_cached_placement(
+    placements: tuple[ShipPlacement, ...],
+    blocked_mask: int,
+    rand: random.Random,
+) -> Optional[ShipPlacement]:
+    # A few blind draws are enough while the game board is mostly free,
+    # drawing among the legal placements keeps the choice uniform after.
+    if not placements:
+        return None
+    for _ in range(RANDOM_PLACEMENT_TRIES):
+        placement = rand.choice(placements)
+        if not placement[2] & blocked_mask:
+            return placement
+    legal = [
+        placement for placement in placements
+        if not placement[2] & blocked_mask
+    ]
+    return rand.choice(legal) if legal else None
+
+
+def _random_placement(
+    width: int,
+    height: int,
+    cells: int,
+    blocked_mask: int,
+    rand: random.Random,
+) -> Optional[ShipPlacement]:
+    # Blind draws of the start cell, the masks of large game boards are
+    # computed only for the drawn placements.
+    orientations = (False, True) if cells > 1 else (True,)
+    for _ in range(RANDOM_PLACEMENT_TRIES):
+        vertical = rand.choice(orientations)
+        start_idx = rand.randrange(width * height)
+        placement = placement_masks(width, height, cells, vertical, start_idx)
+        if placement and not placement[0] & blocked_mask:
+            return start_idx, vertical, *placement  # type: ignore
+    legal = [
+        placement[:2]
+        for placement in legal_placements(width, height, cells, blocked_mask)
+    ]
+    if not legal:
+        return None
+    start_idx, vertical = rand.choice(legal)
+    ship_mask, halo_mask = placement_masks(
+        width, height, cells, vertical, start_idx
+    )  # type: ignore
+    return start_idx, vertical, ship_mask, halo_mask
+
+
+def _iter_placements(
+    width: int, height: int, cells: int
+) -> Iterator[ShipPlacement]:
+    for vertical in ((False, True) if cells > 1 else (True,)):
+        columns, rows = (1, cells) if vertical else (cells, 1)
+        for row in range(height - rows + 1):
+            for column in range(width - columns + 1):
+                ship_mask, halo_mask = _placement_masks(
+                    width, height, column, row, columns, rows
+                )
+                yield row * width + column, vertical, ship_mask, halo_mask
+
+
+def _placement_masks(
+    width: int, height: int, column: int, row: int, columns: int, rows: int
+) -> Placement:
+    return (
+        _rectangle_mask(width, column, row, columns, rows),
+        _rectangle_mask(
+            width,
+            max(column - 1, 0),
+            max(row - 1, 0),
+            min(column + columns, width - 1) - max(column - 1, 0) + 1,
+            min(row + rows, height - 1) - max(row - 1, 0) + 1,
+        ),
+    )
+
+
+def _rectangle_mask(
+    width: int, column: int, row: int, columns: int, rows: int
+) -> int:
+    row_mask = ((1 << columns) - 1) << column
+    return sum(
+        row_mask << ((row + row_numb) * width) for row_numb in range(rows)
+    )
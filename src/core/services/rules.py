@@ -0,0 +1,119 @@
+"""
+Game rules: board dimensions, fleet composition and shot rules.
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+from string import ascii_uppercase
+from typing import Optional
+
+from src.domain.game.enums.rulesets import GameRulesetsEnum
+
+Fleet = dict[int, dict[str, int]]
+
+CLASSIC_FLEET: Fleet = {
+    1: {'amount': 4, 'cells': 1},
+    2: {'amount': 3, 'cells': 2},
+    3: {'amount': 2, 'cells': 3},
+    4: {'amount': 1, 'cells': 4},
+}
+
+
+@dataclass(frozen=True, eq=False)
+class Ruleset:
+    """
+    Rules of the game, chosen when a game is created
+
+    Args:
+        width(int): Game board width, up to 65535 columns,
+        height(int): Game board height, up to 65535 rows,
+        fleet(Fleet): Amount of ships and ship cells for every ship type,
+        move_again_on_hit(bool): Is player moves again after a hit.
+    """
+    width: int = 10
+    height: int = 10
+    fleet: Fleet = field(default_factory=lambda: CLASSIC_FLEET)
+    move_again_on_hit: bool = True
+
+    @cached_property
+    def letters(self) -> tuple[str, ...]:
+        """Column labels: A, B, ..., Z, AA, AB, ..."""
+        return tuple(column_label(column) for column in range(self.width))
+
+    @cached_property
+    def columns(self) -> dict[str, int]:
+        return {letter: column for column, letter in enumerate(self.letters)}
+
+    def cell_idx(self, x: str, y: int) -> Optional[int]:
+        """
+        Get bit index of the cell
+
+        Args:
+            x(str): X coordinate,
+            y(int): Y coordinate.
+        Returns:
+            idx(int | None): Bit index or None if cell is out of game board.
+        """
+        column = self.columns.get(x)
+        if column is None or y not in range(1, self.height + 1):
+            return None
+        return (y - 1) * self.width + column
+
+    def cords(self, cell_idx: int) -> str:
+        """
+        Get coordinates of the cell
+
+        Args:
+            cell_idx(int): Bit index of the cell.
+        Returns:
+            cords(str): Column label and row, like A1.
+        """
+        y, column = divmod(cell_idx, self.width)
+        return f'{self.letters[column]}{y + 1}'
+
+
+def column_label(column: int) -> str:
+    """
+    Get letter label of the game board column
+
+    Args:
+        column(int): Column index from 0.
+    """
+    label = ''
+    column += 1
+    while column:
+        column, letter_idx = divmod(column - 1, len(ascii_uppercase))
+        label = ascii_uppercase[letter_idx] + label
+    return label
+
+
+CLASSIC_RULESET = Ruleset()
+
+RULESETS: dict[str, Ruleset] = {
+    GameRulesetsEnum.CLASSIC.value: CLASSIC_RULESET,
+    GameRulesetsEnum.LARGE.value: Ruleset(
+        width=100,
+        height=100,
+        fleet={
+            1: {'amount': 40, 'cells': 1},
+            2: {'amount': 30, 'cells': 2},
+            3: {'amount': 20, 'cells': 3},
+            4: {'amount': 10, 'cells': 4},
+            5: {'amount': 5, 'cells': 5},
+        },
+    ),
+}
+
+
+def get_ruleset(name: str) -> Ruleset:
+    """
+    Get ruleset by the name
+
+    Args:
+        name(str): Ruleset name from GameRulesetsEnum.
+    Raises:
+        ValueError: If ruleset is unknown.
+    """
+    try:
+        return RULESETS[name]
+    except KeyError:
+        raise ValueError(f'Unknown ruleset: {name}')
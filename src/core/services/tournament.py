@@ -0,0 +1,265 @@
+"""
+Headless self-play tournament between the bot difficulty levels.
+
+Games are spread across a process pool and results are aggregated as
+they come, so memory does not grow with the amount of games.
+
+Run it with:
+    python -m src.core.services.tournament hard medium --games 10000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent import futures
+from dataclasses import dataclass, field
+from typing import Iterator, NamedTuple
+
+from src.core.services.board import GAME_BOARD_ENGINES, make_game_board
+from src.core.services.bot import BotDifficulty, board_view, choose_shot
+from src.core.services.rules import RULESETS, get_ruleset
+
+Z_SCORE_95 = 1.96
+GAMES_PER_CHUNK = 16
+CHUNKS_PER_PROCESS = 4
+
+
+class GameSetup(NamedTuple):
+    strategies: tuple[BotDifficulty, BotDifficulty]
+    engine: str
+    ruleset: str
+    budget: float
+
+
+class GameResult(NamedTuple):
+    winner: int
+    winner_shots: int
+    shots: int
+
+
+@dataclass
+class TournamentStats:
+    """
+    Running statistics of the tournament
+
+    Mean and variance of the winner shots are kept by Welford's method.
+    """
+    games: int = 0
+    wins: list[int] = field(default_factory=lambda: [0, 0])
+    shots: int = 0
+    mean_winner_shots: float = 0.0
+    _winner_shots_m2: float = 0.0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.wins[result.winner] += 1
+        self.shots += result.shots
+        delta = result.winner_shots - self.mean_winner_shots
+        self.mean_winner_shots += delta / self.games
+        self._winner_shots_m2 += delta * (
+            result.winner_shots - self.mean_winner_shots
+        )
+
+    @property
+    def winner_shots_interval(self) -> float:
+        """Half width of the 95% confidence interval of the mean shots"""
+        if self.games < 2:
+            return math.inf
+        variance = self._winner_shots_m2 / (self.games - 1)
+        return Z_SCORE_95 * math.sqrt(variance / self.games)
+
+    def win_rate_interval(self, player: int) -> tuple[float, float]:
+        """
+        Wilson score 95% confidence interval of the player win rate
+
+        Args:
+            player(int): Player index, 0 or 1.
+        """
+        if not self.games:
+            return 0.0, 1.0
+        win_rate = self.wins[player] / self.games
+        z2 = Z_SCORE_95 ** 2
+        center = (win_rate + z2 / (2 * self.games)) / (1 + z2 / self.games)
+        half_width = Z_SCORE_95 * math.sqrt(
+            win_rate * (1 - win_rate) / self.games
+            + z2 / (4 * self.games ** 2)
+        ) / (1 + z2 / self.games)
+        return center - half_width, center + half_width
+
+
+def play_game(setup: GameSetup, seed: int) -> GameResult:
+    """
+    Play one game between two strategies
+
+    The first move alternates between players with the game seed, a hit
+    gives one more move if the ruleset allows it.
+
+    Args:
+        setup(GameSetup): Strategies, engine, ruleset and move budget,
+        seed(int): Seed of the fleets placement and the players choices.
+    Returns:
+        result(GameResult): Winner index, winner shots and all shots.
+    """
+    rand = random.Random(seed)
+    ruleset = get_ruleset(setup.ruleset)
+    game_boards = [
+        make_game_board(setup.engine, ruleset) for _ in range(2)
+    ]
+    for game_board in game_boards:
+        game_board.auto_place_ships(rand)
+
+    shots = [0, 0]
+    player = seed % 2
+    while True:
+        game_board = game_boards[1 - player]
+        cell_idx = choose_shot(
+            board_view(game_board),
+            setup.strategies[player],
+            setup.budget,
+            rand,
+        )
+        y, letter_idx = divmod(cell_idx, game_board.width)
+        is_hited = game_board.attack(game_board.GAME_LETTERS[letter_idx], y + 1)
+        shots[player] += 1
+        if game_board.is_game_over:
+            return GameResult(player, shots[player], sum(shots))
+        if not is_hited or not ruleset.move_again_on_hit:
+            player = 1 - player
+
+
+def play_games(setup: GameSetup, seed: int, games: int) -> list[GameResult]:
+    return [
+        play_game(setup, game_seed) for game_seed in range(seed, seed + games)
+    ]
+
+
+def run_tournament(
+    strategies: tuple[BotDifficulty, BotDifficulty],
+    games: int,
+    processes: int,
+    engine: str = 'cells',
+    ruleset: str = 'classic',
+    budget: float = 0.1,
+    seed: int = 0,
+) -> Iterator[TournamentStats]:
+    """
+    Play games in a process pool and yield stats after every game
+
+    Args:
+        strategies(tuple): Difficulty levels of both players,
+        games(int): Amount of games,
+        processes(int): Amount of worker processes,
+        engine(str): Engine name from GAME_BOARD_ENGINES,
+        ruleset(str): Ruleset name from RULESETS,
+        budget(float): Seconds a player may think on every move,
+        seed(int): Seed of the first game, next games get next seeds.
+    """
+    stats = TournamentStats()
+    setup = GameSetup(strategies, engine, ruleset, budget)
+    pending: set[futures.Future] = set()
+
+    with futures.ProcessPoolExecutor(processes) as executor:
+        # Only a few chunks are in flight, so results are not piled up
+        for chunk_seed in range(seed, seed + games, GAMES_PER_CHUNK):
+            if len(pending) >= processes * CHUNKS_PER_PROCESS:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                yield from _add_results(stats, done)
+            pending.add(executor.submit(
+                play_games,
+                setup,
+                chunk_seed,
+                min(GAMES_PER_CHUNK, seed + games - chunk_seed),
+            ))
+        while pending:
+            done, pending = futures.wait(
+                pending, return_when=futures.FIRST_COMPLETED
+            )
+            yield from _add_results(stats, done)
+
+
+def _add_results(
+    stats: TournamentStats, done: set[futures.Future]
+) -> Iterator[TournamentStats]:
+    for future in done:
+        for result in future.result():
+            stats.add(result)
+            yield stats
+
+
+def format_stats(
+    stats: TournamentStats,
+    strategies: tuple[BotDifficulty, BotDifficulty],
+    seconds: float,
+) -> str:
+    win_rates = ', '.join(
+        '{0} {1:.1%} [{2:.1%}, {3:.1%}]'.format(
+            strategy.value,
+            stats.wins[player] / stats.games,
+            *stats.win_rate_interval(player),
+        )
+        for player, strategy in enumerate(strategies)
+    )
+    return (
+        f'games: {stats.games}, '
+        f'games/sec: {stats.games / seconds:.1f}, '
+        f'shots to win: {stats.mean_winner_shots:.2f} '
+        f'± {stats.winner_shots_interval:.2f}, '
+        f'win rates: {win_rates}'
+    )
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        'strategies',
+        nargs=2,
+        type=BotDifficulty,
+        choices=list(BotDifficulty),
+        metavar='{easy,medium,hard}',
+    )
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--engine', choices=list(GAME_BOARD_ENGINES), default='cells'
+    )
+    parser.add_argument(
+        '--ruleset', choices=list(RULESETS), default='classic'
+    )
+    parser.add_argument('--budget', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--report-every',
+        type=int,
+        default=1000,
+        help='Print running stats after that many games',
+    )
+    args = parser.parse_args(argv)
+    strategies = tuple(args.strategies)
+
+    started = time.perf_counter()
+    stats = TournamentStats()
+    for stats in run_tournament(
+        strategies,  # type: ignore
+        args.games,
+        args.processes,
+        args.engine,
+        args.ruleset,
+        args.budget,
+        args.seed,
+    ):
+        if stats.games % args.report_every == 0:
+            print(format_stats(
+                stats, strategies, time.perf_counter() - started  # type: ignore
+            ), flush=True)
+    if stats.games % args.report_every:
+        print(format_stats(
+            stats, strategies, time.perf_counter() - started  # type: ignore
+        ))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -10,3 +10,4 @@ fastapi_users = (
 )
 
 current_active_user = fastapi_users.current_user(active=True)
+current_superuser = fastapi_users.current_user(active=True, superuser=True)
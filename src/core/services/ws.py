@@ -1,14 +1,19 @@
 """
 Main services for initialize WebSocket connection.
 """
+import asyncio
 from typing import Optional
 
 from beanie import PydanticObjectId
 from bson.errors import InvalidId
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import WebSocket, WebSocketDisconnect, status
 
+from src.api.ws.managers import matchmaking
+from src.api.ws.managers.matchmaking import matchmaking_queue
 from src.api.ws.managers.sea_battle import sea_battle_ws_manager
-from src.core.services.board import GameBoard
+from src.core.config import settings
+from src.core.services.board import GameBoard, make_game_board
+from src.core.services.rules import get_ruleset
 from src.core.services.ws_game import (
     close_connection_update_game,
     game,
@@ -16,6 +21,9 @@ from src.core.services.ws_game import (
     wait_all_users,
 )
 from src.core.utils import game_utils
+from src.domain.game.dto import GameDTO
+from src.domain.game.enums.rulesets import GameRulesetsEnum
+from src.domain.game.enums.statuses import GameStatusesEnum
 from src.domain.game.exceptions.game import GameNotExists
 from src.domain.game.usecases.game import GameServices
 from src.infrastructure.db.models.game import Game
@@ -26,6 +34,7 @@ async def sea_battle_ws(
     websocket: WebSocket,
     user: User,
     game_services: GameServices,
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC,
 ) -> None:
     """
     Main logic with sea battle websockets
@@ -33,40 +42,90 @@ async def sea_battle_ws(
     Args:
         websocket(WebSocket): WebSocket connection object,
         user(User): User model instance,
-        game_services(GameServices): Services usecases for model Game.
+        game_services(GameServices): Services usecases for model Game,
+        ruleset(GameRulesetsEnum): Ruleset of the matched game.
     """
     game_id: Optional[str] = None
     try:
         active_game = await game_services.get_user_active_game(user_id=user.id)
-        cached_active_game = await sea_battle_ws_manager.get_saved_game(
-            user.username
-        )
         game_id = await sea_battle_connection(
-            websocket, user, game_services, active_game, cached_active_game
+            websocket, user, game_services, active_game, ruleset
+        )
+        # Messages are sent from the outbound queue of the room connection
+        websocket = sea_battle_ws_manager.get_connection(  # type: ignore
+            game_id, user.username
         )
 
         game_board: GameBoard = await sea_battle_ws_manager.get_game_board(
             game_id, user.username
         )
         if not game_board.is_all_ships_placed_and_game_initialized:
-            await init_game_board(websocket, game_board, user.username)
+            await init_game_board(
+                websocket, game_id, game_board, user.username
+            )
 
-        if await wait_all_users(websocket, game_id, game_services):
+        if await wait_all_users(
+            websocket, game_id, user.username, game_services
+        ):
             first_move: str = game_utils.WS_GAME_START_MESSAGE_SUCCES.format(
                 username=await (
                     sea_battle_ws_manager.get_first_move_username(game_id)
                 )
             )
             await websocket.send_text(first_move)
-            await game(game_id, user.username)
-            await close_connection_update_game(game_id, game_services)
+            await game(game_id, user.username, game_services)
     except WebSocketDisconnect:
+        if game_id:
+            await sea_battle_ws_manager.flush_saved_games(game_id)
         if (
             game_id
-            and sea_battle_ws_manager.rooms.get(game_id)
+            and game_id in sea_battle_ws_manager.rooms
             and not await sea_battle_ws_manager.get_users_from_room(game_id)
         ):
             await close_connection_update_game(game_id, game_services, True)
+        if game_id:
+            await sea_battle_ws_manager.remove_connection(
+                game_id, user.username, websocket
+            )
+
+
+async def sea_battle_spectate_ws(
+    websocket: WebSocket,
+    room_id: str,
+    game_services: GameServices,
+) -> None:
+    """
+    Read-only connection to the room with its state and move feed
+
+    Messages of the spectator are not passed to the game, the connection
+    is closed once the game is over.
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        room_id(str): Room MongoDB id,
+        game_services(GameServices): Services usecases for model Game.
+    """
+    await websocket.accept()
+    try:
+        lobby = await game_services.get_game_by_id(PydanticObjectId(room_id))
+    except (InvalidId, GameNotExists):
+        await websocket.send_text(f"Not found game with id: {room_id}")
+        await websocket.close()
+        return
+    connection = await sea_battle_ws_manager.add_spectator(
+        room_id, websocket, get_ruleset(lobby.ruleset)
+    )
+    if connection is None:
+        await websocket.send_text(game_utils.WS_GAME_NOT_START_ERROR)
+        await websocket.close()
+        return
+    try:
+        while True:
+            await connection.receive_text()
+    except WebSocketDisconnect:
+        ...
+    finally:
+        await sea_battle_ws_manager.remove_spectator(room_id, connection)
 
 
 async def sea_battle_connection(
@@ -74,16 +133,16 @@ async def sea_battle_connection(
     user: User,
     game_services: GameServices,
     active_game: Optional[Game],
-    cached_active_game: Optional[GameBoard]
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC,
 ) -> str:
     await websocket.accept()
     if active_game:
         game_id = await sea_battle_exist_connection(
-            websocket, user, active_game, cached_active_game
+            websocket, user, active_game
         )
     else:
         game_id = await sea_battle_create_connection(
-            websocket, user, game_services
+            websocket, user, game_services, ruleset
         )
     return game_id
 
@@ -92,17 +151,23 @@ async def sea_battle_exist_connection(
     websocket: WebSocket,
     user: User,
     active_game: Game,
-    cached_active_game: Optional[GameBoard] = None
 ) -> str:
     """
     Connect to exist cached lobby
 
+    Both users game boards are loaded from the room in one request.
+
     Args:
         websocket(WebSocket): WebSocket connection object,
         user(User): User model instance
     """
-    if cached_active_game is None:
-        cached_active_game = GameBoard()
+    ruleset = get_ruleset(active_game.ruleset)
+    game_boards = await sea_battle_ws_manager.get_room_game_boards(
+        str(active_game.id), ruleset
+    )
+    cached_active_game = game_boards.get(user.username) or make_game_board(
+        settings.GAME_BOARD_ENGINE, ruleset
+    )
 
     await sea_battle_ws_manager.add_user_to_room(
         str(active_game.id),
@@ -118,41 +183,198 @@ async def sea_battle_create_connection(
     websocket: WebSocket,
     user: User,
     game_services: GameServices,
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC,
 ) -> str:
-    while True:
-        free_rooms = ', '.join(map(str, await get_free_rooms(game_services)))
-        await websocket.send_text(f'Select room id from the list: {free_rooms}')
-
-        ws_message = await websocket.receive_text()
-        if 'reload' in ws_message.lower():
-            active_game = (
-                await game_services.get_user_active_game(user_id=user.id)
+    """
+    Find a game for the user without an active game
+
+    The user waits in the matchmaking queue shared by all workers, the
+    rating band is doubled every SECONDS_TO_WIDEN_RATING_BAND. The user
+    who finds an opponent creates the game for both users. A free game
+    is joined by sending its id while the user waits and is not paired
+    yet. The paired user is queued again if the game is not created in
+    MATCHES_TTL_SECONDS.
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        user(User): User model instance,
+        game_services(GameServices): Services usecases for model Game,
+        ruleset(GameRulesetsEnum): Ruleset of the matched game.
+    Returns:
+        room_id(str): Id of the connected game.
+    """
+    rating_band = settings.MATCHMAKING_RATING_BAND
+    await websocket.send_text(game_utils.WS_MATCHMAKING_INFO)
+    matches = await matchmaking_queue.subscribe(user.username)
+    receive: Optional[asyncio.Future] = None
+    # Time the ticket of the user is found taken by an opponent, who has
+    # not pushed the game yet
+    paired_at: Optional[float] = None
+    loop = asyncio.get_running_loop()
+    try:
+        other_username = await matchmaking_queue.match(
+            ruleset.value, user.username, user.rating, rating_band
+        )
+        while not other_username:
+            receive = receive or asyncio.ensure_future(
+                websocket.receive_text()
             )
-            if active_game:
-                return await sea_battle_exist_connection(
-                    websocket, user, active_game
+            match = asyncio.ensure_future(matches.get())
+            await asyncio.wait(
+                {receive, match},
+                timeout=game_utils.SECONDS_TO_WIDEN_RATING_BAND,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            match.cancel()
+            # Notification may be missed before the channel is subscribed
+            if room_id := await matchmaking_queue.pop_match(user.username):
+                return await connect_matched_game(
+                    websocket, user, room_id, game_services
+                )
+            if receive.done():
+                ws_message, receive = receive.result(), None
+                # Selected game is joined only if the ticket is not taken
+                if other_username == '' and await matchmaking_queue.leave(
+                    ruleset.value, user.username
+                ):
+                    if room_id := await select_game(
+                        websocket, user, ws_message, game_services
+                    ):
+                        return room_id
+                    other_username = await matchmaking_queue.match(
+                        ruleset.value, user.username, user.rating, rating_band
+                    )
+                    continue
+                # The ticket is taken, the message is dropped and the user
+                # is told about the opponent once the game is connected
+                other_username = None
+            elif other_username == '':
+                rating_band *= 2
+                other_username = await matchmaking_queue.match(
+                    ruleset.value,
+                    user.username,
+                    user.rating,
+                    rating_band,
+                    is_retry=True,
+                )
+            if other_username is None and paired_at is None:
+                paired_at = loop.time()
+            if (
+                paired_at is not None
+                and loop.time() - paired_at >= matchmaking.MATCHES_TTL_SECONDS
+            ):
+                # The opponent has not created the game, the user is
+                # queued again
+                paired_at = None
+                other_username = await matchmaking_queue.match(
+                    ruleset.value, user.username, user.rating, rating_band
                 )
-            continue
+    except WebSocketDisconnect:
+        await matchmaking_queue.leave(ruleset.value, user.username)
+        raise
+    finally:
+        if receive is not None:
+            receive.cancel()
+        await matchmaking_queue.unsubscribe(user.username, matches)
+    return await create_matched_game(
+        websocket, user, other_username, game_services, ruleset
+    )
 
-        try:
-            room_id = PydanticObjectId(ws_message)
-        except InvalidId:
-            await websocket.send_text('Wrong room id')
-            continue
 
-        is_connected, _ = await add_websocket_to_room(
-            str(room_id), user.username, websocket, game_services
+async def create_matched_game(
+    websocket: WebSocket,
+    user: User,
+    other_username: str,
+    game_services: GameServices,
+    ruleset: GameRulesetsEnum,
+) -> str:
+    """
+    Create the game of the paired users and connect the user to it
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        user(User): User model instance,
+        other_username(str): Username of the paired waiting user,
+        game_services(GameServices): Services usecases for model Game,
+        ruleset(GameRulesetsEnum): Ruleset of the game.
+    Returns:
+        room_id(str): Id of the connected game.
+    """
+    new_game = GameDTO(status=GameStatusesEnum.IN_GAME, ruleset=ruleset)
+    new_game.player_1 = await User.get_by_username(  # type: ignore
+        other_username
+    )
+    new_game.player_2 = user  # type: ignore
+    game = await game_services.create_game(new_game)
+    await matchmaking_queue.notify(other_username, str(game.id))
+    return await connect_matched_game(
+        websocket, user, str(game.id), game_services
+    )
+
+
+async def connect_matched_game(
+    websocket: WebSocket,
+    user: User,
+    room_id: str,
+    game_services: GameServices,
+) -> str:
+    """
+    Connect the paired user to the created game
+
+    Raises:
+        WebSocketDisconnect: If the user is not connected to the game.
+    """
+    await websocket.send_text(game_utils.WS_MATCHMAKING_FOUND_INFO)
+    is_connected, _ = await add_websocket_to_room(
+        room_id, user.username, websocket, game_services
+    )
+    if not is_connected:
+        raise WebSocketDisconnect(status.WS_1011_INTERNAL_ERROR)
+    await websocket.send_text("You're succesfully connected.")
+    return room_id
+
+
+async def select_game(
+    websocket: WebSocket,
+    user: User,
+    ws_message: str,
+    game_services: GameServices,
+) -> Optional[str]:
+    """
+    Connect to the free game selected by id or restore the active game
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        user(User): User model instance,
+        ws_message(str): Game id or 'reload',
+        game_services(GameServices): Services usecases for model Game.
+    Returns:
+        room_id(str | None): Id of the connected game.
+    """
+    if 'reload' in ws_message.lower():
+        active_game = (
+            await game_services.get_user_active_game(user_id=user.id)
         )
-        if is_connected:
-            await websocket.send_text("You're succesfully connected.")
-            break
-    await game_services.update_game(room_id, player_2=user)
-    return str(room_id)
+        if active_game:
+            return await sea_battle_exist_connection(
+                websocket, user, active_game
+            )
+        return None
 
+    try:
+        room_id = PydanticObjectId(ws_message)
+    except InvalidId:
+        await websocket.send_text('Wrong room id')
+        return None
 
-async def get_free_rooms(game_services: GameServices) -> list[PydanticObjectId]:
-    free_games: list[Game] = await game_services.get_free_games()
-    return [game.id for game in free_games]
+    is_connected, _ = await add_websocket_to_room(
+        str(room_id), user.username, websocket, game_services
+    )
+    if not is_connected:
+        return None
+    await websocket.send_text("You're succesfully connected.")
+    await game_services.update_game(room_id, player_2=user)
+    return str(room_id)
 
 
 async def add_websocket_to_room(
@@ -171,12 +393,15 @@ async def add_websocket_to_room(
         game_serivces(GameServices): Services usecases for model Game
     """
     is_connected: bool = False
-    game_board: GameBoard = GameBoard()
+    game_board: GameBoard = make_game_board(settings.GAME_BOARD_ENGINE)
     try:
-        await game_services.get_game_by_id(PydanticObjectId(room_id))
+        lobby = await game_services.get_game_by_id(PydanticObjectId(room_id))
     except GameNotExists:
         await websocket.send_text(f"Not found game with id: {room_id}")
     else:
+        game_board = make_game_board(
+            settings.GAME_BOARD_ENGINE, get_ruleset(lobby.ruleset)
+        )
         is_connected = await sea_battle_ws_manager.add_user_to_room(
             room_id, username, websocket, game_board=game_board
         )
@@ -0,0 +1,88 @@
+"""
+Computer opponent as a room participant.
+"""
+import asyncio
+
+from fastapi import WebSocketDisconnect
+
+from src.api.ws.managers.sea_battle import sea_battle_ws_manager
+from src.core.services.bot import BotDifficulty, board_view, think
+
+BOT_USERNAME = 'bot#{room_id}'
+
+
+class BotConnection:
+    """
+    Connection of the computer opponent
+
+    It replaces WebSocket in the room, so the bot plays the same game loop
+    as users: every received text is the bot shot cords.
+    """
+
+    def __init__(
+        self,
+        room_id: str,
+        username: str,
+        difficulty: BotDifficulty,
+        budget: float,
+        processes: int,
+    ) -> None:
+        self.room_id = room_id
+        self.username = username
+        self.difficulty = difficulty
+        self.budget = budget
+        self.processes = processes
+        self._messages = asyncio.Event()
+        self._closed = False
+
+    async def send_text(self, data: str) -> None:
+        # Any message may be the move handoff, so the bot checks its turn
+        self._messages.set()
+
+    async def receive_text(self) -> str:
+        """
+        Wait for the bot move and choose cords to attack
+
+        Raises:
+            WebSocketDisconnect: If the room is removed.
+        """
+        while not self._closed:
+            self._messages.clear()
+            if not await sea_battle_ws_manager.is_user_in_room(
+                self.room_id, self.username
+            ):
+                break
+            if (
+                await sea_battle_ws_manager.is_user_turn(
+                    self.room_id, self.username
+                )
+                and not await sea_battle_ws_manager.is_game_over(self.room_id)
+            ):
+                return await self._choose_cords()
+            await self._messages.wait()
+        raise WebSocketDisconnect()
+
+    async def close(self, code: int = 1000) -> None:
+        self._closed = True
+        self._messages.set()
+
+    async def _choose_cords(self) -> str:
+        other_username = await sea_battle_ws_manager.get_other_username(
+            self.room_id, self.username
+        )
+        own_game_board = await sea_battle_ws_manager.get_game_board(
+            self.room_id, self.username
+        )
+        game_board = await sea_battle_ws_manager.get_move_board(
+            self.room_id,
+            other_username,  # type: ignore
+            own_game_board.ruleset,  # type: ignore
+        )
+        cell_idx = await think(
+            board_view(game_board),  # type: ignore
+            self.difficulty,
+            self.budget,
+            self.processes,
+        )
+        y, letter_idx = divmod(cell_idx, game_board.width)  # type: ignore
+        return f'{game_board.GAME_LETTERS[letter_idx]}{y + 1}'  # type: ignore
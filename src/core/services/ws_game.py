@@ -1,99 +1,446 @@
 import asyncio
-from typing import Any, Callable, Optional
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, NamedTuple, Optional
 
 from beanie import PydanticObjectId
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
 
-from src.api.ws.managers.sea_battle import sea_battle_ws_manager
-from src.core.services.board import GameBoard, ShipsOver
+from src.api.ws.managers.sea_battle import (
+    MoveResult,
+    MoveStatuses,
+    sea_battle_ws_manager,
+)
+from src.core.config import settings
+from src.core.services import board_snapshot, ws_protocol
+from src.core.services.board import GameBoard, ShipsOver, make_game_board
+from src.core.services.bot import BotDifficulty
+from src.core.services.rules import Ruleset
+from src.core.services.ws_bot import BOT_USERNAME, BotConnection
 from src.core.utils import game_utils
+from src.core.utils.metrics import operation_latency
+from src.core.utils.tracing import span, start_trace
 from src.domain.game.enums.statuses import GameStatusesEnum
 from src.domain.game.usecases.game import GameServices
 from src.infrastructure.db.models.game import GameEnds
 from src.infrastructure.db.models.user import User
 
+logger = logging.getLogger(__name__)
 
-async def game(room_id: str, username: str) -> None:
-    ws_game_user_1 = sea_battle_ws_manager.rooms[room_id][username]
-    websocket_user_1: WebSocket = ws_game_user_1['connection']
+CORDS_PATTERN = re.compile(r'([A-Za-z]+)(\d+)')
 
-    ws_game_user_2 = await sea_battle_ws_manager.get_other_user(
-        room_id, username
-    )
-    websocket_user_2: WebSocket = ws_game_user_2['connection']
-    game_board_user_2: GameBoard = ws_game_user_2['game_board']  # type: ignore
+# Timer messages of the wait supersede not sent previous ones
+SECONDS_PASSED_COALESCE_KEY = 'seconds_passed'
 
-    while not await _is_game_over(room_id):
-        ws_text = await websocket_user_1.receive_text()
+_bot_tasks: set[asyncio.Task] = set()
+_room_actors: dict[str, 'RoomActor'] = {}
+# Rooms resolved now, the game loop and the reaper may end a game together
+_closing_rooms: set[str] = set()
 
-        if ws_game_user_1['is_turn']:
-            while True:
-                cords = _validate_cords(ws_text)
-                if not cords:
-                    await websocket_user_1.send_text(
-                        game_utils.VALID_COORDINATES_ERROR
-                    )
-                else:
-                    is_hited = game_board_user_2.attack(*cords)
-                    await sea_battle_ws_manager.set_saved_game(
-                        game_board_user_2,
-                        ws_game_user_2['username']  # type: ignore
-                    )
-                    if not is_hited:
-                        ws_game_user_1['is_turn'] = False
-                        ws_game_user_2['is_turn'] = True
-                        break
-                    await websocket_user_1.send_text(
-                        game_utils.WS_GAME_HIT_SHIP_USER_1_INFO
-                    )
-                    await websocket_user_2.send_text(
-                        game_utils
-                        .WS_GAME_HITTED_SHIP_USER_2_INFO.format(cords=cords)
-                    )
-                if await _is_game_over(room_id):
+
+class RoomEvent(NamedTuple):
+    username: str
+    ws_text: str
+
+
+@dataclass(slots=True)
+class RoomState:
+    room_id: str
+    ruleset: Ruleset
+    usernames: tuple[str, ...]
+    # Users of the worker forwarding messages to the room actor
+    players: set[str] = field(default_factory=set)
+    is_game_over: bool = False
+
+    def get_other_username(self, username: str) -> Optional[str]:
+        for other_username in self.usernames:
+            if other_username != username:
+                return other_username
+        return None
+
+
+class RoomActor:
+    """
+    Single owner of the room game on the worker
+
+    Connection handlers of the room users only forward received messages
+    to the inbox, the actor applies them one by one, sends results and
+    notifications and resolves the game once it is over. Moves are
+    applied atomically in Redis, so the other user may be connected to
+    any worker with its own room actor.
+
+    Args:
+        state(RoomState): Room state owned by the actor,
+        game_services(GameServices): Services usecases for model Game.
+    """
+
+    def __init__(self, state: RoomState, game_services: GameServices) -> None:
+        self.state = state
+        self.game_services = game_services
+        self.inbox: asyncio.Queue[Optional[RoomEvent]] = asyncio.Queue()
+        self.finished = asyncio.Event()
+        self.task = asyncio.create_task(self.run())
+
+    def join(self, username: str) -> None:
+        self.state.players.add(username)
+
+    def leave(self, username: str) -> None:
+        self.state.players.discard(username)
+        if not self.state.players:
+            self.inbox.put_nowait(None)
+
+    def forward(self, username: str, ws_text: str) -> None:
+        self.inbox.put_nowait(RoomEvent(username, ws_text))
+
+    async def run(self) -> None:
+        room_id = self.state.room_id
+        try:
+            # Restored game may be over already
+            if await sea_battle_ws_manager.is_game_over(room_id):
+                await self._finish()
+            while not self.finished.is_set():
+                event = await self.inbox.get()
+                if event is None:
+                    if self.state.players:
+                        continue
                     break
-                ws_text = await websocket_user_1.receive_text()
-        else:
-            await websocket_user_1.send_text(
-                game_utils.WS_GAME_NOT_YOUR_MOVE_ERROR
+                with start_trace(
+                    'ws.move', room_id=room_id, username=event.username
+                ):
+                    move = await self._handle_move(*event)
+                if move and move.is_game_over:
+                    await self._finish()
+        except Exception:
+            logger.exception(f'Game of room {room_id} is stopped')
+        finally:
+            self.finished.set()
+            if _room_actors.get(room_id) is self:
+                del _room_actors[room_id]
+
+    async def _handle_move(
+        self, username: str, ws_text: str
+    ) -> Optional[MoveResult]:
+        """
+        Apply a move message of the user
+
+        A structured move message gets a structured result, a text move
+        gets the text messages.
+
+        Args:
+            username(str): Username of the moving user,
+            ws_text(str): Received message.
+        Returns:
+            move(MoveResult): Applied move, None if the message is not
+                a valid move.
+        """
+        room_id, ruleset = self.state.room_id, self.state.ruleset
+        message: Optional[ws_protocol.MoveMessage] = None
+        if ws_protocol.is_structured_message(ws_text):
+            with span('parse_message'):
+                parsed = ws_protocol.parse_client_message(ws_text)
+            if not isinstance(parsed, ws_protocol.MoveMessage):
+                await self._send(username, _unexpected_message(parsed))
+                return None
+            message, ws_text = parsed, parsed.cords
+
+        with span('validate_cords'):
+            cords = _validate_cords(ws_text, ruleset)
+        if not cords:
+            is_user_turn = await sea_battle_ws_manager.is_user_turn(
+                room_id, username
+            )
+            if message:
+                await self._send(username, ws_protocol.ErrorMessage(
+                    code=(
+                        ws_protocol.ProtocolErrorCodes.INVALID_CORDS
+                        if is_user_turn else
+                        ws_protocol.ProtocolErrorCodes.NOT_YOUR_MOVE
+                    ),
+                    message=(
+                        game_utils.VALID_COORDINATES_ERROR
+                        if is_user_turn else
+                        game_utils.WS_GAME_NOT_YOUR_MOVE_ERROR
+                    ),
+                ))
+            elif is_user_turn:
+                await self._send(username, game_utils.VALID_COORDINATES_ERROR)
+            else:
+                await self._send(
+                    username, game_utils.WS_GAME_NOT_YOUR_MOVE_ERROR
+                )
+            return None
+
+        other_username: str = self.state.get_other_username(
+            username
+        )  # type: ignore
+        cell_idx: int = ruleset.cell_idx(*cords)  # type: ignore
+        move = await sea_battle_ws_manager.apply_move(
+            room_id,
+            username,
+            other_username,
+            cell_idx,
+            ruleset.move_again_on_hit,
+        )
+        if message:
+            await self._send(username, ws_protocol.MoveResultMessage(
+                cords=message.cords,
+                status=move.status,
+                is_drowned=move.is_drowned,
+                is_game_over=move.is_game_over,
+                is_turn_passed=move.is_turn_passed,
+            ))
+        elif move.status == MoveStatuses.NOT_YOUR_MOVE:
+            await self._send(username, game_utils.WS_GAME_NOT_YOUR_MOVE_ERROR)
+        elif move.status == MoveStatuses.REPEATED:
+            await self._send(username, game_utils.WS_GAME_REPEATED_MOVE_ERROR)
+        elif move.status == MoveStatuses.HIT:
+            await self._send(username, game_utils.WS_GAME_HIT_SHIP_USER_1_INFO)
+        if move.status == MoveStatuses.HIT:
+            await self._send(
+                other_username,
+                game_utils.WS_GAME_HITTED_SHIP_USER_2_INFO.format(cords=cords),
+            )
+        if move.is_turn_passed:
+            await self._send(other_username, game_utils.WS_USER_MOVE_INFO)
+        if move.spectators and move.status in (
+            MoveStatuses.HIT, MoveStatuses.MISS
+        ):
+            await sea_battle_ws_manager.send_to_spectators(
+                room_id,
+                ws_protocol.SpectatorMoveMessage(
+                    username=username,
+                    target_username=other_username,
+                    cords=ruleset.cords(cell_idx),
+                    status=move.status,
+                    is_drowned=move.is_drowned,
+                    is_game_over=move.is_game_over,
+                ).model_dump_json(),
+            )
+        return move
+
+    async def _finish(self) -> None:
+        """Notify room users and resolve the game once"""
+        self.state.is_game_over = True
+        # Handlers stop forwarding before their connections are closed
+        self.finished.set()
+        for username in self.state.usernames:
+            await self._send(username, game_utils.WS_GAME_OVER_INFO)
+        await close_connection_update_game(
+            self.state.room_id, self.game_services
+        )
+
+    async def _send(self, username: str, message: str | BaseModel) -> None:
+        if isinstance(message, BaseModel):
+            message = message.model_dump_json()
+        await sea_battle_ws_manager.send_to_user(
+            self.state.room_id, username, message
+        )
+
+
+async def get_room_actor(
+    room_id: str, ruleset: Ruleset, game_services: GameServices
+) -> RoomActor:
+    """
+    Get the room actor of the worker, it is started for the first user
+
+    Args:
+        room_id(str): Room MongoDB id,
+        ruleset(Ruleset): Ruleset the room is played with,
+        game_services(GameServices): Services usecases for model Game.
+    """
+    actor = _room_actors.get(room_id)
+    if actor is None or actor.finished.is_set():
+        usernames = await sea_battle_ws_manager.get_users_from_room(room_id)
+        # Other user of the worker may start the actor while waiting
+        actor = _room_actors.get(room_id)
+        if actor is None or actor.finished.is_set():
+            actor = RoomActor(
+                RoomState(room_id, ruleset, tuple(usernames)), game_services
             )
-    await websocket_user_1.send_text(game_utils.WS_GAME_OVER_INFO)
+            _room_actors[room_id] = actor
+    return actor
 
 
-async def _is_game_over(room_id: str) -> bool:
-    return await sea_battle_ws_manager.is_game_over(room_id)
+async def game(
+    room_id: str, username: str, game_services: GameServices
+) -> None:
+    """
+    Forward messages of the user connected to the worker to the room actor
+
+    Returns when the game is over and resolved by the actor, so the game
+    over messages are sent before the connection handler ends.
+
+    Args:
+        room_id(str): Room MongoDB id,
+        username(str): Username,
+        game_services(GameServices): Services usecases for model Game.
+    Raises:
+        WebSocketDisconnect: If the user is disconnected before the end.
+    """
+    connection = sea_battle_ws_manager.get_connection(room_id, username)
+    game_board = await sea_battle_ws_manager.get_game_board(room_id, username)
+    actor = await get_room_actor(
+        room_id, game_board.ruleset, game_services  # type: ignore
+    )
+    actor.join(username)
+    try:
+        while not actor.finished.is_set():
+            actor.forward(
+                username, await connection.receive_text()  # type: ignore
+            )
+    except WebSocketDisconnect:
+        if not actor.finished.is_set():
+            raise
+    finally:
+        actor.leave(username)
+    await asyncio.shield(actor.task)
 
 
 async def wait_all_users(
-    websocket: WebSocket, room_id: str, game_services: GameServices
+    websocket: WebSocket,
+    room_id: str,
+    username: str,
+    game_services: GameServices,
 ) -> bool:
+    """
+    Wait until all room users complete their fleets
+
+    The wait is woken up by the readiness event of the room, timer messages
+    and the computer opponent check are sent every few seconds.
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        room_id(str): Room MongoDB id,
+        username(str): Username of the ready user,
+        game_services(GameServices): Services usecases for model Game.
+    Returns:
+        is_started(bool): False if the game is not started in time.
+    """
     await websocket.send_text(game_utils.WS_GAME_WAIT_FOR_OTHER_USER_INFO)
+    await sea_battle_ws_manager.set_user_initialized(room_id, username)
     seconds_passed: int = game_utils.SECONDS_TO_CONNECT_AND_INITIALIZE_SHIPS
 
-    while seconds_passed >= 0:
-        if await sea_battle_ws_manager.all_users_initialized(room_id):
+    while seconds_passed > 0:
+        if await _is_nobody_connected(
+            room_id, seconds_passed
+        ) and await add_bot_to_room(room_id, game_services):
+            await websocket.send_text(game_utils.WS_GAME_BOT_CONNECTED_INFO)
             return True
-        await asyncio.sleep(1)
-        if (seconds_passed % 5) == 0:
-            await websocket.send_text(
-                game_utils
-                .WS_GAME_INITIALIZE_SECONDS_PASSED_INFO
-                .format(seconds=seconds_passed)
-            )
-        seconds_passed -= 1
+        wait_seconds = min(
+            game_utils.SECONDS_BETWEEN_WAIT_INFO, seconds_passed
+        )
+        if await sea_battle_ws_manager.wait_users_initialized(
+            room_id, wait_seconds
+        ):
+            return True
+        seconds_passed -= wait_seconds
+        await sea_battle_ws_manager.send_to_user(
+            room_id,
+            username,
+            game_utils
+            .WS_GAME_INITIALIZE_SECONDS_PASSED_INFO
+            .format(seconds=seconds_passed),
+            SECONDS_PASSED_COALESCE_KEY,
+        )
     await websocket.send_text(game_utils.WS_GAME_NOT_START_ERROR)
     usernames = await sea_battle_ws_manager.get_users_from_room(room_id)
-    await sea_battle_ws_manager.delete_saved_games(*usernames)
+    await sea_battle_ws_manager.delete_saved_games(room_id, *usernames)
     await close_connection_update_game(room_id, game_services, True)
     return False
 
 
+async def _is_nobody_connected(room_id: str, seconds_passed: int) -> bool:
+    seconds_waited = (
+        game_utils.SECONDS_TO_CONNECT_AND_INITIALIZE_SHIPS - seconds_passed
+    )
+    usernames = await sea_battle_ws_manager.get_users_from_room(room_id)
+    return (
+        seconds_waited >= game_utils.SECONDS_TO_WAIT_FOR_OTHER_USER
+        and len(usernames) == 1
+    )
+
+
+async def add_bot_to_room(room_id: str, game_services: GameServices) -> bool:
+    """
+    Take the free seat in the room by the computer opponent
+
+    The seat may be taken by a user at the same time, then the bot is not
+    started and the user waits for the other user as usual.
+
+    Args:
+        room_id(str): Room MongoDB id,
+        game_services(GameServices): Services usecases for model Game.
+    Returns:
+        is_added(bool): False if the room is full already.
+    """
+    username = BOT_USERNAME.format(room_id=room_id)
+    usernames = await sea_battle_ws_manager.get_users_from_room(room_id)
+    user_game_board = await sea_battle_ws_manager.get_game_board(
+        room_id, usernames[0]
+    )
+    game_board = make_game_board(
+        settings.GAME_BOARD_ENGINE, user_game_board.ruleset  # type: ignore
+    )
+    game_board.auto_place_ships()
+    bot_connection = BotConnection(
+        room_id,
+        username,
+        BotDifficulty(settings.BOT_DIFFICULTY),
+        settings.BOT_MOVE_BUDGET,
+        settings.BOT_PROCESSES,
+    )
+    if not await sea_battle_ws_manager.add_user_to_room(
+        room_id, username, bot_connection, game_board=game_board  # type: ignore
+    ):
+        return False
+    await sea_battle_ws_manager.set_user_initialized(room_id, username)
+    await game_services.update_game(
+        PydanticObjectId(room_id), status=GameStatusesEnum.IN_GAME
+    )
+    bot_task = asyncio.create_task(bot_game(room_id, username, game_services))
+    _bot_tasks.add(bot_task)
+    bot_task.add_done_callback(_bot_tasks.discard)
+    return True
+
+
+async def bot_game(
+    room_id: str, username: str, game_services: GameServices
+) -> None:
+    try:
+        await game(room_id, username, game_services)
+    except WebSocketDisconnect:
+        ...
+
+
 async def close_connection_update_game(
     room_id: str,
     game_services: GameServices,
     delete: bool = False
+) -> None:
+    if room_id in _closing_rooms or room_id not in sea_battle_ws_manager.rooms:
+        return
+    _closing_rooms.add(room_id)
+    try:
+        await _close_room_update_game(room_id, game_services, delete)
+    finally:
+        _closing_rooms.discard(room_id)
+
+
+async def _close_room_update_game(
+    room_id: str, game_services: GameServices, delete: bool
 ) -> None:
     winner_username = await sea_battle_ws_manager.get_winner(room_id)
+    usernames = await sea_battle_ws_manager.get_users_from_room(room_id)
+    await sea_battle_ws_manager.send_to_spectators(
+        room_id,
+        ws_protocol.SpectatorGameOverMessage(
+            winner=winner_username
+        ).model_dump_json(),
+    )
+    await sea_battle_ws_manager.flush_saved_games(room_id)
     await sea_battle_ws_manager.remove_room(room_id)
 
     if delete:
@@ -102,22 +449,76 @@ async def close_connection_update_game(
         game = await game_services.update_game(
             PydanticObjectId(room_id), status=GameStatusesEnum.ENDED
         )
-        winner = await User.get_by_username(winner_username)
+        winner = winner_username and await User.get_by_username(
+            winner_username
+        )
 
         if winner:
             game = await game_services.get_game_by_id(PydanticObjectId(room_id))
             await (GameEnds(game=game, winner=winner)).create()
+            loser_username = next(
+                (name for name in usernames if name != winner_username), None
+            )
+            loser = loser_username and await User.get_by_username(
+                loser_username
+            )
+            if loser:
+                await _update_ratings(winner, loser)
+
+
+async def _update_ratings(winner: User, loser: User) -> None:
+    """
+    Move the rating points of the loser to the winner by the Elo formula
+
+    The winner of the stronger opponent gets more points, so matchmaking
+    pairs users of the same strength. Games with the bot are not rated.
+
+    Args:
+        winner(User): User who won the game,
+        loser(User): User who lost the game.
+    """
+    expected_score = 1 / (1 + 10 ** ((loser.rating - winner.rating) / 400))
+    points = round(game_utils.RATING_K_FACTOR * (1 - expected_score))
+    await winner.inc({User.rating: points})
+    await loser.inc({User.rating: -points})
 
 
 async def init_game_board(
-    websocket: WebSocket, game_board: GameBoard, username: str
+    websocket: WebSocket, room_id: str, game_board: GameBoard, username: str
 ) -> None:
     while not game_board.is_all_ships_placed_and_game_initialized:
-        ship_type: int = await validate_fields(
+        ship_type: int | str | BaseModel = await validate_fields(
             websocket,
-            _validate_ship_type,
+            partial(_validate_ship_type, ruleset=game_board.ruleset),
             game_utils.VALID_SHIP_TYPE_ERROR
         )
+        if isinstance(ship_type, ws_protocol.FleetMessage):
+            await place_fleet(
+                websocket, room_id, game_board, username, ship_type
+            )
+            continue
+        if isinstance(ship_type, BaseModel):
+            await _send_message(websocket, _unexpected_message(ship_type))
+            continue
+        if ship_type == game_utils.AUTO_PLACE_SHIPS_COMMAND:
+            try:
+                with (
+                    start_trace(
+                        'ws.placement', room_id=room_id, username=username
+                    ),
+                    operation_latency.measure('placement'),
+                ):
+                    game_board.auto_place_ships()
+            except ValueError:
+                await websocket.send_text(game_utils.WS_SHIPS_NOT_FIT_ERROR)
+                continue
+            await sea_battle_ws_manager.set_saved_game(
+                room_id, game_board, username
+            )
+            await websocket.send_text(
+                game_utils.WS_USER_SHIPS_AUTO_PLACED_INFO
+            )
+            continue
         is_vertical: bool = True if ship_type == 1 else await validate_fields(
             websocket,
             _validate_is_vertical,
@@ -125,16 +526,23 @@ async def init_game_board(
         )
         cords: tuple[str, int] = await validate_fields(
             websocket,
-            _validate_cords,
+            partial(_validate_cords, ruleset=game_board.ruleset),
             game_utils.VALID_COORDINATES_ERROR
         )
         try:
-            if not game_board.set_ship_into_game_board(
-                ship_type, *cords, vertical=is_vertical
+            with (
+                start_trace('ws.placement', room_id=room_id, username=username),
+                operation_latency.measure('placement'),
             ):
+                is_placed = game_board.set_ship_into_game_board(
+                    ship_type, *cords, vertical=is_vertical
+                )
+            if not is_placed:
                 await websocket.send_text(game_utils.WS_CORDS_NOT_FREE_ERROR)
             else:
-                await sea_battle_ws_manager.set_saved_game(game_board, username)
+                await sea_battle_ws_manager.set_saved_game(
+                    room_id, game_board, username
+                )
                 await websocket.send_text(game_utils.WS_USER_SHIP_PLACED_INFO)
         except ShipsOver:
             await websocket.send_text(
@@ -143,6 +551,114 @@ async def init_game_board(
             )
 
 
+async def place_fleet(
+    websocket: WebSocket,
+    room_id: str,
+    game_board: GameBoard,
+    username: str,
+    fleet: ws_protocol.FleetMessage,
+) -> None:
+    """
+    Place ships of the structured fleet message
+
+    Ships are placed on a copy of the game board first, the rest ships
+    are auto placed on it too, so the game board is changed only if every
+    ship of the message is placed.
+
+    Args:
+        websocket(WebSocket): WebSocket connection object,
+        room_id(str): Room MongoDB id,
+        game_board(GameBoard): GameBoard instance of the user,
+        username(str): Username,
+        fleet(FleetMessage): Ships to place, auto places the rest ships.
+    """
+    with start_trace('ws.fleet', room_id=room_id, username=username):
+        await _place_fleet(websocket, room_id, game_board, username, fleet)
+
+
+async def _place_fleet(
+    websocket: WebSocket,
+    room_id: str,
+    game_board: GameBoard,
+    username: str,
+    fleet: ws_protocol.FleetMessage,
+) -> None:
+    with operation_latency.measure('placement'):
+        board_copy, ships, error = _check_fleet(game_board, fleet)
+        is_placed = not error and not any(ship.error for ship in ships)
+        if is_placed:
+            placed_amount = len(game_board._ships_placed)
+            for ship in board_copy._ships_placed[placed_amount:]:
+                game_board.set_ship_into_game_board(
+                    ship.ship_type, ship.x, ship.y, vertical=ship.vertical
+                )
+    if is_placed:
+        await sea_battle_ws_manager.set_saved_game(
+            room_id, game_board, username
+        )
+    await _send_message(websocket, ws_protocol.FleetResult(
+        placed=is_placed,
+        ships=ships,
+        is_all_ships_placed=(
+            game_board.is_all_ships_placed_and_game_initialized
+        ),
+        error=error,
+    ))
+
+
+def _check_fleet(
+    game_board: GameBoard, fleet: ws_protocol.FleetMessage
+) -> tuple[
+    GameBoard, list[ws_protocol.ShipPlacementResult], Optional[str]
+]:
+    ruleset = game_board.ruleset
+    board_copy = board_snapshot.decode_game_board(
+        board_snapshot.encode_game_board(game_board)
+    )
+    results = []
+    for ship in fleet.ships:
+        error: Optional[str] = None
+        cords = _validate_cords(ship.cords, ruleset)
+        if ship.ship_type not in ruleset.fleet:
+            error = game_utils.VALID_SHIP_TYPE_ERROR
+        elif not cords:
+            error = game_utils.VALID_COORDINATES_ERROR
+        else:
+            try:
+                if not board_copy.set_ship_into_game_board(
+                    ship.ship_type, *cords, vertical=ship.vertical
+                ):
+                    error = game_utils.WS_CORDS_NOT_FREE_ERROR
+            except ShipsOver:
+                error = game_utils.WS_GAME_SHIP_WITH_TYPE_ERROR.format(
+                    ship_type=ship.ship_type
+                )
+        results.append(
+            ws_protocol.ShipPlacementResult(**ship.model_dump(), error=error)
+        )
+
+    fleet_error: Optional[str] = None
+    if fleet.auto and not any(result.error for result in results):
+        try:
+            board_copy.auto_place_ships()
+        except ValueError:
+            fleet_error = game_utils.WS_SHIPS_NOT_FIT_ERROR
+    return board_copy, results, fleet_error
+
+
+async def _send_message(websocket: WebSocket, message: BaseModel) -> None:
+    await websocket.send_text(message.model_dump_json())
+
+
+def _unexpected_message(message: BaseModel) -> ws_protocol.ErrorMessage:
+    if isinstance(message, ws_protocol.ErrorMessage):
+        return message
+    return ws_protocol.ErrorMessage(
+        code=ws_protocol.ProtocolErrorCodes.UNEXPECTED_MESSAGE,
+        message=f'Message {message.type} is not expected now',  # type: ignore
+    )
+
+
 async def validate_fields(
     websocket: WebSocket, validate_func: Callable, error_message: str
 ) -> Any:
@@ -153,22 +669,30 @@ async def validate_fields(
     return field
 
 
-def _validate_ship_type(ship_type: str) -> Optional[int]:
+def _validate_ship_type(
+    ship_type: str, ruleset: Ruleset
+) -> Optional[int | str | BaseModel]:
+    if ws_protocol.is_structured_message(ship_type):
+        return ws_protocol.parse_client_message(ship_type)
+    if ship_type.strip().lower() == game_utils.AUTO_PLACE_SHIPS_COMMAND:
+        return game_utils.AUTO_PLACE_SHIPS_COMMAND
     try:
         ship_type = int(ship_type)  # type: ignore
-        assert ship_type in range(1, 5)
+        assert ship_type in ruleset.fleet
     except (AssertionError, ValueError, TypeError):
         ship_type = None
     return ship_type  # type: ignore
 
 
-def _validate_cords(cords: str) -> Optional[tuple[str, int]]:
+def _validate_cords(
+    cords: str, ruleset: Ruleset
+) -> Optional[tuple[str, int]]:
     try:
-        game_x, *game_y = list(cords)
+        game_x, game_y = CORDS_PATTERN.fullmatch(cords.strip()).groups()
         game_x = game_x.upper()
-        game_y = int(''.join(game_y))  # type: ignore
-        assert game_y in range(1, 11)
-    except (ValueError, AssertionError):
+        game_y = int(game_y)  # type: ignore
+        assert ruleset.cell_idx(game_x, game_y) is not None  # type: ignore
+    except (AttributeError, AssertionError):
         ...
     else:
         return game_x, game_y  # type: ignore
@@ -0,0 +1,490 @@
+"""
+In-process load test of the sea battle WebSocket route.
+
+Simulated players are driven through the real '/ws/sea-battle/' route of
+the application: JWT authentication, matchmaking, fleet setup and
+moves. Players are paired by the matchmaking queue, so every game has
+two players connected one after another.
+
+Redis and MongoDB of the settings are used by default, in-memory
+stand-ins need fakeredis and mongomock_motor installed:
+    python -m src.core.services.ws_loadtest --games 100 \\
+        --redis memory --mongo memory
+
+The application startup events are not run, the database is initialized
+by the load test and the room reaper is not started.
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from beanie import init_beanie
+from fastapi import FastAPI, WebSocketDisconnect
+
+from src.api.di.user import get_jwt_strategy
+from src.api.ws.managers.outbound import HEARTBEAT_PING, HEARTBEAT_PONG
+from src.api.ws.managers.sea_battle import sea_battle_ws_manager
+from src.core.services.board_benchmark import game_fleet
+from src.core.services.rules import get_ruleset
+from src.core.utils import game_utils
+from src.domain.game.enums.rulesets import GameRulesetsEnum
+from src.infrastructure.db.main import initiate_database
+from src.infrastructure.db.models import Game, GameEnds, User
+
+WS_PATH = '/ws/sea-battle/'
+BACKENDS = ('settings', 'memory')
+SETUP_PROTOCOLS = ('json', 'text')
+DEFAULT_GAMES = 10
+# Players connect evenly during that time
+DEFAULT_RAMP_SECONDS = 1.0
+DEFAULT_TIMEOUT_SECONDS = 300.0
+USERNAME = 'load-{run}-{idx}'
+
+
+class LoadTestError(Exception):
+    ...
+
+
+class ASGIWebSocketClient:
+    """
+    WebSocket client calling the ASGI application in the same process
+
+    Args:
+        app (FastAPI): Application to connect to,
+        path (str): WebSocket route path,
+        headers (dict): Request headers.
+    """
+
+    def __init__(
+        self, app: FastAPI, path: str, headers: dict[str, str]
+    ) -> None:
+        self.app = app
+        self.path = path
+        self.headers = headers
+        self._to_app: asyncio.Queue[dict] = asyncio.Queue()
+        self._from_app: asyncio.Queue[dict] = asyncio.Queue()
+        self._app_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """
+        Raises:
+            WebSocketDisconnect: If the connection is not accepted.
+        """
+        path, _, query_string = self.path.partition('?')
+        scope = {
+            'type': 'websocket',
+            'asgi': {'version': '3.0'},
+            'scheme': 'ws',
+            'http_version': '1.1',
+            'path': path,
+            'raw_path': path.encode(),
+            'root_path': '',
+            'query_string': query_string.encode(),
+            'headers': [
+                (name.lower().encode(), value.encode())
+                for name, value in self.headers.items()
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+            'subprotocols': [],
+        }
+        self._app_task = asyncio.create_task(
+            self.app(scope, self._to_app.get, self._from_app.put)
+        )
+        await self._to_app.put({'type': 'websocket.connect'})
+        message = await self._from_app.get()
+        if message['type'] != 'websocket.accept':
+            raise WebSocketDisconnect(message.get('code', 1000))
+
+    async def send_text(self, data: str) -> None:
+        await self._to_app.put({'type': 'websocket.receive', 'text': data})
+
+    async def receive_text(self) -> str:
+        """
+        Raises:
+            WebSocketDisconnect: If the application closed the connection.
+        """
+        message = await self._from_app.get()
+        if message['type'] == 'websocket.close':
+            raise WebSocketDisconnect(message.get('code', 1000))
+        return message['text']
+
+    async def close(self) -> None:
+        await self._to_app.put({'type': 'websocket.disconnect', 'code': 1000})
+        if self._app_task is not None:
+            try:
+                await asyncio.wait_for(self._app_task, 5)
+            except Exception:
+                ...
+
+
+@dataclass
+class LoadTestStats:
+    connect_seconds: list[float] = field(default_factory=list)
+    setup_seconds: list[float] = field(default_factory=list)
+    move_seconds: list[float] = field(default_factory=list)
+    messages: int = 0
+    games_over: int = 0
+    bot_games: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class SimulatedPlayer:
+    """
+    Player answering the server messages like a client would
+
+    Fleet is placed by one structured message or by the text prompts,
+    moves are structured messages, so every move gets its result.
+
+    Args:
+        client (ASGIWebSocketClient): Connection of the player,
+        username (str): Username of the player,
+        ruleset_name (str): Ruleset of the game,
+        setup_protocol (str): 'json' or 'text' fleet setup,
+        stats (LoadTestStats): Stats of the load test,
+        seed (int): Seed of the fleet and shots.
+    """
+
+    def __init__(
+        self,
+        client: ASGIWebSocketClient,
+        username: str,
+        ruleset_name: str,
+        setup_protocol: str,
+        stats: LoadTestStats,
+        seed: int,
+    ) -> None:
+        self.client = client
+        self.username = username
+        self.setup_protocol = setup_protocol
+        self.stats = stats
+        ruleset = get_ruleset(ruleset_name)
+        self.fleet = game_fleet(ruleset, seed)
+        self.shots = [
+            f'{letter}{y}'
+            for y in range(1, ruleset.height + 1)
+            for letter in ruleset.letters
+        ]
+        random.Random(seed).shuffle(self.shots)
+        self._text_fleet: list[str] = []
+        self._move_sent_at: Optional[float] = None
+        self._game_started_at: Optional[float] = None
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        await self.client.connect()
+        self.stats.connect_seconds.append(time.perf_counter() - started)
+        try:
+            while not await self._handle(await self.client.receive_text()):
+                ...
+            if self._game_started_at is not None:
+                self.stats.setup_seconds.append(
+                    self._game_started_at - started
+                )
+        finally:
+            await self.client.close()
+
+    async def _send(self, data: str) -> None:
+        self.stats.messages += 1
+        await self.client.send_text(data)
+
+    async def _handle(self, text: str) -> bool:
+        """
+        Answer the server message
+
+        Returns:
+            is_game_over(bool): True if the game is over.
+        """
+        self.stats.messages += 1
+        if text == HEARTBEAT_PING:
+            await self._send(HEARTBEAT_PONG)
+        elif text == game_utils.VALID_SHIP_TYPE_ERROR:
+            await self._send_fleet()
+        elif text == game_utils.VALID_VERTICAL_FIELD_ERROR:
+            await self._send(self._text_fleet.pop(0))
+        elif text == game_utils.VALID_COORDINATES_ERROR:
+            await self._send(self._text_fleet.pop(0))
+        elif text == game_utils.WS_GAME_BOT_CONNECTED_INFO:
+            self.stats.bot_games += 1
+        elif text.startswith('Game started!'):
+            self._game_started_at = time.perf_counter()
+            if text.endswith(f' {self.username}.'):
+                await self._shoot()
+        elif text == game_utils.WS_USER_MOVE_INFO:
+            await self._shoot()
+        elif text == game_utils.WS_GAME_OVER_INFO:
+            self.stats.games_over += 1
+            return True
+        elif text.startswith('{'):
+            await self._handle_structured(json.loads(text))
+        elif text in (
+            'This room is full!', game_utils.WS_GAME_NOT_START_ERROR
+        ):
+            raise LoadTestError(f'{self.username}: {text}')
+        return False
+
+    async def _handle_structured(self, message: dict[str, Any]) -> None:
+        if message['type'] == 'fleet_result' and not message['placed']:
+            raise LoadTestError(f'{self.username}: fleet is not placed')
+        if message['type'] != 'move_result':
+            return
+        if self._move_sent_at is not None:
+            self.stats.move_seconds.append(
+                time.perf_counter() - self._move_sent_at
+            )
+            self._move_sent_at = None
+        if not (
+            message['is_turn_passed']
+            or message['is_game_over']
+            or message['status'] == 'not_your_move'
+        ):
+            await self._shoot()
+
+    async def _send_fleet(self) -> None:
+        if self.setup_protocol == 'json':
+            await self._send(json.dumps({
+                'v': 1,
+                'type': 'fleet',
+                'ships': [
+                    {'ship_type': ship_type, 'cords': f'{x}{y}',
+                     'vertical': vertical}
+                    for ship_type, x, y, vertical in self.fleet
+                ],
+            }))
+            return
+        ship_type, x, y, vertical = self.fleet.pop(0)
+        # Answers of the next vertical and cords prompts
+        self._text_fleet = [str(vertical), f'{x}{y}'][ship_type == 1:]
+        await self._send(str(ship_type))
+
+    async def _shoot(self) -> None:
+        if self._move_sent_at is not None or not self.shots:
+            return
+        self._move_sent_at = time.perf_counter()
+        await self._send(json.dumps({
+            'v': 1, 'type': 'move', 'cords': self.shots.pop()
+        }))
+
+
+async def setup_backends(redis: str, mongo: str) -> None:
+    """
+    Initialize the database and the Redis connection of the manager
+
+    Args:
+        redis (str): 'settings' or 'memory',
+        mongo (str): 'settings' or 'memory'.
+    Raises:
+        LoadTestError: If the in-memory stand-in is not installed.
+    """
+    if redis == 'memory':
+        try:
+            from fakeredis.aioredis import FakeRedis
+        except ImportError:
+            raise LoadTestError('fakeredis is required for --redis memory')
+        sea_battle_ws_manager.pubsub_client.redis_connection = FakeRedis()
+    if mongo == 'memory':
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise LoadTestError(
+                'mongomock_motor is required for --mongo memory'
+            )
+        await init_beanie(
+            database=AsyncMongoMockClient().seabattledb,
+            document_models=[Game, GameEnds, User],
+        )
+    else:
+        await initiate_database()
+
+
+async def create_players(run: str, games: int) -> list[tuple[str, str]]:
+    """
+    Create users and their tokens, two users for every game
+
+    Returns:
+        players(list): Username and token of every player.
+    """
+    strategy = get_jwt_strategy()
+    players = []
+    for idx in range(games * 2):
+        username = USERNAME.format(run=run, idx=idx)
+        user = User(
+            username=username,
+            email=f'{username}@load.test',
+            hashed_password='-',
+            is_active=True,
+        )
+        await user.create()
+        players.append((username, await strategy.write_token(user)))
+    return players
+
+
+async def run_load_test(
+    app: FastAPI,
+    games: int = DEFAULT_GAMES,
+    ruleset_name: str = GameRulesetsEnum.CLASSIC.value,
+    setup_protocol: str = 'json',
+    ramp_seconds: float = DEFAULT_RAMP_SECONDS,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> tuple[LoadTestStats, float]:
+    """
+    Play the games concurrently
+
+    Returns:
+        stats(LoadTestStats): Stats of all players,
+        seconds(float): Time of all games.
+    """
+    run = f'{time.time_ns():x}'
+    players = await create_players(run, games)
+    stats = LoadTestStats()
+    delay = ramp_seconds / len(players)
+
+    async def play(idx: int, username: str, token: str):
+        await asyncio.sleep(idx * delay)
+        player = SimulatedPlayer(
+            ASGIWebSocketClient(
+                app,
+                f'{WS_PATH}?ruleset={ruleset_name}',
+                {'Authorization': token},
+            ),
+            username,
+            ruleset_name,
+            setup_protocol,
+            stats,
+            seed=idx,
+        )
+        try:
+            await player.run()
+        except Exception as e:
+            stats.errors.append(f'{username}: {e!r}')
+
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(play(idx, *player))
+        for idx, player in enumerate(players)
+    ]
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    stats.errors.extend('Player timed out' for _ in pending)
+    return stats, time.perf_counter() - started
+
+
+def percentiles(seconds: list[float]) -> str:
+    if len(seconds) < 2:
+        return 'not enough samples'
+    quantiles = statistics.quantiles(seconds, n=100, method='inclusive')
+    return ', '.join(
+        f'{name} {value * 1e3:.2f}ms' for name, value in (
+            ('p50', quantiles[49]),
+            ('p90', quantiles[89]),
+            ('p99', quantiles[98]),
+            ('max', max(seconds)),
+        )
+    )
+
+
+def report(
+    stats: LoadTestStats,
+    seconds: float,
+    games: int,
+    peak_rss_kb: int,
+    traced_peak: Optional[int],
+) -> str:
+    lines = [
+        f'Games: {games}, over: {stats.games_over // 2}, '
+        f'with bot: {stats.bot_games}, time: {seconds:.2f}s',
+        f'Connect: {percentiles(stats.connect_seconds)}',
+        f'Setup until game start: {percentiles(stats.setup_seconds)}',
+        f'Move: {percentiles(stats.move_seconds)}',
+        f'Moves: {len(stats.move_seconds)}, '
+        f'messages/sec: {stats.messages / seconds:.0f}',
+        f'Peak RSS growth per room: {peak_rss_kb / games:.1f}KiB',
+    ]
+    if traced_peak is not None:
+        lines.append(
+            f'Peak traced memory per room: {traced_peak / games / 1024:.1f}KiB'
+        )
+    lines.extend(f'Error: {error}' for error in stats.errors[:10])
+    if len(stats.errors) > 10:
+        lines.append(f'... {len(stats.errors) - 10} more errors')
+    return '\n'.join(lines)
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    from src.api.main import app
+
+    await setup_backends(args.redis, args.mongo)
+    if args.tracemalloc:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        stats, seconds = await run_load_test(
+            app,
+            args.games,
+            args.ruleset,
+            args.setup,
+            args.ramp,
+            args.timeout,
+        )
+    finally:
+        await sea_battle_ws_manager.flush_saved_games()
+        await sea_battle_ws_manager.pubsub_client.close()
+    traced_peak: Optional[int] = None
+    if args.tracemalloc:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+    rss_growth = (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    )
+    print(report(stats, seconds, args.games, rss_growth, traced_peak))
+    return 1 if stats.errors else 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES)
+    parser.add_argument(
+        '--ruleset',
+        choices=[ruleset.value for ruleset in GameRulesetsEnum],
+        default=GameRulesetsEnum.CLASSIC.value,
+    )
+    parser.add_argument(
+        '--setup',
+        choices=SETUP_PROTOCOLS,
+        default='json',
+        help='Place the fleet by one message or by the text prompts',
+    )
+    parser.add_argument('--redis', choices=BACKENDS, default='settings')
+    parser.add_argument('--mongo', choices=BACKENDS, default='settings')
+    parser.add_argument(
+        '--ramp',
+        type=float,
+        default=DEFAULT_RAMP_SECONDS,
+        help='Seconds to connect all players',
+    )
+    parser.add_argument(
+        '--timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS
+    )
+    parser.add_argument(
+        '--tracemalloc',
+        action='store_true',
+        help='Trace Python memory, it slows the load test down',
+    )
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(main_async(args))
+    except LoadTestError as e:
+        print(e)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,170 @@
+"""
+Versioned structured messages of the sea battle WebSocket.
+
+A structured message is a JSON object text frame, other frames are the
+text protocol, so both protocols are served on the same connection.
+
+Client messages:
+    {"v": 1, "type": "fleet", "ships": [
+        {"ship_type": 4, "cords": "A1", "vertical": true}, ...
+    ]} - place the ships in one frame, all or nothing;
+    {"v": 1, "type": "fleet", "auto": true} - place the fleet randomly;
+    {"v": 1, "type": "move", "cords": "B2"} - make a move.
+
+Server results:
+    {"v": 1, "type": "fleet_result", "placed": true, "ships": [
+        {"ship_type": 4, "cords": "A1", "vertical": true, "error": null}
+    ], "is_all_ships_placed": true, "error": null} - the error is set
+        if the rest ships of the auto fleet do not fit;
+    {"v": 1, "type": "move_result", "cords": "B2", "status": "hit",
+        "is_drowned": false, "is_game_over": false,
+        "is_turn_passed": false};
+    {"v": 1, "type": "error", "code": "invalid_message", "message": "..."}.
+
+Spectator messages, only shots are shown, not hitted ships are hidden:
+    {"v": 1, "type": "spectator_state", "usernames": ["a", "b"],
+        "turn": "a", "boards": {"b": {"hits": ["B2"], "misses": ["C3"]}},
+        "winner": null} - the room state sent once the spectator joins;
+    {"v": 1, "type": "spectator_move", "username": "a",
+        "target_username": "b", "cords": "B2", "status": "hit",
+        "is_drowned": false, "is_game_over": false} - a move of the user
+        on the board of the target user;
+    {"v": 1, "type": "spectator_game_over", "winner": "a"}.
+"""
+import json
+from enum import Enum
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+PROTOCOL_VERSION = 1
+
+
+class ProtocolErrorCodes(str, Enum):
+    INVALID_MESSAGE: str = 'invalid_message'
+    UNSUPPORTED_VERSION: str = 'unsupported_version'
+    UNEXPECTED_MESSAGE: str = 'unexpected_message'
+    INVALID_CORDS: str = 'invalid_cords'
+    NOT_YOUR_MOVE: str = 'not_your_move'
+
+
+class ShipPlacement(BaseModel):
+    ship_type: int
+    cords: str
+    vertical: bool = False
+
+
+class FleetMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['fleet']
+    ships: list[ShipPlacement] = []
+    auto: bool = False
+
+
+class MoveMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['move']
+    cords: str
+
+
+ClientMessage = Annotated[
+    Union[FleetMessage, MoveMessage], Field(discriminator='type')
+]
+client_message_adapter: TypeAdapter = TypeAdapter(ClientMessage)
+
+
+class ShipPlacementResult(ShipPlacement):
+    error: Optional[str] = None
+
+
+class FleetResult(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['fleet_result'] = 'fleet_result'
+    placed: bool
+    ships: list[ShipPlacementResult] = []
+    is_all_ships_placed: bool
+    error: Optional[str] = None
+
+
+class MoveResultMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['move_result'] = 'move_result'
+    cords: str
+    status: str
+    is_drowned: bool = False
+    is_game_over: bool = False
+    is_turn_passed: bool = False
+
+
+class ErrorMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['error'] = 'error'
+    code: ProtocolErrorCodes
+    message: str
+
+
+class SpectatorBoard(BaseModel):
+    hits: list[str] = []
+    misses: list[str] = []
+
+
+class SpectatorStateMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['spectator_state'] = 'spectator_state'
+    usernames: list[str]
+    turn: Optional[str] = None
+    boards: dict[str, SpectatorBoard] = {}
+    winner: Optional[str] = None
+
+
+class SpectatorMoveMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['spectator_move'] = 'spectator_move'
+    username: str
+    target_username: str
+    cords: str
+    status: str
+    is_drowned: bool = False
+    is_game_over: bool = False
+
+
+class SpectatorGameOverMessage(BaseModel):
+    v: int = PROTOCOL_VERSION
+    type: Literal['spectator_game_over'] = 'spectator_game_over'
+    winner: Optional[str] = None
+
+
+def is_structured_message(ws_text: str) -> bool:
+    return ws_text.lstrip().startswith('{')
+
+
+def parse_client_message(
+    ws_text: str,
+) -> FleetMessage | MoveMessage | ErrorMessage:
+    """
+    Parse structured client message
+
+    Args:
+        ws_text(str): Text frame of the JSON object.
+    Returns:
+        message(FleetMessage | MoveMessage | ErrorMessage): Client message
+            or error message to send back if the frame is not valid.
+    """
+    try:
+        version = json.loads(ws_text).get('v', PROTOCOL_VERSION)
+    except (ValueError, AttributeError) as e:
+        return ErrorMessage(
+            code=ProtocolErrorCodes.INVALID_MESSAGE, message=str(e)
+        )
+    if version != PROTOCOL_VERSION:
+        return ErrorMessage(
+            code=ProtocolErrorCodes.UNSUPPORTED_VERSION,
+            message=f'Supported protocol version is {PROTOCOL_VERSION}',
+        )
+    try:
+        return client_message_adapter.validate_json(ws_text)
+    except ValidationError as e:
+        return ErrorMessage(
+            code=ProtocolErrorCodes.INVALID_MESSAGE,
+            message='; '.join(error['msg'] for error in e.errors()),
+        )
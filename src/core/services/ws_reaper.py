@@ -0,0 +1,108 @@
+"""
+Background reaper of dead connections and expired rooms of the worker.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from src.api.ws.managers.sea_battle import (
+    ExpiredRoom,
+    RoomDeadlines,
+    sea_battle_ws_manager,
+)
+from src.core.services.ws_game import close_connection_update_game
+from src.core.utils import game_utils
+from src.domain.game.usecases.game import GameServices
+
+logger = logging.getLogger(__name__)
+
+REAPER_INTERVAL_SECONDS = 5.0
+
+_reaper_task: Optional[asyncio.Task] = None
+
+
+async def reap_rooms(game_services: GameServices) -> None:
+    """
+    Check connections and deadlines of every room of the worker
+
+    Silent connections are pinged and dead ones are closed, so their game
+    loops are stopped. The user who missed the move deadline loses, the
+    idle room is closed. Expired rooms are removed and their games are
+    resolved in the database. Spectator connections are pinged too.
+
+    Args:
+        game_services(GameServices): Services usecases for model Game.
+    """
+    for room_id in list(sea_battle_ws_manager.rooms):
+        try:
+            room = sea_battle_ws_manager.rooms.get(room_id, {})
+            for user in list(room.values()):
+                await user['connection'].heartbeat()
+            expired_room = await sea_battle_ws_manager.check_room_deadlines(
+                room_id,
+                game_utils.SECONDS_TO_MOVE,
+                game_utils.SECONDS_TO_ROOM_IDLE,
+            )
+            if expired_room:
+                await resolve_expired_room(
+                    room_id, expired_room, game_services
+                )
+        except Exception:
+            logger.exception(f'Room {room_id} is not checked')
+    for spectators in list(sea_battle_ws_manager.spectators.values()):
+        for connection in list(spectators):
+            await connection.heartbeat()
+
+
+async def resolve_expired_room(
+    room_id: str, expired_room: ExpiredRoom, game_services: GameServices
+) -> None:
+    """
+    Notify room users, remove the room and resolve its game
+
+    Args:
+        room_id(str): Room MongoDB id,
+        expired_room(ExpiredRoom): Missed deadline of the room,
+        game_services(GameServices): Services usecases for model Game.
+    """
+    logger.info(f'Room {room_id} missed the {expired_room.deadline} deadline')
+    if expired_room.deadline == RoomDeadlines.TURN:
+        message = game_utils.WS_GAME_MOVE_TIMEOUT_INFO.format(
+            username=expired_room.winner
+        )
+    else:
+        message = game_utils.WS_GAME_ROOM_IDLE_INFO
+    for username in await sea_battle_ws_manager.get_users_from_room(room_id):
+        await sea_battle_ws_manager.send_to_user(room_id, username, message)
+    await close_connection_update_game(
+        room_id, game_services, delete=not expired_room.is_started
+    )
+
+
+async def run_room_reaper(
+    game_services: GameServices,
+    interval: float = REAPER_INTERVAL_SECONDS,
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reap_rooms(game_services)
+        except Exception:
+            logger.exception('Rooms are not reaped')
+
+
+def start_room_reaper(game_services: GameServices) -> None:
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(run_room_reaper(game_services))
+
+
+async def stop_room_reaper() -> None:
+    global _reaper_task
+    if _reaper_task is not None:
+        _reaper_task.cancel()
+        try:
+            await _reaper_task
+        except asyncio.CancelledError:
+            ...
+        _reaper_task = None
@@ -1,20 +1,44 @@
 SECONDS_TO_CONNECT_AND_INITIALIZE_SHIPS = 20
+SECONDS_TO_WAIT_FOR_OTHER_USER = 10
+SECONDS_BETWEEN_WAIT_INFO = 5
+SECONDS_TO_MOVE = 60
+SECONDS_TO_ROOM_IDLE = 10 * 60
+# Waiting user is paired again with the doubled rating band
+SECONDS_TO_WIDEN_RATING_BAND = 5
+# Max rating points the winner gets from the loser
+RATING_K_FACTOR = 32
+
+AUTO_PLACE_SHIPS_COMMAND = 'auto'
 
 VALID_COORDINATES_ERROR = 'Enter valid cords. A1 or B2 or C3.'
-VALID_SHIP_TYPE_ERROR = 'Enter valid ship type. 1, 2, 3, 4'
+VALID_SHIP_TYPE_ERROR = (
+    'Enter valid ship type. 1, 2, 3, 4 or auto to place all ships randomly'
+)
 VALID_VERTICAL_FIELD_ERROR = 'Enter valid is vertical or not. False or True.'
 
-WS_CORDS_NOT_FREE_ERROR = 'Ship is not placed. Coordinates is not free.'
+WS_CORDS_NOT_FREE_ERROR = (
+    'Ship is not placed. Coordinates is not free or ship touches other ship.'
+)
 WS_GAME_SHIP_WITH_TYPE_ERROR = 'Ship with type {ship_type} is over!'
+WS_SHIPS_NOT_FIT_ERROR = 'Ships do not fit, place them manually.'
 WS_GAME_NOT_START_ERROR = 'Game is not started!'
 WS_GAME_NOT_YOUR_MOVE_ERROR = 'This is not your move now!'
+WS_GAME_REPEATED_MOVE_ERROR = 'You have already hit here, move again.'
 
 WS_USER_SHIP_PLACED_INFO = 'OK!'
+WS_USER_SHIPS_AUTO_PLACED_INFO = 'All ships are placed randomly.'
 WS_USER_MOVE_INFO = 'Your move now.'
 WS_GAME_WAIT_FOR_OTHER_USER_INFO = 'Wait for other user initialize a game'
+WS_GAME_BOT_CONNECTED_INFO = 'Nobody connected, you play with the computer.'
 WS_GAME_HIT_SHIP_USER_1_INFO = 'Hit!'
 WS_GAME_HITTED_SHIP_USER_2_INFO = 'Hitted! {cords}'
 WS_GAME_OVER_INFO = 'Game Over!'
+WS_GAME_MOVE_TIMEOUT_INFO = 'Time to move is over! {username} wins.'
+WS_GAME_ROOM_IDLE_INFO = 'Game is closed, nobody played for a long time.'
 WS_GAME_INITIALIZE_SECONDS_PASSED_INFO = '{seconds} seconds passed!'
+WS_MATCHMAKING_INFO = (
+    'Searching for an opponent. Send a room id to join that game instead.'
+)
+WS_MATCHMAKING_FOUND_INFO = 'Opponent is found.'
 
 WS_GAME_START_MESSAGE_SUCCES = 'Game started! First move to {username}.'
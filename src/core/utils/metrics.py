@@ -0,0 +1,178 @@
+"""
+Runtime metrics of the worker in the Prometheus text format.
+
+Histograms are recorded in the hot path, an observation is a bucket
+search and a few additions. Gauges are computed by their callbacks only
+when metrics are scraped. Every worker process has its own metrics.
+"""
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+# Seconds, from a local call to a slow database request
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5,
+)
+
+AsyncFunc = TypeVar('AsyncFunc', bound=Callable[..., Awaitable[Any]])
+
+
+class Histogram:
+    """
+    Histogram of values with one label
+
+    Args:
+        name (str): Metric name,
+        documentation (str): Metric help text,
+        label (str): Label name,
+        buckets (tuple): Sorted upper bounds of the buckets.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = buckets
+        # Label value: counts of every bucket and +Inf, sum of values
+        self._values: dict[str, tuple[list[int], list[float]]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        try:
+            counts, total = self._values[label_value]
+        except KeyError:
+            counts, total = self._values.setdefault(
+                label_value, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    @contextmanager
+    def measure(self, label_value: str) -> Iterator[None]:
+        """Context manager observing the run time of its block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(label_value, time.perf_counter() - started)
+
+    def time(self, label_value: str) -> Callable[[AsyncFunc], AsyncFunc]:
+        """Decorator observing the run time of a coroutine function"""
+        def decorator(func: AsyncFunc) -> AsyncFunc:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.observe(label_value, time.perf_counter() - started)
+            return wrapper  # type: ignore
+        return decorator
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        for label_value, (counts, total) in self._values.items():
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}'
+            cumulative += counts[-1]
+            yield f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}'
+            yield f'{self.name}_sum{{{label}}} {total[0]}'
+            yield f'{self.name}_count{{{label}}} {cumulative}'
+
+
+class Gauge:
+    """
+    Gauge computed when metrics are scraped
+
+    Args:
+        name (str): Metric name,
+        documentation (str): Metric help text,
+        collect (Callable): Function returning the current value.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, collect: Callable[[], float]
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} gauge'
+        yield f'{self.name} {self.collect()}'
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Histogram | Gauge] = {}
+
+    def histogram(
+        self, name: str, documentation: str, label: str
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, label)
+        self.metrics[name] = histogram
+        return histogram
+
+    def gauge(
+        self, name: str, documentation: str, collect: Callable[[], float]
+    ) -> Gauge:
+        gauge = Gauge(name, documentation, collect)
+        self.metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        return '\n'.join(
+            line
+            for metric in list(self.metrics.values())
+            for line in metric.render()
+        ) + '\n'
+
+
+def time_methods(
+    histogram: Histogram, prefix: str
+) -> Callable[[type], type]:
+    """
+    Class decorator observing every public coroutine method of the class
+
+    Args:
+        histogram (Histogram): Histogram to observe,
+        prefix (str): Label value prefix, the method name is appended.
+    """
+    def decorator(cls: type) -> type:
+        for name, method in list(vars(cls).items()):
+            if (
+                not name.startswith('_')
+                and inspect.iscoroutinefunction(method)
+            ):
+                setattr(
+                    cls, name, histogram.time(f'{prefix}.{name}')(method)
+                )
+        return cls
+    return decorator
+
+
+metrics_registry = MetricsRegistry()
+operation_latency = metrics_registry.histogram(
+    'sea_battle_operation_seconds',
+    'Latency of the game operations',
+    'operation',
+)
+repository_latency = metrics_registry.histogram(
+    'sea_battle_repository_seconds',
+    'Latency of the database repository calls',
+    'call',
+)
@@ -0,0 +1,42 @@
+"""
+On-demand CPU profile of the running worker.
+
+The WebSocket handlers, room actors and managers of the worker all run
+in the event loop thread, so the profiler enabled in a coroutine of the
+loop records everything the worker does until it is disabled.
+"""
+import asyncio
+import cProfile
+import marshal
+
+MAX_PROFILE_SECONDS = 60
+
+_profile_lock = asyncio.Lock()
+
+
+class ProfilerBusy(Exception):
+    ...
+
+
+async def profile_worker(seconds: float) -> bytes:
+    """
+    Capture a CPU profile of the worker
+
+    Args:
+        seconds(float): Profiling time, MAX_PROFILE_SECONDS at most.
+    Returns:
+        profile(bytes): Profile in the pstats file format.
+    Raises:
+        ProfilerBusy: If the worker is being profiled already.
+    """
+    if _profile_lock.locked():
+        raise ProfilerBusy
+    async with _profile_lock:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(min(seconds, MAX_PROFILE_SECONDS))
+        finally:
+            profiler.disable()
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)  # type: ignore
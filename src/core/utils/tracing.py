@@ -0,0 +1,165 @@
+"""
+Sampled tracing of the inbound WebSocket messages.
+
+A trace is started for a received message and its spans are propagated
+with a context variable, so the service, manager and repository calls
+made while the message is handled are recorded in its trace. A not
+sampled message costs one random number, a span outside of a sampled
+trace costs one context variable lookup. Finished traces are logged as
+one JSON line each and the last ones are kept for the admin routes.
+"""
+import inspect
+import json
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACES_KEPT = 100
+
+recent_traces: deque[dict[str, Any]] = deque(maxlen=TRACES_KEPT)
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    # Root span of the trace, None for the root span itself
+    root: Optional['Span'] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    children: list['Span'] = field(default_factory=list)
+
+    @property
+    def is_finished(self) -> bool:
+        return (self.root or self).duration is not None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'ms': round((self.duration or 0.0) * 1000, 3),
+            **({'attributes': self.attributes} if self.attributes else {}),
+            **(
+                {'children': [child.as_dict() for child in self.children]}
+                if self.children else {}
+            ),
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    'current_span', default=None
+)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(
+    name: str, sample_rate: Optional[float] = None, **attributes: Any
+) -> Iterator[Optional[Span]]:
+    """
+    Trace the handling of an inbound message
+
+    Inside of a sampled trace the trace is continued with a child span.
+
+    Args:
+        name (str): Root span name,
+        sample_rate (float): Share of the traced messages, the
+            TRACE_SAMPLE_RATE setting by default,
+        attributes: Attributes of the root span.
+    """
+    if _current_span.get() is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+    if sample_rate is None:
+        sample_rate = settings.TRACE_SAMPLE_RATE
+    if random.random() >= sample_rate:
+        yield None
+        return
+
+    root = Span(name, uuid.uuid4().hex, attributes=attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    finally:
+        _current_span.reset(token)
+        root.duration = time.perf_counter() - root.started
+        _export(root)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Record a child span of the current span of a sampled trace
+
+    Args:
+        name (str): Span name,
+        attributes: Attributes of the span.
+    """
+    parent = _current_span.get()
+    # Tasks started inside of a trace may outlive it
+    if parent is None or parent.is_finished:
+        yield None
+        return
+
+    child = Span(
+        name, parent.trace_id, parent.root or parent, attributes=attributes
+    )
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        _current_span.reset(token)
+        child.duration = time.perf_counter() - child.started
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording a span for every call of a coroutine function"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_methods(prefix: str) -> Callable[[type], type]:
+    """
+    Class decorator recording spans of every public coroutine method
+
+    Args:
+        prefix (str): Span name prefix, the method name is appended.
+    """
+    def decorator(cls: type) -> type:
+        for name, method in list(vars(cls).items()):
+            if (
+                not name.startswith('_')
+                and inspect.iscoroutinefunction(method)
+            ):
+                setattr(cls, name, traced(f'{prefix}.{name}')(method))
+        return cls
+    return decorator
+
+
+def _export(root: Span) -> None:
+    trace = {'trace_id': root.trace_id, **root.as_dict()}
+    recent_traces.append(trace)
+    logger.info(json.dumps(trace, default=str))
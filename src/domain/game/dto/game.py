@@ -4,12 +4,14 @@ from typing import Optional
 from beanie import PydanticObjectId
 from pydantic import BaseModel, Field
 
+from src.domain.game.enums.rulesets import GameRulesetsEnum
 from src.infrastructure.db.models.game import GameStatusesEnum
 
 
 class GameDTO(BaseModel):
     dt_started: datetime = Field(default_factory=datetime.utcnow)
     status: GameStatusesEnum = GameStatusesEnum.FREE
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC
     player_1: Optional[PydanticObjectId] = None
     player_2: Optional[PydanticObjectId] = None
 
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class GameRulesetsEnum(str, Enum):
+    CLASSIC: str = 'classic'
+    LARGE: str = 'large'
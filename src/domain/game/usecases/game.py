@@ -2,6 +2,7 @@ from typing import Any, Optional
 
 from beanie import PydanticObjectId
 
+from src.core.utils.tracing import trace_methods
 from src.domain.game.dto.game import GameDTO
 from src.domain.game.enums.statuses import GameStatusesEnum
 from src.domain.game.exceptions import GameNotExists
@@ -33,7 +34,9 @@ class CreateGame(GameUseCase):
         create_game = Game(
             dt_started=new_game.dt_started,
             status=new_game.status,
+            ruleset=new_game.ruleset,
             player_1=new_game.player_1,
+            player_2=new_game.player_2,
         )
         game = await self.uow.lobby_holder.game_repo.create_game(create_game)
         return game
@@ -61,6 +64,7 @@ class DeleteGame(GameUseCase):
         await self.uow.lobby_holder.game_repo.delete_game(id_)
 
 
+@trace_methods('game_services')
 class GameServices:
     def __init__(self, uow: UnitOfWork) -> None:
         self.uow = uow
@@ -2,6 +2,7 @@ from typing import Optional
 
 from beanie import PydanticObjectId
 
+from src.core.utils.tracing import trace_methods
 from src.domain.user.interfaces.manager import UserManager
 from src.domain.user.interfaces.user import UserUseCase
 from src.domain.user.schemas import UserCreate
@@ -28,6 +29,7 @@ class GetUserById(UserUseCase):
         return user
 
 
+@trace_methods('user_services')
 class UserServices:
     def __init__(
         self, uow: UnitOfWork, user_manager: UserManager
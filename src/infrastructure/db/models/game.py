@@ -3,6 +3,7 @@ from typing import Optional
 
 from beanie import Document, Link
 
+from src.domain.game.enums.rulesets import GameRulesetsEnum
 from src.domain.game.enums.statuses import GameStatusesEnum
 from src.infrastructure.db.models.user import User
 
@@ -10,6 +11,7 @@ from src.infrastructure.db.models.user import User
 class Game(Document):
     dt_started: datetime
     status: GameStatusesEnum
+    ruleset: GameRulesetsEnum = GameRulesetsEnum.CLASSIC
     player_1: Optional[Link[User]] = None
     player_2: Optional[Link[User]] = None
 
@@ -3,10 +3,13 @@ from typing import Optional
 from beanie import Document, Indexed
 from fastapi_users.db import BeanieBaseUser
 
+DEFAULT_RATING = 1000
+
 
 class User(BeanieBaseUser, Document):
     username: Indexed(str, unique=True)  # type: ignore
     email: Optional[Indexed(str, unique=False)] = None  # type: ignore
+    rating: int = DEFAULT_RATING
 
     @classmethod
     async def get_by_username(cls, username: str) -> Optional["User"]:
@@ -4,11 +4,15 @@ from beanie import PydanticObjectId, WriteRules
 from beanie.odm.operators.find.logical import Or
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from src.core.utils.metrics import repository_latency, time_methods
+from src.core.utils.tracing import trace_methods
 from src.infrastructure.db.models.game import Game, GameStatusesEnum
 from src.infrastructure.db.models.user import User
 from src.infrastructure.db.repositories.base import BaseRepository
 
 
+@time_methods(repository_latency, 'game')
+@trace_methods('game_repository')
 class GameRepository(BaseRepository[Game]):
     def __init__(self, session: AsyncIOMotorClient) -> None:
         self.session = session
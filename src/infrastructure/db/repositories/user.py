@@ -3,11 +3,15 @@ from fastapi_users import BaseUserManager
 from fastapi_users.schemas import BaseUserCreate
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from src.core.utils.metrics import repository_latency, time_methods
+from src.core.utils.tracing import trace_methods
 from src.infrastructure.db.models.game import Game
 from src.infrastructure.db.models.user import User
 from src.infrastructure.db.repositories.base import BaseRepository
 
 
+@time_methods(repository_latency, 'user')
+@trace_methods('user_repository')
 class UserRepository(BaseRepository[User]):
     """Repository for model User"""
     def __init__(self, session: AsyncIOMotorClient) -> None:
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+# Settings are read on import, the tests do not connect to the databases
+os.environ.setdefault('MONGODB_URL', 'mongodb://localhost')
+os.environ.setdefault('REDIS_HOST', 'localhost')
+os.environ.setdefault('REDIS_PORT', '6379')
+
+
+@pytest.fixture
+def sea_battle_manager(monkeypatch: pytest.MonkeyPatch):
+    """Sea battle manager of one worker with the in-memory Redis"""
+    from fakeredis.aioredis import FakeRedis
+
+    from src.api.ws.managers.sea_battle import sea_battle_ws_manager
+
+    monkeypatch.setattr(
+        sea_battle_ws_manager.pubsub_client, 'redis_connection', FakeRedis()
+    )
+    for name in ('rooms', 'ready_users', 'ready_events', 'spectators'):
+        monkeypatch.setattr(sea_battle_ws_manager, name, {})
+    return sea_battle_ws_manager
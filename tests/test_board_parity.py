@@ -0,0 +1,234 @@
+"""
+Parity of the game board engines on scripted games.
+"""
+import io
+import random
+from contextlib import redirect_stdout
+from typing import Any
+
+import numpy as np
+import pytest
+
+from src.core.services import board
+from src.core.services.rules import CLASSIC_RULESET, RULESETS, Ruleset
+
+Script = list[tuple[Any, ...]]
+
+BATCH_BOARDS = 200
+
+FIRST_PLAYER_SHIPS: Script = [
+    ('place', 4, 'A', 1, True),
+    ('place', 3, 'C', 1, True),
+    ('place', 3, 'E', 1, False),
+    ('place', 2, 'I', 1, True),
+    ('place', 2, 'E', 3, False),
+    ('place', 2, 'A', 6, False),
+    ('place', 1, 'D', 8, True),
+    ('place', 1, 'F', 6, True),
+    ('place', 1, 'H', 5, True),
+    ('place', 1, 'J', 9, True),
+]
+
+SECOND_PLAYER_SHIPS: Script = [
+    ('place', 4, 'J', 4, True),
+    # Ship touches other ship
+    ('place', 1, 'I', 4, True),
+    ('place', 1, 'I', 8, True),
+    ('place', 3, 'A', 1, False),
+    ('place', 3, 'A', 10, False),
+    ('place', 2, 'E', 1, True),
+    ('place', 2, 'G', 1, False),
+    ('place', 2, 'E', 5, False),
+    ('place', 1, 'A', 5, True),
+    ('place', 1, 'C', 7, True),
+    ('place', 1, 'H', 9, True),
+    ('place', 1, 'H', 4, True),
+    # Busy cells, out of game board cords and over ships
+    ('place', 4, 'A', 1, True),
+    ('place', 3, 'J', 9, True),
+    ('place', 2, 'K', 10, False),
+]
+
+
+def sweep_attacks(letters: tuple[str, ...], size: int) -> Script:
+    """Attack every cell of the game board row by row"""
+    return [
+        ('attack', letter, numb)
+        for numb in range(1, size + 1)
+        for letter in letters
+    ]
+
+
+def random_script(
+    seed: int,
+    letters: tuple[str, ...],
+    size: int,
+    ship_types: int = 4,
+    placements: int = 40,
+    attacks: int = 150,
+) -> Script:
+    """Random placements and attacks, including repeated and wrong cords"""
+    rand = random.Random(seed)
+    script: Script = [
+        (
+            'place',
+            rand.randint(1, ship_types),
+            rand.choice(letters),
+            rand.randint(0, size + 1),
+            rand.choice((True, False)),
+        )
+        for _ in range(placements)
+    ]
+    script.extend(
+        ('attack', rand.choice(letters), rand.randint(0, size + 1))
+        for _ in range(attacks)
+    )
+    return script
+
+
+def play_scripted_game(
+    engine: str, script: Script, ruleset: Ruleset = CLASSIC_RULESET
+) -> list[Any]:
+    """
+    Play script on a new game board and collect all observable results
+
+    Args:
+        engine(str): Engine name from GAME_BOARD_ENGINES,
+        script(Script): List of 'place' and 'attack' operations,
+        ruleset(Ruleset): Game rules.
+    Returns:
+        results(list): Results of every operation and final board state.
+    """
+    game_board = board.make_game_board(engine, ruleset)
+    results: list[Any] = []
+
+    for operation, *args in script:
+        try:
+            if operation == 'place':
+                ship_type, x, y, vertical = args
+                result = game_board.set_ship_into_game_board(
+                    ship_type, x, y, vertical=vertical
+                )
+            else:
+                result = game_board.attack(*args)
+        except Exception as exc:
+            result = type(exc).__name__
+        results.append((
+            operation,
+            *args,
+            result,
+            game_board.ledger.sunk_ships,
+            game_board.is_game_over,
+        ))
+
+    board_output = io.StringIO()
+    with redirect_stdout(board_output):
+        game_board.print_board()
+    results.append(board_output.getvalue())
+    results.append(game_board.is_all_ships_placed_and_game_initialized)
+    results.append([
+        (ship.ship_type, ship.number, game_board.check_is_drowned(ship))
+        for ship in game_board._ships_placed
+    ])
+    results.append((
+        game_board.ledger.remaining_cells,
+        game_board.ledger.sunk_ships,
+        game_board.ledger.shots,
+    ))
+    return results
+
+
+def scripted_games() -> list[Any]:
+    letters = CLASSIC_RULESET.letters
+    large_ruleset = RULESETS['large']
+    return [
+        pytest.param(
+            CLASSIC_RULESET,
+            FIRST_PLAYER_SHIPS + sweep_attacks(letters, 10),
+            id='classic-first-player',
+        ),
+        pytest.param(
+            CLASSIC_RULESET,
+            SECOND_PLAYER_SHIPS + sweep_attacks(letters, 10) * 2,
+            id='classic-second-player',
+        ),
+        *(
+            pytest.param(
+                CLASSIC_RULESET,
+                random_script(seed, letters, 10),
+                id=f'classic-random-{seed}',
+            )
+            for seed in range(50)
+        ),
+        *(
+            pytest.param(
+                large_ruleset,
+                random_script(
+                    seed,
+                    large_ruleset.letters,
+                    large_ruleset.height,
+                    ship_types=len(large_ruleset.fleet),
+                    placements=400,
+                    attacks=3000,
+                ),
+                id=f'large-random-{seed}',
+            )
+            for seed in range(3)
+        ),
+    ]
+
+
+@pytest.mark.parametrize('engine', list(board.GAME_BOARD_ENGINES))
+@pytest.mark.parametrize(('ruleset', 'script'), scripted_games())
+def test_engine_parity(engine: str, ruleset: Ruleset, script: Script) -> None:
+    """Engine results are the same as the 'cells' engine results"""
+    expected = play_scripted_game('cells', script, ruleset)
+    assert play_scripted_game(engine, script, ruleset) == expected
+
+
+def test_batch_parity() -> None:
+    """
+    Play random scripts at once on BatchGameBoard and one by one on
+    GameBoard and compare is hited, is drowned and is game over vectors
+    """
+    letters = CLASSIC_RULESET.letters
+    scripts = [
+        random_script(seed, letters, 10) for seed in range(BATCH_BOARDS)
+    ]
+    expected = [play_scripted_game('cells', script) for script in scripts]
+    batch_game_board = board.BatchGameBoard(BATCH_BOARDS)
+    sunk_ships = np.zeros(BATCH_BOARDS, dtype=int)
+
+    for step, operations in enumerate(zip(*scripts)):
+        operation, *args = zip(*operations)
+        is_succeed = np.array([
+            result[step][-3] is True for result in expected
+        ])
+        sunk_ships_now = np.array([result[step][-2] for result in expected])
+        is_game_over_expected = np.array([
+            result[step][-1] for result in expected
+        ])
+        if operation[0] == 'place':
+            ship_types, x, y, vertical = map(np.array, args)
+            is_placed = batch_game_board.set_ships_into_game_boards(
+                ship_types, np.vectorize(letters.index)(x), y, vertical
+            )
+            is_game_over = batch_game_board.is_game_over
+            assert (is_placed == is_succeed).all(), (
+                f'BatchGameBoard placement differs in step {step}'
+            )
+        else:
+            x, y = map(np.array, args)
+            is_hited, is_drowned, is_game_over = batch_game_board.attack(
+                np.vectorize(letters.index)(x), y
+            )
+            assert (is_hited == is_succeed).all(), (
+                f'BatchGameBoard attack differs in step {step}'
+            )
+            assert (is_drowned == (sunk_ships_now > sunk_ships)).all(), (
+                f'BatchGameBoard drowned ships differ in step {step}'
+            )
+        sunk_ships = sunk_ships_now
+        assert (is_game_over == is_game_over_expected).all(), (
+            f'BatchGameBoard game over differs in step {step}'
+        )
@@ -0,0 +1,36 @@
+"""
+Reader of the Redis pub/sub messages of the worker.
+"""
+import asyncio
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.api.ws.managers import redis
+
+
+def test_reader_survives_unexpected_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(redis, 'RECONNECT_DELAY', 0)
+
+    async def read_after_error() -> bytes:
+        manager = redis.RedisPubSubManager()
+        manager.redis_connection = FakeRedis()
+        queue = await manager.subscribe('room')
+        get_message = manager.pubsub.get_message  # type: ignore
+        errors = [RuntimeError('unexpected reply')]
+
+        async def get_message_or_fail(**kwargs):
+            if errors:
+                raise errors.pop()
+            return await get_message(**kwargs)
+
+        manager.pubsub.get_message = get_message_or_fail  # type: ignore
+        await manager.redis_connection.publish('room', 'message')
+        try:
+            return await asyncio.wait_for(queue.get(), 5)
+        finally:
+            await manager.close()
+
+    assert asyncio.run(read_after_error()) == b'message'
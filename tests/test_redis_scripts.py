@@ -0,0 +1,295 @@
+"""
+Lua scripts of the rooms and the matchmaking queue run by in-memory Redis.
+"""
+import asyncio
+import time
+
+from src.api.ws.managers import sea_battle
+from src.api.ws.managers.matchmaking import matchmaking_queue
+from src.core.services import board
+from src.core.utils import game_utils
+from src.domain.game.enums.rulesets import GameRulesetsEnum
+from tests.test_ws_game import ScriptedWebSocket
+
+RULESET = GameRulesetsEnum.CLASSIC.value
+
+
+async def join_room(manager, *usernames: str) -> list[ScriptedWebSocket]:
+    websockets = []
+    for username in usernames:
+        game_board = board.make_game_board('cells')
+        game_board.auto_place_ships()
+        websocket = ScriptedWebSocket([])
+        await manager._setdefault_connection(
+            'room', username, websocket, game_board
+        )
+        if username in manager.rooms.get('room', {}):
+            await manager.set_move_board('room', username, game_board)
+        websockets.append(websocket)
+    return websockets
+
+
+async def ship_cells(manager, username: str) -> dict[int, list[int]]:
+    """Cell indexes of every ship of the saved move board"""
+    cells = await manager.redis_connection.get(
+        sea_battle.ROOM_CELLS_KEY.format(room_id='room', username=username)
+    )
+    ships: dict[int, list[int]] = {}
+    for idx, cell in enumerate(cells):
+        if cell >= 2:
+            ships.setdefault((cell - 2) // 2, []).append(idx)
+    return ships
+
+
+async def empty_cell(manager, username: str) -> int:
+    cells = await manager.redis_connection.get(
+        sea_battle.ROOM_CELLS_KEY.format(room_id='room', username=username)
+    )
+    return cells.index(0)
+
+
+async def start_game(manager, active_at: float) -> None:
+    await manager.redis_connection.hset(
+        sea_battle.ROOM_KEY.format(room_id='room'),
+        mapping={
+            sea_battle.ROOM_READY_FIELD.format(username='first'): 1,
+            sea_battle.ROOM_READY_FIELD.format(username='second'): 1,
+            sea_battle.ROOM_ACTIVE_AT_FIELD: active_at,
+        },
+    )
+
+
+def test_join_room_is_full(sea_battle_manager) -> None:
+    async def join() -> tuple[str, list[ScriptedWebSocket]]:
+        websockets = await join_room(
+            sea_battle_manager, 'first', 'second', 'third'
+        )
+        # Joined user may connect again
+        websockets += await join_room(sea_battle_manager, 'first')
+        return (
+            await sea_battle_manager.get_first_move_username('room'),
+            websockets,
+        )
+
+    first_username, websockets = asyncio.run(join())
+
+    assert first_username == 'first'
+    assert list(sea_battle_manager.rooms['room']) == ['first', 'second']
+    assert websockets[2].sent == ['This room is full!']
+    assert websockets[3].sent == []
+
+
+def test_miss_passes_turn(sea_battle_manager) -> None:
+    async def miss() -> tuple:
+        await join_room(sea_battle_manager, 'first', 'second')
+        cell_idx = await empty_cell(sea_battle_manager, 'second')
+        return (
+            await sea_battle_manager.apply_move(
+                'room', 'first', 'second', cell_idx
+            ),
+            await sea_battle_manager.is_user_turn('room', 'second'),
+            await sea_battle_manager.apply_move(
+                'room', 'first', 'second', cell_idx
+            ),
+        )
+
+    move_result, is_second_turn, next_move_result = asyncio.run(miss())
+
+    assert move_result.status == sea_battle.MoveStatuses.MISS
+    assert move_result.is_turn_passed
+    assert is_second_turn
+    assert next_move_result.status == sea_battle.MoveStatuses.NOT_YOUR_MOVE
+
+
+def test_hit_passes_turn_without_move_again(sea_battle_manager) -> None:
+    async def hit() -> list:
+        move_results = []
+        for move_again_on_hit in (True, False):
+            await join_room(sea_battle_manager, 'first', 'second')
+            ships = await ship_cells(sea_battle_manager, 'second')
+            move_results.append(await sea_battle_manager.apply_move(
+                'room',
+                'first',
+                'second',
+                max(ships.values(), key=len)[0],
+                move_again_on_hit,
+            ))
+            await sea_battle_manager.remove_room('room')
+        return move_results
+
+    move_again_result, turn_passed_result = asyncio.run(hit())
+
+    assert move_again_result.status == sea_battle.MoveStatuses.HIT
+    assert not move_again_result.is_turn_passed
+    assert turn_passed_result.status == sea_battle.MoveStatuses.HIT
+    assert turn_passed_result.is_turn_passed
+
+
+def test_repeated_shot_keeps_turn(sea_battle_manager) -> None:
+    async def shoot_twice() -> tuple:
+        await join_room(sea_battle_manager, 'first', 'second')
+        ships = await ship_cells(sea_battle_manager, 'second')
+        cell_idx = max(ships.values(), key=len)[0]
+        await sea_battle_manager.apply_move(
+            'room', 'first', 'second', cell_idx
+        )
+        return (
+            await sea_battle_manager.apply_move(
+                'room', 'first', 'second', cell_idx
+            ),
+            await sea_battle_manager.is_user_turn('room', 'first'),
+        )
+
+    move_result, is_first_turn = asyncio.run(shoot_twice())
+
+    assert move_result.status == sea_battle.MoveStatuses.REPEATED
+    assert not move_result.is_turn_passed
+    assert is_first_turn
+
+
+def test_last_ship_cell_ends_game(sea_battle_manager) -> None:
+    async def sink_fleet() -> tuple:
+        await join_room(sea_battle_manager, 'first', 'second')
+        ships = await ship_cells(sea_battle_manager, 'second')
+        drowned = []
+        for cells in ships.values():
+            for cell_idx in cells:
+                move_result = await sea_battle_manager.apply_move(
+                    'room', 'first', 'second', cell_idx
+                )
+                assert move_result.status == sea_battle.MoveStatuses.HIT
+                drowned.append(move_result.is_drowned)
+        return (
+            ships,
+            drowned,
+            move_result,
+            await sea_battle_manager.get_winner('room'),
+            await sea_battle_manager.apply_move(
+                'room', 'second', 'first', 0
+            ),
+        )
+
+    ships, drowned, move_result, winner, next_move_result = asyncio.run(
+        sink_fleet()
+    )
+
+    # Ship is drowned by the hit of its last cell only
+    assert drowned == [
+        idx == len(cells) - 1
+        for cells in ships.values()
+        for idx in range(len(cells))
+    ]
+    assert move_result.is_game_over
+    assert winner == 'first'
+    assert next_move_result.status == sea_battle.MoveStatuses.NOT_YOUR_MOVE
+
+
+def test_missed_turn_deadline_loses_game(sea_battle_manager) -> None:
+    async def check_deadlines() -> list:
+        await join_room(sea_battle_manager, 'first', 'second')
+        expired_rooms = []
+        for seconds_idle in (
+            game_utils.SECONDS_TO_MOVE - 1,
+            game_utils.SECONDS_TO_MOVE + 1,
+            game_utils.SECONDS_TO_MOVE + 1,
+        ):
+            await start_game(sea_battle_manager, time.time() - seconds_idle)
+            expired_rooms.append(
+                await sea_battle_manager.check_room_deadlines(
+                    'room',
+                    game_utils.SECONDS_TO_MOVE,
+                    game_utils.SECONDS_TO_ROOM_IDLE,
+                )
+            )
+        return expired_rooms
+
+    # Expired room is resolved by one worker only
+    assert asyncio.run(check_deadlines()) == [
+        None,
+        sea_battle.ExpiredRoom(sea_battle.RoomDeadlines.TURN, True, 'second'),
+        None,
+    ]
+
+
+def test_idle_deadline_expires_not_started_room(sea_battle_manager) -> None:
+    async def check_deadlines() -> list:
+        await join_room(sea_battle_manager, 'first', 'second')
+        expired_rooms = []
+        # Turn deadline is checked for started games only
+        for seconds_idle in (
+            game_utils.SECONDS_TO_MOVE + 1,
+            game_utils.SECONDS_TO_ROOM_IDLE + 1,
+            game_utils.SECONDS_TO_ROOM_IDLE + 1,
+        ):
+            await sea_battle_manager.redis_connection.hset(
+                sea_battle.ROOM_KEY.format(room_id='room'),
+                sea_battle.ROOM_ACTIVE_AT_FIELD,
+                time.time() - seconds_idle,
+            )
+            expired_rooms.append(
+                await sea_battle_manager.check_room_deadlines(
+                    'room',
+                    game_utils.SECONDS_TO_MOVE,
+                    game_utils.SECONDS_TO_ROOM_IDLE,
+                )
+            )
+        return expired_rooms
+
+    assert asyncio.run(check_deadlines()) == [
+        None,
+        sea_battle.ExpiredRoom(sea_battle.RoomDeadlines.IDLE, False),
+        None,
+    ]
+
+
+def test_spectators_are_counted_in_existing_room(sea_battle_manager) -> None:
+    async def spectate() -> tuple:
+        spectate = sea_battle_manager.pubsub_client.get_script(
+            sea_battle.SPECTATE_SCRIPT
+        )
+        keys = [sea_battle.ROOM_KEY.format(room_id='room')]
+        missing_room = await spectate(
+            keys=keys, args=[sea_battle.ROOM_SPECTATORS_FIELD, 1]
+        )
+        await join_room(sea_battle_manager, 'first', 'second')
+        return missing_room, [
+            await spectate(
+                keys=keys, args=[sea_battle.ROOM_SPECTATORS_FIELD, change]
+            )
+            for change in (1, 1, -1)
+        ]
+
+    assert asyncio.run(spectate()) == (None, [1, 2, 1])
+
+
+def test_match_closest_user_in_rating_band(sea_battle_manager) -> None:
+    async def match() -> list:
+        return [
+            await matchmaking_queue.match(RULESET, 'low', 1000, 150),
+            await matchmaking_queue.match(RULESET, 'high', 1300, 150),
+            await matchmaking_queue.match(RULESET, 'near_high', 1200, 250),
+            await matchmaking_queue.match(RULESET, 'other_high', 1300, 150),
+            await matchmaking_queue.match(RULESET, 'near_low', 1100, 250),
+            await matchmaking_queue.match(RULESET, 'far', 1700, 150),
+            # Band of the queued user is widened
+            await matchmaking_queue.match(
+                RULESET, 'far', 1700, 800, is_retry=True
+            ),
+        ]
+
+    assert asyncio.run(match()) == [
+        '', '', 'high', '', 'low', '', 'other_high'
+    ]
+
+
+def test_match_retry_of_paired_user(sea_battle_manager) -> None:
+    async def match() -> list:
+        return [
+            await matchmaking_queue.match(RULESET, 'first', 1000),
+            await matchmaking_queue.match(RULESET, 'second', 1000),
+            await matchmaking_queue.match(
+                RULESET, 'first', 1000, 100, is_retry=True
+            ),
+        ]
+
+    assert asyncio.run(match()) == ['', 'first', None]
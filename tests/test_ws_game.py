@@ -0,0 +1,104 @@
+"""
+Ships placement of the sea battle WebSocket handler.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from src.core.services import board, board_snapshot, ws_game, ws_protocol
+from src.core.utils import game_utils
+
+# Every ship but the four cells one, which has no room left after them
+CROWDED_SHIPS = [
+    (3, 'E', 4, True),
+    (3, 'I', 2, True),
+    (2, 'B', 1, True),
+    (2, 'B', 7, True),
+    (2, 'I', 9, True),
+    (1, 'E', 9, True),
+    (1, 'G', 6, True),
+    (1, 'G', 3, True),
+    (1, 'D', 1, True),
+]
+
+
+class ScriptedWebSocket:
+    """WebSocket receiving the scripted texts, disconnected after them"""
+
+    def __init__(self, texts: list[str]) -> None:
+        self.texts = list(texts)
+        self.sent: list[str] = []
+
+    async def receive_text(self) -> str:
+        if not self.texts:
+            raise WebSocketDisconnect
+        return self.texts.pop(0)
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+def crowded_game_board(
+    engine: str, ships_amount: int = len(CROWDED_SHIPS)
+) -> board.GameBoard:
+    game_board = board.make_game_board(engine)
+    for ship_type, x, y, vertical in CROWDED_SHIPS[:ships_amount]:
+        assert game_board.set_ship_into_game_board(
+            ship_type, x, y, vertical=vertical
+        )
+    return game_board
+
+
+@pytest.mark.parametrize('engine', list(board.GAME_BOARD_ENGINES))
+def test_auto_placement_ships_do_not_fit(engine: str) -> None:
+    game_board = crowded_game_board(engine)
+    snapshot = board_snapshot.encode_game_board(game_board)
+    websocket = ScriptedWebSocket([game_utils.AUTO_PLACE_SHIPS_COMMAND])
+
+    with pytest.raises(WebSocketDisconnect):
+        asyncio.run(
+            ws_game.init_game_board(websocket, 'room', game_board, 'username')
+        )
+
+    assert game_utils.WS_SHIPS_NOT_FIT_ERROR in websocket.sent
+    assert board_snapshot.encode_game_board(game_board) == snapshot
+
+
+@pytest.mark.parametrize('engine', list(board.GAME_BOARD_ENGINES))
+def test_fleet_auto_placement_ships_do_not_fit(engine: str) -> None:
+    game_board = crowded_game_board(engine, len(CROWDED_SHIPS) - 1)
+    snapshot = board_snapshot.encode_game_board(game_board)
+    websocket = ScriptedWebSocket([])
+    ship_type, x, y, vertical = CROWDED_SHIPS[-1]
+    fleet = ws_protocol.FleetMessage(
+        type='fleet',
+        ships=[ws_protocol.ShipPlacement(
+            ship_type=ship_type, cords=f'{x}{y}', vertical=vertical
+        )],
+        auto=True,
+    )
+
+    asyncio.run(
+        ws_game.place_fleet(websocket, 'room', game_board, 'username', fleet)
+    )
+
+    result = json.loads(websocket.sent[-1])
+    assert result['placed'] is False
+    assert result['error'] == game_utils.WS_SHIPS_NOT_FIT_ERROR
+    assert result['ships'][0]['error'] is None
+    assert board_snapshot.encode_game_board(game_board) == snapshot
+
+
+def test_bot_is_not_added_to_full_room(sea_battle_manager) -> None:
+    async def add_bot() -> bool:
+        for username in ('first', 'second'):
+            await sea_battle_manager._setdefault_connection(
+                'room', username, ScriptedWebSocket([]),
+                board.make_game_board('cells'),
+            )
+        return await ws_game.add_bot_to_room('room', game_services=None)
+
+    assert asyncio.run(add_bot()) is False
+    assert list(sea_battle_manager.rooms['room']) == ['first', 'second']